@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Microbenchmark chd.unicode normalization on the full headword list.
+
+Compares the original implementations against the current chd.unicode
+ones: single calls, memoized repeats, and the *_many batch API.
+
+Headwords come from data/processed/haw_eng/*.json. Without an export, a
+synthetic list of the same size is generated so the script still runs.
+
+Usage:
+    python scripts/bench_unicode.py [--repeat 5]
+"""
+
+import argparse
+import json
+import random
+import sys
+import timeit
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from chd.unicode import (  # noqa: E402
+    KAHAKO_MAP, OKINA_VARIANTS, normalize_okina, normalize_okina_many, subscript_to_display,
+    to_ascii, to_ascii_many,
+)
+
+HAW_ENG_DIR = PROJECT_ROOT / "data" / "processed" / "haw_eng"
+SYNTHETIC_SIZE = 30_000
+
+
+# ─── Original implementations ───────────────────────────────────────────────
+
+
+def legacy_normalize_okina(text: str) -> str:
+    for variant in OKINA_VARIANTS:
+        text = text.replace(variant, "ʻ")
+    return text
+
+
+def legacy_to_ascii(text: str) -> str:
+    result = text.replace("ʻ", "")
+    for accented, plain in KAHAKO_MAP.items():
+        result = result.replace(accented, plain)
+    return result
+
+
+def legacy_subscript_to_display(num) -> str:
+    return str(num).translate(str.maketrans("0123456789", "₀₁₂₃₄₅₆₇₈₉"))
+
+
+# ─── Inputs ─────────────────────────────────────────────────────────────────
+
+
+def load_headwords() -> list[str]:
+    headwords = []
+    for jf in sorted(HAW_ENG_DIR.glob("*.json")):
+        headwords.extend(e.get("headword", "") for e in json.loads(jf.read_text(encoding="utf-8")))
+    if headwords:
+        print(f"Loaded {len(headwords):,} headwords from {HAW_ENG_DIR}")
+        return headwords
+    rng = random.Random(0)
+    letters = "aeiouhklmnpwāēīōūʻ"
+    headwords = ["".join(rng.choice(letters) for _ in range(rng.randint(1, 12)))
+                 for _ in range(SYNTHETIC_SIZE)]
+    print(f"No export found; using {len(headwords):,} synthetic headwords")
+    return headwords
+
+
+def bench(label: str, fn, repeat: int) -> float:
+    best = min(timeit.repeat(fn, number=1, repeat=repeat))
+    print(f"  {label:42s} {best * 1000:9.2f} ms")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    headwords = load_headwords()
+    okina_input = [hw.replace("ʻ", "‘") for hw in headwords]
+    assert [to_ascii(h) for h in headwords] == [legacy_to_ascii(h) for h in headwords]
+    assert to_ascii_many(headwords) == [legacy_to_ascii(h) for h in headwords]
+    assert normalize_okina_many(okina_input) == [legacy_normalize_okina(h) for h in okina_input]
+
+    uncached = to_ascii.__wrapped__
+    print("\nto_ascii")
+    base = bench("legacy str.replace loop", lambda: [legacy_to_ascii(h) for h in headwords], args.repeat)
+    t1 = bench("translate table (uncached)", lambda: [uncached(h) for h in headwords], args.repeat)
+    to_ascii.cache_clear()
+    t2 = bench("translate table (memoized, warm)", lambda: [to_ascii(h) for h in headwords], args.repeat)
+    t3 = bench("to_ascii_many batch", lambda: to_ascii_many(headwords), args.repeat)
+    print(f"  speedup: {base / t1:.1f}x single, {base / t2:.1f}x memoized, {base / t3:.1f}x batch")
+
+    print("\nnormalize_okina")
+    base = bench("legacy str.replace loop", lambda: [legacy_normalize_okina(h) for h in okina_input], args.repeat)
+    t1 = bench("translate table", lambda: [normalize_okina(h) for h in okina_input], args.repeat)
+    t2 = bench("normalize_okina_many batch", lambda: normalize_okina_many(okina_input), args.repeat)
+    print(f"  speedup: {base / t1:.1f}x single, {base / t2:.1f}x batch")
+
+    print("\nsubscript_to_display")
+    nums = list(range(len(headwords)))
+    base = bench("legacy per-call maketrans", lambda: [legacy_subscript_to_display(n) for n in nums], args.repeat)
+    t1 = bench("precompiled table", lambda: [subscript_to_display(n) for n in nums], args.repeat)
+    print(f"  speedup: {base / t1:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
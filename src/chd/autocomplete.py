@@ -0,0 +1,165 @@
+"""Prefix-searchable autocomplete artifact.
+
+Suggestions come from the index-{letter}.htm triples (headword, POS, short
+definition; parse_index_page) plus any entry headword the index pages
+miss. Written during export to autocomplete/:
+
+    index.json          chunk prefixes with row counts, and the top
+                        suggestions for every one-letter prefix
+    chunks/{xx}.json    rows whose key starts with the two letters xx
+
+Keys are chd.shards.prefix_key (folded letters only), so queries ignore
+ʻokina, kahakō, case, spaces and hyphens. Within a chunk, rows are sorted
+by key and the keys are front-coded as [shared prefix length, suffix].
+Rows are [headword, entry id, POS, gloss, frequency]; frequency is the
+corpus count of the headword's exact form (RestorationBuilder.form_count;
+a phrase counts where its words occur together), so kai and kaʻi rank
+separately.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import NamedTuple
+
+from chd.models import Entry, IndexPage
+from chd.shards import prefix_key
+
+INDEX_FILE = "index.json"
+CHUNK_PREFIX = 2
+GLOSS_CHARS = 60
+TOP_PER_PREFIX = 10
+
+
+class Suggestion(NamedTuple):
+    headword: str
+    entry_id: str
+    pos: str
+    gloss: str
+    frequency: int
+
+
+def _rank(s: Suggestion) -> tuple:
+    return -s.frequency, s.headword
+
+
+def front_code(keys: list[str]) -> list[list]:
+    """[[chars shared with the previous key, remaining suffix], ...] for sorted keys."""
+    coded = []
+    prev = ""
+    for key in keys:
+        shared = 0
+        limit = min(len(prev), len(key))
+        while shared < limit and prev[shared] == key[shared]:
+            shared += 1
+        coded.append([shared, key[shared:]])
+        prev = key
+    return coded
+
+
+def front_decode(coded: list[list]) -> list[str]:
+    keys = []
+    prev = ""
+    for shared, suffix in coded:
+        prev = prev[:shared] + suffix
+        keys.append(prev)
+    return keys
+
+
+def _short(text: str) -> str:
+    if len(text) <= GLOSS_CHARS:
+        return text
+    return text[:GLOSS_CHARS].rsplit(" ", 1)[0] + "…"
+
+
+class AutocompleteBuilder:
+    """Collects suggestions, deduplicated by (headword, entry id)."""
+
+    def __init__(self, frequency: Callable[[str], int] = lambda headword: 0):
+        self.frequency = frequency
+        self.rows: dict[tuple[str, str], Suggestion] = {}
+
+    def add(self, headword: str, entry_id: str, pos: str = "", gloss: str = "") -> None:
+        if not prefix_key(headword) or (headword, entry_id) in self.rows:
+            return
+        self.rows[(headword, entry_id)] = Suggestion(headword, entry_id, pos, _short(gloss), self.frequency(headword))
+
+    def add_index_pages(self, pages: Iterable[IndexPage]) -> None:
+        for page in pages:
+            for ie in page.entries:
+                self.add(ie.headword, ie.target_anchor or ie.anchor, ie.pos, ie.definition)
+
+    def add_entries(self, entries: Iterable[Entry]) -> None:
+        """Headwords the index pages don't list (call after add_index_pages)."""
+        listed = {entry_id for _, entry_id in self.rows}
+        for e in entries:
+            if e.id and e.id not in listed:
+                sense = e.senses[0] if e.senses else None
+                self.add(e.headword, e.id, sense.pos_raw if sense else "", sense.text if sense else "")
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def write(self, out_dir: Path) -> None:
+        chunks: dict[str, list[tuple[str, Suggestion]]] = {}
+        top: dict[str, list[Suggestion]] = {}
+        for s in self.rows.values():
+            key = prefix_key(s.headword)
+            chunks.setdefault(key[:CHUNK_PREFIX], []).append((key, s))
+            top.setdefault(key[0], []).append(s)
+
+        chunk_dir = out_dir / "chunks"
+        chunk_dir.mkdir(parents=True, exist_ok=True)
+        counts = {}
+        for prefix, items in sorted(chunks.items()):
+            items.sort(key=lambda ks: (ks[0], _rank(ks[1])))
+            data = {"prefix": prefix, "keys": front_code([k for k, _ in items]), "rows": [list(s) for _, s in items]}
+            (chunk_dir / f"{prefix}.json").write_text(
+                json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+            counts[prefix] = len(items)
+
+        index = {
+            "chunk_prefix": CHUNK_PREFIX,
+            "chunks": counts,
+            "top": {letter: [list(s) for s in sorted(rows, key=_rank)[:TOP_PER_PREFIX]]
+                    for letter, rows in sorted(top.items())},
+        }
+        (out_dir / INDEX_FILE).write_text(json.dumps(index, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+
+class Autocomplete:
+    """Reader that loads chunks on demand."""
+
+    def __init__(self, out_dir: Path):
+        self.out_dir = out_dir
+        index = json.loads((out_dir / INDEX_FILE).read_text(encoding="utf-8"))
+        self.chunk_prefix = index["chunk_prefix"]
+        self.chunk_counts: dict[str, int] = index["chunks"]
+        self.top = {letter: [Suggestion(*r) for r in rows] for letter, rows in index["top"].items()}
+        self._chunks: dict[str, tuple[list[str], list[Suggestion]]] = {}
+
+    def _chunk(self, prefix: str) -> tuple[list[str], list[Suggestion]]:
+        chunk = self._chunks.get(prefix)
+        if chunk is None:
+            if prefix in self.chunk_counts:
+                data = json.loads((self.out_dir / "chunks" / f"{prefix}.json").read_text(encoding="utf-8"))
+                chunk = front_decode(data["keys"]), [Suggestion(*r) for r in data["rows"]]
+            else:
+                chunk = [], []
+            self._chunks[prefix] = chunk
+        return chunk
+
+    def complete(self, text: str, n: int = 10) -> list[Suggestion]:
+        """Up to n suggestions whose key starts with text's key, most frequent first."""
+        key = prefix_key(text)
+        if not key:
+            return []
+        if len(key) < self.chunk_prefix:
+            return self.top.get(key, [])[:n]
+        keys, rows = self._chunk(key[:self.chunk_prefix])
+        start = bisect.bisect_left(keys, key)
+        end = bisect.bisect_right(keys, key + "\U0010FFFF", start)
+        return sorted(rows[start:end], key=_rank)[:n]
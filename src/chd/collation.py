@@ -0,0 +1,89 @@
+"""Hawaiian alphabetical order as precomputed byte-string sort keys.
+
+Pukui-Elbert / Trussel order puts the vowels first, then the native
+consonants, then loan letters: a e i o u h k l m n p w, b c d f g j q r s
+t v x y z. ʻOkina and kahakō don't affect the primary order; they only
+break ties, compared letter by letter: plain < long < after ʻokina <
+long after ʻokina, so kai < kaʻi < kāī. Case breaks remaining ties, then
+the homograph number.
+
+A key is
+
+    primary letters, 00, secondary marks, 00, case marks, 00, u16 homograph
+
+with one byte per letter at each level, all letter weights nonzero. Keys
+compare with plain bytes comparison (memcmp), and every word starting with
+prefix P sorts inside [primary_key(P), primary_key(P) + FF), so prefix
+scans are two binary searches. sort_key() hex-encodes the key; lowercase
+hex preserves byte order, so the stored string sorts the same way (also
+in Postgres under COLLATE "C"). Export stores it on every entry.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+
+from chd.unicode import KAHAKO_MAP, normalize_okina
+
+ALPHABET = "aeiouhklmnpw" + "bcdfgjqrstvxyz"
+PRIMARY = {ch: i + 1 for i, ch in enumerate(ALPHABET)}
+OTHER_LETTER = len(ALPHABET) + 1  # letters outside the alphabet sort last
+LONG = 1
+OKINA = 2
+LEVEL_SEP = b"\x00"
+PREFIX_END = b"\xff"
+
+
+def _weight(base: str) -> int:
+    weight = PRIMARY.get(base)
+    if weight is None:
+        # Fold other accented Latin letters (é → e) before giving up
+        weight = PRIMARY.get(unicodedata.normalize("NFD", base)[0], OTHER_LETTER)
+    return weight
+
+
+def _levels(text: str) -> tuple[bytearray, bytearray, bytearray]:
+    primary, secondary, tertiary = bytearray(), bytearray(), bytearray()
+    okina = False
+    for ch in normalize_okina(text):
+        if ch == "ʻ":
+            okina = True
+            continue
+        lower = ch.lower()
+        if not lower.isalpha():
+            continue
+        base = KAHAKO_MAP.get(lower, lower)
+        primary.append(_weight(base))
+        secondary.append(1 + (LONG if base != lower else 0) + (OKINA if okina else 0))
+        tertiary.append(1 if ch == lower else 2)
+        okina = False
+    return primary, secondary, tertiary
+
+
+def primary_key(text: str) -> bytes:
+    """Letters only, in Hawaiian order; the level used for prefix ranges."""
+    return bytes(_levels(text)[0])
+
+
+def collation_key(text: str, homograph: str | int = "") -> bytes:
+    """Full sort key for text; homograph is the entry's subscript number, if any."""
+    primary, secondary, tertiary = _levels(text)
+    number = int(homograph) if str(homograph).isdigit() else 0
+    return b"".join((primary, LEVEL_SEP, secondary, LEVEL_SEP, tertiary, LEVEL_SEP,
+                     min(number, 0xFFFF).to_bytes(2, "big")))
+
+
+def sort_key(text: str, homograph: str | int = "") -> str:
+    """collation_key as lowercase hex, for JSON and database columns."""
+    return collation_key(text, homograph).hex()
+
+
+def prefix_bounds(prefix: str) -> tuple[bytes, bytes]:
+    """[lo, hi) such that every collation key of a word starting with prefix lies inside."""
+    lo = primary_key(prefix)
+    return lo, lo + PREFIX_END
+
+
+def collate(words: list[str]) -> list[str]:
+    """words sorted in Hawaiian order."""
+    return sorted(words, key=collation_key)
@@ -3,24 +3,63 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Callable, Sequence
 from pathlib import Path
 
-from chd.models import Entry, EngHawEntry, ConcordanceInstance
+from chd.autocomplete import AutocompleteBuilder
+from chd.collation import sort_key
+from chd.facets import FACETS_FILE, FacetIndex
+from chd.frequency import FREQUENCY_FILE, FrequencyBuilder
+from chd.graph import EntryGraph
+from chd.kwic import PhraseIndexBuilder
+from chd.models import ConcordanceInstance, Entry, EngHawEntry
 from chd.parsers.haw_eng import parse_all_haw_eng, RAW_DIR
 from chd.parsers.eng_haw import parse_all_eng_haw
-from chd.parsers.concordance import parse_all_concordance
+from chd.parsers.concordance import iter_all_concordance
+from chd.parsers.structural import parse_all_index_pages
 from chd.parsers.support import parse_counts, parse_refs, discover_topical_pages
 from chd.pos_mapper import map_pos
-from chd.validate import validate_link_resolution, validate_entries
+from chd.restore import RestorationBuilder
+from chd.reverse import ReverseIndexBuilder
+from chd.rhyme import RHYME_FILE, RhymeIndex
+from chd.secondary import SECONDARY_DIR, SecondaryIndexBuilder
+from chd.shards import load_combos, write_shards
+from chd.store import write_store
+from chd.validate import LinkResolver, WordTokenResolver, validate_link_resolution, validate_entries
+from chd.word_index import WordIndexBuilder
 
 PROCESSED_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "processed"
 
+# Called with (letter, index in concordance/{letter}.json, instance) before each row is written
+ConcordanceConsumer = Callable[[str, int, ConcordanceInstance], None]
+
 
 def _write_json(data, filepath: Path):
     filepath.parent.mkdir(parents=True, exist_ok=True)
     filepath.write_text(json.dumps(data, indent=2, ensure_ascii=False, default=str), encoding="utf-8")
 
 
+class JsonArrayWriter:
+    """Append items to a JSON array file one at a time.
+
+    Output is byte-identical to _write_json(list_of_items, filepath).
+    """
+
+    def __init__(self, filepath: Path):
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        self._file = filepath.open("w", encoding="utf-8")
+        self.count = 0
+
+    def write(self, item) -> None:
+        text = json.dumps(item, indent=2, ensure_ascii=False, default=str)
+        self._file.write(("[\n  " if not self.count else ",\n  ") + text.replace("\n", "\n  "))
+        self.count += 1
+
+    def close(self) -> None:
+        self._file.write("\n]" if self.count else "[]")
+        self._file.close()
+
+
 def _apply_pos_mapping(entries: list[Entry]) -> None:
     """Apply three-layer POS mapping to all senses in place."""
     for entry in entries:
@@ -31,13 +70,21 @@ def _apply_pos_mapping(entries: list[Entry]) -> None:
                 sense.pos_english = eng
 
 
-def export_haw_eng(raw_dir: Path = RAW_DIR, out_dir: Path = PROCESSED_DIR) -> list[Entry]:
-    """Parse and export all Hawaiian-English entries (deduped, with topical-only merged)."""
+def export_haw_eng(
+    raw_dir: Path = RAW_DIR, out_dir: Path = PROCESSED_DIR,
+    prepare: Callable[[list[Entry]], None] | None = None,
+) -> list[Entry]:
+    """Parse and export all Hawaiian-English entries (deduped, with topical-only merged).
+
+    prepare, if given, is called with every entry before any file is
+    written, for passes that need the whole dictionary (e.g. token resolution).
+    """
     print("Parsing Hawaiian-English pages...")
     results = parse_all_haw_eng(raw_dir)
 
     haw_eng_dir = out_dir / "haw_eng"
     all_entries: list[Entry] = []
+    files: list[tuple[str, list[Entry]]] = []
 
     # Phase 1: Core letter pages
     core_ids: set[str] = set()
@@ -48,8 +95,7 @@ def export_haw_eng(raw_dir: Path = RAW_DIR, out_dir: Path = PROCESSED_DIR) -> li
         for e in entries:
             if e.id:
                 core_ids.add(e.id)
-        data = [e.model_dump(exclude_defaults=True) for e in entries]
-        _write_json(data, haw_eng_dir / f"{letter}.json")
+        files.append((letter, entries))
         all_entries.extend(entries)
         errors = len(ctx.errors)
         print(f"  {letter}: {len(entries)} entries" + (f" ({errors} errors)" if errors else ""))
@@ -71,11 +117,18 @@ def export_haw_eng(raw_dir: Path = RAW_DIR, out_dir: Path = PROCESSED_DIR) -> li
                 core_ids.add(e.id)
 
     if topical_only:
-        data = [e.model_dump(exclude_defaults=True) for e in topical_only]
-        _write_json(data, haw_eng_dir / "topical_only.json")
+        files.append(("topical_only", topical_only))
         all_entries.extend(topical_only)
         print(f"  topical-only: {len(topical_only)} unique entries from {len(topical_pages)} pages")
 
+    for e in all_entries:
+        e.sort_key = sort_key(e.headword, e.subscript)
+    if prepare:
+        prepare(all_entries)
+    for name, entries in files:
+        data = [e.model_dump(exclude_defaults=True) for e in entries]
+        _write_json(data, haw_eng_dir / f"{name}.json")
+
     print(f"  Total: {len(all_entries)} entries")
     return all_entries
 
@@ -94,17 +147,31 @@ def export_eng_haw(raw_dir: Path = RAW_DIR, out_dir: Path = PROCESSED_DIR) -> li
     return all_entries
 
 
-def export_concordance(raw_dir: Path = RAW_DIR, out_dir: Path = PROCESSED_DIR) -> list[ConcordanceInstance]:
+def export_concordance(
+    raw_dir: Path = RAW_DIR, out_dir: Path = PROCESSED_DIR, consumers: Sequence[ConcordanceConsumer] = (),
+) -> int:
+    """Stream concordance rows from the raw pages straight into per-letter JSON files.
+
+    Each row is passed to every consumer (index builders etc.) before it is
+    written. Returns the number of instances written.
+    """
     print("\nParsing Concordance pages...")
-    results = parse_all_concordance(raw_dir)
     conc_dir = out_dir / "concordance"
-    all_instances = []
-    for letter, instances in sorted(results.items()):
-        data = [i.model_dump(exclude_defaults=True) for i in instances]
-        _write_json(data, conc_dir / f"{letter}.json")
-        all_instances.extend(instances)
-    print(f"  Total: {len(all_instances)} instances")
-    return all_instances
+    writers: dict[str, JsonArrayWriter] = {}
+    try:
+        for letter, inst in iter_all_concordance(raw_dir):
+            writer = writers.get(letter)
+            if writer is None:
+                writer = writers[letter] = JsonArrayWriter(conc_dir / f"{letter}.json")
+            for consume in consumers:
+                consume(letter, writer.count, inst)
+            writer.write(inst.model_dump(exclude_defaults=True))
+    finally:
+        for writer in writers.values():
+            writer.close()
+    total = sum(w.count for w in writers.values())
+    print(f"  Total: {total} instances")
+    return total
 
 
 def export_support(raw_dir: Path = RAW_DIR, out_dir: Path = PROCESSED_DIR):
@@ -124,33 +191,172 @@ def export_support(raw_dir: Path = RAW_DIR, out_dir: Path = PROCESSED_DIR):
     print(f"  Topical: {len(topics)} pages")
 
 
+def export_store(entries: list[Entry], out_dir: Path = PROCESSED_DIR) -> None:
+    """Write the memory-mappable id → entry store."""
+    print("\nWriting entry store...")
+    count = write_store(entries, out_dir / "store")
+    print(f"  {count} entries")
+
+
+def export_shards(
+    entries: list[Entry], raw_dir: Path = RAW_DIR, out_dir: Path = PROCESSED_DIR,
+    resolver: LinkResolver | None = None,
+) -> None:
+    """Write per-entry and per-prefix browse shards for static hosting."""
+    print("\nWriting site shards...")
+    writer = write_shards(entries, out_dir / "site", load_combos(raw_dir), resolver)
+    print(f"  {len(writer.manifest)} shards ({writer.written} written, {writer.unchanged} unchanged, {writer.removed} removed)")
+
+
+def export_word_index(builder: WordIndexBuilder, out_dir: Path = PROCESSED_DIR) -> None:
+    """Write the anchor → example/concordance postings index."""
+    print("\nWriting word index...")
+    builder.write(out_dir / "index")
+    print(f"  {len(builder.postings)} anchors over {len(builder.docs)} sentences")
+
+
+def export_phrase_index(builder: PhraseIndexBuilder) -> None:
+    """Finish the positional phrase/KWIC index; its sentences were streamed to disk as they arrived."""
+    print("\nWriting phrase index...")
+    builder.write()
+    print(f"  {len(builder.postings)} words over {len(builder)} sentences")
+
+
+def export_restoration(builder: RestorationBuilder, out_dir: Path = PROCESSED_DIR) -> None:
+    """Write the ASCII → diacritized-form restoration table."""
+    print("\nWriting diacritic restoration index...")
+    builder.write(out_dir / "index")
+    print(f"  {len(builder.candidates)} ASCII forms, {len(builder.counts)} corpus word forms")
+
+
+def export_frequency(builder: FrequencyBuilder, out_dir: Path = PROCESSED_DIR) -> None:
+    """Write per-source unigram/bigram counts for words and word anchors."""
+    print("\nWriting corpus frequency table...")
+    builder.write(out_dir / "index" / FREQUENCY_FILE)
+    print(f"  {len(builder)} unigram/bigram keys")
+
+
+def export_reverse_index(
+    entries: list[Entry], eng_entries: list[EngHawEntry], resolver: LinkResolver | None = None,
+    out_dir: Path = PROCESSED_DIR,
+) -> None:
+    """Write the BM25 English → Hawaiian index over definitions and EH translations."""
+    print("\nWriting reverse lookup index...")
+    builder = ReverseIndexBuilder()
+    builder.add_entries(entries)
+    builder.add_translations(eng_entries, resolver or LinkResolver(entries))
+    builder.write(out_dir / "index")
+    print(f"  {len(builder.postings)} field terms over {len(builder.docs)} entries")
+
+
+def export_facets(entries: list[Entry], out_dir: Path = PROCESSED_DIR) -> FacetIndex:
+    """Write per-facet bitsets over entry ordinals for live browse filtering."""
+    print("\nWriting facet bitmaps...")
+    facets = FacetIndex.build(entries)
+    facets.save(out_dir / "index" / FACETS_FILE)
+    print(f"  {sum(len(v) for v in facets.bitmaps.values())} facet values over {len(facets)} entries")
+    return facets
+
+
+def export_autocomplete(
+    entries: list[Entry], restoration: RestorationBuilder, raw_dir: Path = RAW_DIR, out_dir: Path = PROCESSED_DIR,
+) -> None:
+    """Write the front-coded, frequency-ranked autocomplete chunks."""
+    print("\nWriting autocomplete chunks...")
+    builder = AutocompleteBuilder(restoration.form_count)
+    builder.add_index_pages(parse_all_index_pages(raw_dir))
+    builder.add_entries(entries)
+    builder.write(out_dir / "autocomplete")
+    print(f"  {len(builder)} suggestions")
+
+
+def export_rhyme_index(entries: list[Entry], out_dir: Path = PROCESSED_DIR) -> None:
+    """Write the reversed-headword suffix index for ends-with and rhyme queries."""
+    print("\nWriting rhyme index...")
+    index = RhymeIndex.build(entries)
+    index.save(out_dir / "index" / RHYME_FILE)
+    print(f"  {len(index)} headwords")
+
+
+def export_secondary_indexes(entries: list[Entry], out_dir: Path = PROCESSED_DIR) -> None:
+    """Write the etymology, loanword, dialect and citation lookup tables."""
+    print("\nWriting secondary indexes...")
+    builder = SecondaryIndexBuilder()
+    builder.add_entries(entries)
+    builder.write(out_dir / "index" / SECONDARY_DIR)
+    for name, postings in builder.postings.items():
+        print(f"  {name}: {len(postings)} keys")
+
+
+def export_graph(
+    entries: list[Entry], eng_entries: list[EngHawEntry], resolver: LinkResolver | None = None,
+    out_dir: Path = PROCESSED_DIR,
+) -> EntryGraph:
+    """Write the cross-reference / linked-word / translation graph in CSR form."""
+    print("\nBuilding entry graph...")
+    graph = EntryGraph.build(entries, eng_entries, resolver)
+    graph.save(out_dir / "graph")
+    print(f"  {len(graph.nodes)} nodes, {graph.edge_count} edges")
+    return graph
+
+
 def export_all(raw_dir: Path = RAW_DIR, out_dir: Path = PROCESSED_DIR) -> dict:
     """Run the full export pipeline with validation."""
     print("=" * 60)
     print("CHD Scraper v2 — Full Export")
     print("=" * 60)
 
-    entries = export_haw_eng(raw_dir, out_dir)
+    tokens = WordTokenResolver()
+    entries = export_haw_eng(raw_dir, out_dir, prepare=tokens.resolve_examples)
     eng_entries = export_eng_haw(raw_dir, out_dir)
-    conc_instances = export_concordance(raw_dir, out_dir)
+    word_index = WordIndexBuilder()
+    word_index.add_examples(entries)
+    phrase_index = PhraseIndexBuilder(out_dir / "index")
+    phrase_index.add_examples(entries)
+    restoration = RestorationBuilder()
+    restoration.add_headwords(entries)
+    restoration.add_examples(entries)
+    frequency = FrequencyBuilder()
+    frequency.add_examples(entries)
+    conc_count = export_concordance(
+        raw_dir, out_dir,
+        consumers=[tokens.resolve_concordance, word_index.add_concordance, phrase_index.add_concordance,
+                   restoration.add_concordance, frequency.add_concordance],
+    )
     export_support(raw_dir, out_dir)
+    export_store(entries, out_dir)
+    export_shards(entries, raw_dir, out_dir, tokens.links)
+    export_word_index(word_index, out_dir)
+    export_phrase_index(phrase_index)
+    export_restoration(restoration, out_dir)
+    export_frequency(frequency, out_dir)
+    export_autocomplete(entries, restoration, raw_dir, out_dir)
+    export_facets(entries, out_dir)
+    export_rhyme_index(entries, out_dir)
+    export_secondary_indexes(entries, out_dir)
+    export_reverse_index(entries, eng_entries, tokens.links, out_dir)
+    export_graph(entries, eng_entries, tokens.links, out_dir)
 
     # Validation
     print("\nRunning validation...")
-    link_report = validate_link_resolution(entries)
+    link_report = validate_link_resolution(entries, tokens.links)
+    token_report = tokens.report()
     entry_report = validate_entries(entries)
 
     report = {
         "haw_eng_entries": len(entries),
         "eng_haw_entries": len(eng_entries),
-        "concordance_instances": len(conc_instances),
+        "concordance_instances": conc_count,
         "link_resolution": link_report,
+        "word_token_resolution": token_report,
         "entry_validation": entry_report,
     }
     _write_json(report, out_dir / "validation_report.json")
 
     print(f"\n  Cross-ref resolution: {link_report['cross_refs']['resolution_rate']}%")
     print(f"  Linked word resolution: {link_report['linked_words']['resolution_rate']}%")
+    for source, stats in token_report.items():
+        print(f"  Word token resolution ({source}): {stats['resolution_rate']}%")
     print(f"  Entry issues: {len(entry_report['issues'])}")
     print(f"  Duplicate IDs: {entry_report['duplicate_ids']}")
 
@@ -158,7 +364,7 @@ def export_all(raw_dir: Path = RAW_DIR, out_dir: Path = PROCESSED_DIR) -> dict:
     summary = {
         "total_haw_eng": len(entries),
         "total_eng_haw": len(eng_entries),
-        "total_concordance": len(conc_instances),
+        "total_concordance": conc_count,
         "total_examples": sum(len(e.examples) for e in entries),
         "total_cross_refs": sum(len(e.cross_refs) for e in entries),
         "total_etymologies": sum(1 for e in entries if e.etymology),
@@ -0,0 +1,165 @@
+"""Faceted bitmap indexes over entry attributes.
+
+One bitset per (facet, value) over entry ordinals (position in the export's
+entry list). Bitsets are Python ints, so AND/OR/NOT are single C-level
+big-integer operations and counts are int.bit_count().
+
+Facets:
+
+  - flags: in_pe, in_mk, in_andrews, in_placenames, is_loanword ("true"/"false")
+  - dialect, usage_register: one value per entry (empty values skipped)
+  - topics, pos_english, source_dict: multi-valued; pos_english and
+    source_dict are collected from the entry's senses
+
+Saved as index/facets.bin:
+
+    header      magic "CHDFACE1", u32 length of the JSON directory
+    directory   JSON {"ids": [...], "facets": {facet: {value: [offset, length]}}}
+    bitmaps     zlib-compressed little-endian bitset bytes
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+
+from chd.models import Entry
+
+FACETS_FILE = "facets.bin"
+MAGIC = b"CHDFACE1"
+HEADER = struct.Struct("<8sI")
+
+FLAG_FACETS = ("in_pe", "in_mk", "in_andrews", "in_placenames", "is_loanword")
+VALUE_FACETS = ("dialect", "usage_register")
+MULTI_FACETS = ("topics", "pos_english", "source_dict")
+FACETS = FLAG_FACETS + VALUE_FACETS + MULTI_FACETS
+
+Filter = Mapping[str, str | Iterable[str]]
+
+
+def facet_values(entry: Entry) -> dict[str, set[str]]:
+    """Every facet value of one entry."""
+    values: dict[str, set[str]] = {f: {"true" if getattr(entry, f) else "false"} for f in FLAG_FACETS}
+    for f in VALUE_FACETS:
+        values[f] = {getattr(entry, f)} - {""}
+    values["topics"] = set(entry.topics)
+    values["pos_english"] = {s.pos_english for s in entry.senses if s.pos_english}
+    values["source_dict"] = {s.source_dict for s in entry.senses}
+    return values
+
+
+def _bitset(ordinals: list[int], size: int) -> int:
+    raw = bytearray((size + 7) // 8)
+    for i in ordinals:
+        raw[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(raw, "little")
+
+
+class FacetIndex:
+    """(facet, value) → bitset over entry ordinals, with boolean queries and counts."""
+
+    def __init__(self, ids: list[str], bitmaps: dict[str, dict[str, int]]):
+        self.ids = ids
+        self.bitmaps = bitmaps
+        self.all = (1 << len(ids)) - 1
+
+    @classmethod
+    def build(cls, entries: list[Entry]) -> FacetIndex:
+        ordinals: dict[str, dict[str, list[int]]] = {f: {} for f in FACETS}
+        for i, e in enumerate(entries):
+            for facet, values in facet_values(e).items():
+                for value in values:
+                    ordinals[facet].setdefault(value, []).append(i)
+        bitmaps = {f: {v: _bitset(ords, len(entries)) for v, ords in sorted(by_value.items())}
+                   for f, by_value in ordinals.items()}
+        return cls([e.id for e in entries], bitmaps)
+
+    # ─── Persistence ─────────────────────────────────────────────────────────
+
+    def save(self, path: Path) -> None:
+        nbytes = (len(self.ids) + 7) // 8
+        directory: dict[str, dict[str, list[int]]] = {}
+        blob = bytearray()
+        for facet, by_value in self.bitmaps.items():
+            directory[facet] = {}
+            for value, bits in by_value.items():
+                packed = zlib.compress(bits.to_bytes(nbytes, "little"))
+                directory[facet][value] = [len(blob), len(packed)]
+                blob += packed
+        meta = json.dumps({"ids": self.ids, "facets": directory}, ensure_ascii=False).encode("utf-8")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as f:
+            f.write(HEADER.pack(MAGIC, len(meta)))
+            f.write(meta)
+            f.write(blob)
+
+    @classmethod
+    def load(cls, path: Path) -> FacetIndex:
+        data = path.read_bytes()
+        magic, meta_len = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a facets file")
+        meta = json.loads(data[HEADER.size:HEADER.size + meta_len])
+        blob = memoryview(data)[HEADER.size + meta_len:]
+        bitmaps = {
+            facet: {v: int.from_bytes(zlib.decompress(blob[off:off + n]), "little") for v, (off, n) in by_value.items()}
+            for facet, by_value in meta["facets"].items()
+        }
+        return cls(meta["ids"], bitmaps)
+
+    # ─── Queries ─────────────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _values(self, facet: str) -> dict[str, int]:
+        if facet not in self.bitmaps:
+            raise KeyError(f"Unknown facet {facet!r}; expected one of {', '.join(FACETS)}")
+        return self.bitmaps[facet]
+
+    def bitmap(self, facet: str, value: str = "true") -> int:
+        return self._values(facet).get(value, 0)
+
+    def any_of(self, facet: str, values: str | Iterable[str]) -> int:
+        """OR of the bitsets for several values of one facet."""
+        bits = 0
+        for value in [values] if isinstance(values, str) else values:
+            bits |= self.bitmap(facet, value)
+        return bits
+
+    def negate(self, bits: int) -> int:
+        return self.all & ~bits
+
+    def query(self, include: Filter | None = None, exclude: Filter | None = None) -> int:
+        """Entries matching every include facet (any listed value) and no exclude facet.
+
+        query({"in_pe": "true", "pos_english": ["noun", "verb"]}, exclude={"topics": "plants"})
+        """
+        bits = self.all
+        for facet, values in (include or {}).items():
+            bits &= self.any_of(facet, values)
+        for facet, values in (exclude or {}).items():
+            bits &= ~self.any_of(facet, values)
+        return bits
+
+    def ids_of(self, bits: int) -> list[str]:
+        """Entry IDs for the set bits, in export order."""
+        ids = []
+        for byte_index, byte in enumerate(bits.to_bytes((len(self.ids) + 7) // 8, "little")):
+            while byte:
+                low = byte & -byte
+                ids.append(self.ids[(byte_index << 3) + low.bit_length() - 1])
+                byte ^= low
+        return ids
+
+    def count(self, bits: int) -> int:
+        return bits.bit_count()
+
+    def facet_counts(self, facet: str, within: int | None = None) -> dict[str, int]:
+        """{value: entries with that value} for one facet, optionally inside a result set."""
+        within = self.all if within is None else within
+        counts = {value: (bits & within).bit_count() for value, bits in self._values(facet).items()}
+        return {v: n for v, n in counts.items() if n}
@@ -0,0 +1,180 @@
+"""Corpus word-frequency statistics over examples and concordance rows.
+
+Counted in the same streaming pass as the other export indexes:
+
+  - words: folded with chd.kwic.tokenize (ʻokina/kahakō- and case-insensitive),
+    unigrams and adjacent-word bigrams
+  - anchors: WordToken.anchor values, unigrams and bigrams of consecutive
+    linked words
+
+Each key carries one count per source: the example's source dictionary
+(DictSource values) or "concordance".
+
+File layout of index/frequency.bin (little-endian):
+
+    header     magic "CHDFREQ1", u32 key count, u32 column count, u32 length
+               of the column-name blob, u64 offset of the key blob
+    columns    tab-separated UTF-8 column names
+    records    one per key, sorted by UTF-8 key bytes: u32 key offset,
+               u32 key length, u32 count per column
+    keys       concatenated UTF-8 keys
+
+Keys are "<kind>\\t<part>[\\t<part>]" where kind is "w" (word) or "a"
+(anchor). Lookups binary-search the fixed-size records in an mmap.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from chd.enums import DictSource
+from chd.kwic import fold, tokenize
+from chd.models import ConcordanceInstance, Entry, WordToken
+
+FREQUENCY_FILE = "frequency.bin"
+SOURCES = [s.value for s in DictSource] + ["concordance"]
+
+MAGIC = b"CHDFREQ1"
+HEADER = struct.Struct("<8sIIIQ")
+KEY_REF = struct.Struct("<II")
+
+WORD = "w"
+ANCHOR = "a"
+
+
+def _key(kind: str, *parts: str) -> str:
+    return "\t".join((kind, *parts))
+
+
+class FrequencyBuilder:
+    """Accumulates per-source unigram and bigram counts as the corpus streams past."""
+
+    def __init__(self):
+        self.counts: dict[str, list[int]] = {}
+        self._column = {s: i for i, s in enumerate(SOURCES)}
+
+    def _bump(self, key: str, column: int) -> None:
+        row = self.counts.get(key)
+        if row is None:
+            row = self.counts[key] = [0] * len(SOURCES)
+        row[column] += 1
+
+    def _add_sequence(self, kind: str, items: list[str], column: int) -> None:
+        for i, item in enumerate(items):
+            self._bump(_key(kind, item), column)
+            if i:
+                self._bump(_key(kind, items[i - 1], item), column)
+
+    def add(self, text: str, tokens: Iterable[WordToken], source: str) -> None:
+        column = self._column[source]
+        self._add_sequence(WORD, [w for w, _, _ in tokenize(text)], column)
+        self._add_sequence(ANCHOR, [t.anchor for t in tokens if t.anchor], column)
+
+    def add_examples(self, entries: list[Entry]) -> None:
+        for e in entries:
+            for ex in e.examples:
+                self.add(ex.hawaiian_text, ex.word_tokens, ex.source_dict)
+
+    def add_concordance(self, letter: str, ordinal: int, inst: ConcordanceInstance) -> None:
+        """Export consumer: called once per concordance row in write order."""
+        self.add(inst.hawaiian_text, inst.word_tokens, "concordance")
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def write(self, path: Path) -> None:
+        record = struct.Struct(f"<II{len(SOURCES)}I")
+        columns = "\t".join(SOURCES).encode("utf-8")
+        items = sorted(((k.encode("utf-8"), row) for k, row in self.counts.items()), key=lambda kv: kv[0])
+        records = bytearray()
+        keys = bytearray()
+        for key, row in items:
+            records += record.pack(len(keys), len(key), *row)
+            keys += key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as f:
+            f.write(HEADER.pack(MAGIC, len(items), len(SOURCES), len(columns),
+                                HEADER.size + len(columns) + len(records)))
+            f.write(columns)
+            f.write(records)
+            f.write(keys)
+
+
+class FrequencyTable:
+    """Read-only frequency table opened with mmap."""
+
+    def __init__(self, path: Path):
+        self._file = path.open("rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, ncols, cols_len, self._keys_start = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a frequency file")
+        self.sources = self._mm[HEADER.size:HEADER.size + cols_len].decode("utf-8").split("\t")
+        self._records_start = HEADER.size + cols_len
+        self._counts = struct.Struct(f"<{ncols}I")
+        self._record_size = KEY_REF.size + self._counts.size
+
+    def close(self) -> None:
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> FrequencyTable:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _key_at(self, i: int) -> bytes:
+        off, length = KEY_REF.unpack_from(self._mm, self._records_start + i * self._record_size)
+        start = self._keys_start + off
+        return self._mm[start:start + length]
+
+    def _row(self, key: str) -> tuple[int, ...] | None:
+        target = key.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._key_at(lo) == target:
+            return self._counts.unpack_from(self._mm, self._records_start + lo * self._record_size + KEY_REF.size)
+        return None
+
+    def counts(self, kind: str, *parts: str) -> dict[str, int]:
+        """{source: count} for one key, zero-filled if the key is absent."""
+        row = self._row(_key(kind, *parts))
+        return dict(zip(self.sources, row or [0] * len(self.sources)))
+
+    def _total(self, kind: str, parts: tuple[str, ...], source: str) -> int:
+        row = self._row(_key(kind, *parts))
+        if row is None:
+            return 0
+        return row[self.sources.index(source)] if source else sum(row)
+
+    def word(self, word: str, source: str = "") -> int:
+        """Occurrences of a word (any diacritic/case variant), optionally one source only."""
+        return self._total(WORD, (fold(word),), source)
+
+    def word_bigram(self, first: str, second: str, source: str = "") -> int:
+        return self._total(WORD, (fold(first), fold(second)), source)
+
+    def anchor(self, anchor: str, source: str = "") -> int:
+        return self._total(ANCHOR, (anchor,), source)
+
+    def anchor_bigram(self, first: str, second: str, source: str = "") -> int:
+        return self._total(ANCHOR, (first, second), source)
+
+    def items(self) -> Iterator[tuple[str, dict[str, int]]]:
+        """Every (key, {source: count}) in key order."""
+        for i in range(self._count):
+            at = self._records_start + i * self._record_size + KEY_REF.size
+            yield self._key_at(i).decode("utf-8"), dict(zip(self.sources, self._counts.unpack_from(self._mm, at)))
@@ -0,0 +1,138 @@
+"""Find every known headword in running Hawaiian text in one pass.
+
+An Aho-Corasick automaton is built over headwords, ASCII headwords and alt
+spellings. Its alphabet is folded words (chd.kwic.tokenize: ʻokina/kahakō-
+and case-insensitive) rather than characters, so matches always align
+with word boundaries, multi-word compounds are single patterns, and the
+automaton has one state per distinct word prefix instead of per letter.
+"""
+
+from __future__ import annotations
+
+import json
+from collections import deque
+from pathlib import Path
+from typing import NamedTuple
+
+from chd.kwic import tokenize
+from chd.models import Entry
+from chd.unicode import normalize_okina
+
+
+class GlossMatch(NamedTuple):
+    """A headword occurrence: character span in the input and candidate entry IDs.
+
+    Candidates whose headword matches the span exactly (including ʻokina and
+    kahakō, ignoring case) come first.
+    """
+    start: int
+    end: int
+    text: str
+    entry_ids: list[str]
+
+
+class Glosser:
+    """Word-level Aho-Corasick automaton over dictionary headwords."""
+
+    def __init__(self, entries: list[Entry]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._depth: list[int] = [0]
+        self._out: list[int] = [-1]   # pattern index ending at this state, or -1
+        self._dict: list[int] = [0]   # nearest terminal state along fail links (0 = none)
+        self._patterns: list[list[tuple[str, str]]] = []  # (entry id, folded-case headword) per pattern
+
+        for e in entries:
+            if not e.id:
+                continue
+            exact = normalize_okina(e.headword).lower()
+            for form in {e.headword, e.headword_ascii, *e.alt_spellings}:
+                if form:
+                    self._add(form, e.id, exact)
+        self._link()
+
+    @classmethod
+    def from_export(cls, data_dir: Path) -> Glosser:
+        """Build from exported haw_eng/*.json."""
+        entries = []
+        for jf in sorted((data_dir / "haw_eng").glob("*.json")):
+            for e in json.loads(jf.read_text(encoding="utf-8")):
+                entries.append(Entry(
+                    id=e.get("id", ""), headword=e.get("headword", ""),
+                    headword_ascii=e.get("headword_ascii", ""), alt_spellings=e.get("alt_spellings", []),
+                ))
+        return cls(entries)
+
+    def _add(self, form: str, entry_id: str, exact: str) -> None:
+        words = [w for w, _, _ in tokenize(form)]
+        if not words:
+            return
+        state = 0
+        for w in words:
+            nxt = self._goto[state].get(w)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][w] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._depth.append(self._depth[state] + 1)
+                self._out.append(-1)
+                self._dict.append(0)
+            state = nxt
+        if self._out[state] < 0:
+            self._out[state] = len(self._patterns)
+            self._patterns.append([])
+        candidates = self._patterns[self._out[state]]
+        if (entry_id, exact) not in candidates:
+            candidates.append((entry_id, exact))
+
+    def _link(self) -> None:
+        """Breadth-first computation of failure and dictionary-suffix links."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for w, child in self._goto[state].items():
+                f = self._fail[state]
+                while f and w not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(w, 0)
+                self._fail[child] = target if target != child else 0
+                fc = self._fail[child]
+                self._dict[child] = fc if self._out[fc] >= 0 else self._dict[fc]
+                queue.append(child)
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def find(self, text: str, longest: bool = False) -> list[GlossMatch]:
+        """Every headword occurrence in text, ordered by start then length (longest first).
+
+        With longest, overlapping matches are resolved leftmost-longest.
+        """
+        words = tokenize(text)
+        found: list[tuple[int, int, int]] = []  # (first word, last word, pattern)
+        state = 0
+        for i, (w, _, _) in enumerate(words):
+            while state and w not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(w, 0)
+            s = state if self._out[state] >= 0 else self._dict[state]
+            while s:
+                found.append((i - self._depth[s] + 1, i, self._out[s]))
+                s = self._dict[s]
+        found.sort(key=lambda m: (m[0], -m[1]))
+
+        matches = []
+        covered = -1
+        for first, last, pattern in found:
+            if longest:
+                if first <= covered:
+                    continue
+                covered = last
+            start, end = words[first][1], words[last][2]
+            span = text[start:end]
+            exact = normalize_okina(span).lower()
+            candidates = sorted(self._patterns[pattern], key=lambda c: c[1] != exact)
+            ids = list(dict.fromkeys(eid for eid, _ in candidates))
+            matches.append(GlossMatch(start, end, span, ids))
+        return matches
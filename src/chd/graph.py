@@ -0,0 +1,234 @@
+"""Entry relationship graph in compressed sparse row (CSR) form.
+
+Nodes are entries (by anchor ID) plus English words from the
+English-Hawaiian section ("eng:<word>"). Edges are typed:
+
+  - one type per CrossRefType (entry → target entry)
+  - "linked_word": a hyperlinked word in a sense definition
+  - "translation": English word → Hawaiian entry
+
+Link targets are resolved to entry IDs with chd.validate.LinkResolver;
+unresolvable edges are dropped. Out-edges and in-edges are both kept in
+CSR arrays so traversals can follow either direction without touching the
+database. Saved as graph/graph.bin (arrays) and graph/nodes.json (IDs,
+labels, edge type names).
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from array import array
+from collections import deque
+from collections.abc import Iterable
+from pathlib import Path
+
+from chd.enums import CrossRefType
+from chd.models import EngHawEntry, Entry
+from chd.validate import LinkResolver
+
+EDGE_TYPES = [t.value for t in CrossRefType] + ["linked_word", "translation"]
+GRAPH_FILE = "graph.bin"
+NODES_FILE = "nodes.json"
+GRAPH_MAGIC = b"CHDGRAF1"
+GRAPH_HEADER = struct.Struct("<8sII")
+
+Edge = tuple[int, int, int]  # source node, target node, edge type index
+
+
+def _csr(n: int, edges: list[Edge], reverse: bool = False) -> tuple[array, array, array]:
+    """Counting-sort edges by source (or target) into indptr/indices/types arrays."""
+    key, other = (1, 0) if reverse else (0, 1)
+    indptr = array("I", [0]) * (n + 1)
+    for e in edges:
+        indptr[e[key] + 1] += 1
+    for i in range(n):
+        indptr[i + 1] += indptr[i]
+    fill = array("I", indptr[:-1])
+    indices = array("I", [0]) * len(edges)
+    types = array("B", [0]) * len(edges)
+    for e in edges:
+        slot = fill[e[key]]
+        indices[slot] = e[other]
+        types[slot] = e[2]
+        fill[e[key]] += 1
+    return indptr, indices, types
+
+
+class EntryGraph:
+    """Typed directed graph over entries and English words."""
+
+    def __init__(self, nodes: list[str], labels: list[str], edges: list[Edge]):
+        self.nodes = nodes
+        self.labels = labels
+        self.index = {node: i for i, node in enumerate(nodes)}
+        self.out_ptr, self.out_idx, self.out_type = _csr(len(nodes), edges)
+        self.in_ptr, self.in_idx, self.in_type = _csr(len(nodes), edges, reverse=True)
+
+    @classmethod
+    def build(cls, entries: list[Entry], eng_entries: Iterable[EngHawEntry] = (),
+              resolver: LinkResolver | None = None) -> EntryGraph:
+        resolver = resolver or LinkResolver(entries)
+        nodes: list[str] = []
+        labels: list[str] = []
+        index: dict[str, int] = {}
+
+        def node(node_id: str, label: str) -> int:
+            i = index.get(node_id)
+            if i is None:
+                i = index[node_id] = len(nodes)
+                nodes.append(node_id)
+                labels.append(label)
+            return i
+
+        for e in entries:
+            if e.id:
+                node(e.id, e.headword_display or e.headword)
+
+        type_index = {t: i for i, t in enumerate(EDGE_TYPES)}
+        edges: set[Edge] = set()
+
+        def link(src: int, target: str, edge_type: str) -> None:
+            dst = index.get(resolver.resolve(target) or "")
+            if dst is not None and dst != src:
+                edges.add((src, dst, type_index[edge_type]))
+
+        for e in entries:
+            src = index.get(e.id)
+            if src is None:
+                continue
+            for xref in e.cross_refs:
+                if xref.ref_type in type_index:
+                    link(src, xref.target_anchor or xref.target_headword, xref.ref_type)
+            for sense in e.senses:
+                for lw in sense.linked_words:
+                    link(src, lw.target_anchor or lw.surface, "linked_word")
+
+        for eng in eng_entries:
+            if not eng.translations:
+                continue
+            src = node(f"eng:{eng.english_word}", eng.english_word)
+            for t in eng.translations:
+                link(src, t.target_anchor or t.hawaiian_word, "translation")
+
+        return cls(nodes, labels, sorted(edges))
+
+    # ─── Persistence ─────────────────────────────────────────────────────────
+
+    def save(self, out_dir: Path) -> None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        with (out_dir / GRAPH_FILE).open("wb") as f:
+            f.write(GRAPH_HEADER.pack(GRAPH_MAGIC, len(self.nodes), len(self.out_idx)))
+            for arr in (self.out_ptr, self.out_idx, self.out_type, self.in_ptr, self.in_idx, self.in_type):
+                arr.tofile(f)
+        meta = {"edge_types": EDGE_TYPES, "nodes": self.nodes, "labels": self.labels}
+        (out_dir / NODES_FILE).write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+
+    @classmethod
+    def load(cls, out_dir: Path) -> EntryGraph:
+        meta = json.loads((out_dir / NODES_FILE).read_text(encoding="utf-8"))
+        graph = cls.__new__(cls)
+        graph.nodes = meta["nodes"]
+        graph.labels = meta["labels"]
+        graph.index = {node: i for i, node in enumerate(graph.nodes)}
+        with (out_dir / GRAPH_FILE).open("rb") as f:
+            magic, n, m = GRAPH_HEADER.unpack(f.read(GRAPH_HEADER.size))
+            if magic != GRAPH_MAGIC:
+                raise ValueError(f"{out_dir / GRAPH_FILE} is not a graph file")
+            arrays = []
+            for code, size in (("I", n + 1), ("I", m), ("B", m)) * 2:
+                arr = array(code)
+                arr.fromfile(f, size)
+                arrays.append(arr)
+        graph.out_ptr, graph.out_idx, graph.out_type, graph.in_ptr, graph.in_idx, graph.in_type = arrays
+        return graph
+
+    # ─── Queries ─────────────────────────────────────────────────────────────
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.out_idx)
+
+    def _neighbors(self, i: int, direction: str, types: set[int] | None) -> Iterable[int]:
+        if direction in ("out", "both"):
+            for slot in range(self.out_ptr[i], self.out_ptr[i + 1]):
+                if types is None or self.out_type[slot] in types:
+                    yield self.out_idx[slot]
+        if direction in ("in", "both"):
+            for slot in range(self.in_ptr[i], self.in_ptr[i + 1]):
+                if types is None or self.in_type[slot] in types:
+                    yield self.in_idx[slot]
+
+    def _type_filter(self, types: Iterable[str] | None) -> set[int] | None:
+        return None if types is None else {EDGE_TYPES.index(t) for t in types}
+
+    def edges(self, node: str, direction: str = "out") -> list[tuple[str, str]]:
+        """(neighbor ID, edge type) pairs for one node."""
+        i = self.index[node]
+        result = []
+        if direction in ("out", "both"):
+            result += [(self.nodes[self.out_idx[s]], EDGE_TYPES[self.out_type[s]])
+                       for s in range(self.out_ptr[i], self.out_ptr[i + 1])]
+        if direction in ("in", "both"):
+            result += [(self.nodes[self.in_idx[s]], EDGE_TYPES[self.in_type[s]])
+                       for s in range(self.in_ptr[i], self.in_ptr[i + 1])]
+        return result
+
+    def neighborhood(self, node: str, k: int = 1, types: Iterable[str] | None = None,
+                     direction: str = "both") -> dict[str, int]:
+        """Every node within k hops of node, mapped to its hop distance."""
+        allowed = self._type_filter(types)
+        start = self.index[node]
+        dist = {start: 0}
+        frontier = [start]
+        for hop in range(1, k + 1):
+            nxt = []
+            for i in frontier:
+                for j in self._neighbors(i, direction, allowed):
+                    if j not in dist:
+                        dist[j] = hop
+                        nxt.append(j)
+            frontier = nxt
+        return {self.nodes[i]: d for i, d in dist.items()}
+
+    def shortest_path(self, source: str, target: str, types: Iterable[str] | None = None,
+                      direction: str = "both") -> list[str]:
+        """Node IDs along a fewest-hops path, or [] if unreachable."""
+        allowed = self._type_filter(types)
+        start, goal = self.index[source], self.index[target]
+        parent = {start: start}
+        queue = deque([start])
+        while queue:
+            i = queue.popleft()
+            if i == goal:
+                path = [i]
+                while path[-1] != start:
+                    path.append(parent[path[-1]])
+                return [self.nodes[j] for j in reversed(path)]
+            for j in self._neighbors(i, direction, allowed):
+                if j not in parent:
+                    parent[j] = i
+                    queue.append(j)
+        return []
+
+    def components(self, types: Iterable[str] | None = None) -> list[list[str]]:
+        """Weakly connected components, largest first."""
+        allowed = self._type_filter(types)
+        seen = bytearray(len(self.nodes))
+        result = []
+        for start in range(len(self.nodes)):
+            if seen[start]:
+                continue
+            seen[start] = 1
+            stack = [start]
+            members = []
+            while stack:
+                i = stack.pop()
+                members.append(self.nodes[i])
+                for j in self._neighbors(i, "both", allowed):
+                    if not seen[j]:
+                        seen[j] = 1
+                        stack.append(j)
+            result.append(members)
+        result.sort(key=len, reverse=True)
+        return result
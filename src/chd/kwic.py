@@ -0,0 +1,228 @@
+"""Keyword-in-context (KWIC), phrase and proximity queries over example sentences.
+
+Built during export over Example.hawaiian_text and ConcordanceInstance.hawaiian_text:
+
+    index/phrase_postings.bin   folded word → [(sentence id, [word positions])] (chd.postings)
+    index/sentences.bin         sentence id → (kind, key, ordinal, hawaiian, english)
+
+sentences.bin is a header (magic, sentence count, offset-table position),
+the JSON sentence blobs in id order, then count + 1 u64 file offsets. The
+builder appends each blob to the file as its row streams past and keeps
+only the offsets, so memory doesn't grow with the concordance; the header
+is filled in (and the magic set) only once write() completes.
+
+Words are folded with normalize_okina + to_ascii + lower(), so queries are
+ʻokina/kahakō- and case-insensitive. Sentence locators follow chd.word_index:
+("example", entry id, example index) or ("concordance", letter, row index).
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import re
+import struct
+import sys
+from array import array
+from collections.abc import Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from chd.models import ConcordanceInstance, Entry
+from chd.postings import PostingsBuilder, PostingsIndex
+from chd.unicode import normalize_okina, to_ascii
+
+POSTINGS_FILE = "phrase_postings.bin"
+SENTENCES_FILE = "sentences.bin"
+
+SENTENCES_MAGIC = b"CHDSENT2"
+SENTENCES_HEADER = struct.Struct("<8sIQ")
+OFFSET = struct.Struct("<Q")
+
+WORD_RE = re.compile(r"\w+")
+
+
+class Sentence(NamedTuple):
+    kind: str
+    key: str
+    ordinal: int
+    hawaiian_text: str
+    english_text: str
+
+
+class Hit(NamedTuple):
+    """A match in one sentence, as word positions [start, end)."""
+    doc: int
+    start: int
+    end: int
+
+
+class KwicLine(NamedTuple):
+    left: str
+    match: str
+    right: str
+    sentence: Sentence
+
+
+def fold(word: str) -> str:
+    """Index key for a word: ʻokina variants unified, diacritics stripped, lowercased."""
+    return to_ascii(normalize_okina(word)).lower()
+
+
+def tokenize(text: str) -> list[tuple[str, int, int]]:
+    """(folded word, start, end) character spans for each word in text.
+
+    normalize_okina maps characters one-to-one, so spans index the original text.
+    """
+    return [(fold(m.group()), m.start(), m.end()) for m in WORD_RE.finditer(normalize_okina(text))]
+
+
+class PhraseIndexBuilder:
+    """Streams sentences into index_dir/sentences.bin and collects their word positions."""
+
+    def __init__(self, index_dir: Path):
+        self.index_dir = index_dir
+        self.postings = PostingsBuilder()
+        self.offsets = array("Q")
+        index_dir.mkdir(parents=True, exist_ok=True)
+        self._file = (index_dir / SENTENCES_FILE).open("wb")
+        # Zeroed header until write(): an unfinished file is rejected by PhraseIndex
+        self._file.write(bytes(SENTENCES_HEADER.size))
+        self._pos = SENTENCES_HEADER.size
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def add(self, sentence: Sentence) -> int:
+        doc = len(self.offsets)
+        blob = json.dumps(list(sentence), ensure_ascii=False).encode("utf-8")
+        self.offsets.append(self._pos)
+        self._file.write(blob)
+        self._pos += len(blob)
+        for pos, (word, _, _) in enumerate(tokenize(sentence.hawaiian_text)):
+            self.postings.add(word, doc, pos)
+        return doc
+
+    def add_examples(self, entries: list[Entry]) -> None:
+        for e in entries:
+            for i, ex in enumerate(e.examples):
+                if ex.hawaiian_text:
+                    self.add(Sentence("example", e.id, i, ex.hawaiian_text, ex.english_text))
+
+    def add_concordance(self, letter: str, ordinal: int, inst: ConcordanceInstance) -> None:
+        """Export consumer: called once per concordance row in write order."""
+        if inst.hawaiian_text:
+            self.add(Sentence("concordance", letter, ordinal, inst.hawaiian_text, inst.english_text))
+
+    def write(self) -> None:
+        """Finish sentences.bin and write the postings."""
+        self.postings.write(self.index_dir / POSTINGS_FILE)
+        offsets = array("Q", self.offsets)
+        offsets.append(self._pos)
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        self._file.write(offsets.tobytes())
+        self._file.seek(0)
+        self._file.write(SENTENCES_HEADER.pack(SENTENCES_MAGIC, len(self.offsets), self._pos))
+        self._file.close()
+
+
+class PhraseIndex:
+    """Query API over an index written by PhraseIndexBuilder."""
+
+    def __init__(self, index_dir: Path):
+        self.postings = PostingsIndex(index_dir / POSTINGS_FILE)
+        self._file = (index_dir / SENTENCES_FILE).open("rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, self._offsets_at = SENTENCES_HEADER.unpack_from(self._mm, 0)
+        if magic != SENTENCES_MAGIC:
+            self.close()
+            raise ValueError(f"{index_dir / SENTENCES_FILE} is not a sentences file")
+
+    def close(self) -> None:
+        self.postings.close()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> PhraseIndex:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def sentence(self, doc: int) -> Sentence:
+        at = self._offsets_at + doc * OFFSET.size
+        (start,), (end,) = OFFSET.unpack_from(self._mm, at), OFFSET.unpack_from(self._mm, at + OFFSET.size)
+        kind, key, ordinal, haw, eng = json.loads(self._mm[start:end])
+        return Sentence(kind, key, ordinal, haw, eng)
+
+    def _matches(self, words: list[str]) -> dict[int, list[int]]:
+        """{doc: [start positions]} where the folded words occur consecutively."""
+        if not words:
+            return {}
+        postings = [dict(self.postings.get(w)) for w in words]
+        # Intersect from the rarest word outwards
+        docs = set(min(postings, key=len))
+        for p in postings:
+            docs.intersection_update(p)
+            if not docs:
+                return {}
+        matches = {}
+        for doc in sorted(docs):
+            later = [set(p[doc]) for p in postings[1:]]
+            starts = [s for s in postings[0][doc]
+                      if all(s + i + 1 in positions for i, positions in enumerate(later))]
+            if starts:
+                matches[doc] = starts
+        return matches
+
+    def phrase(self, query: str) -> list[Hit]:
+        """Every occurrence of the words of query in order, diacritic-insensitive."""
+        words = [w for w, _, _ in tokenize(query)]
+        return [Hit(doc, s, s + len(words))
+                for doc, starts in self._matches(words).items() for s in starts]
+
+    def near(self, a: str, b: str, within: int = 3, ordered: bool = False) -> list[Hit]:
+        """Sentences where phrase b occurs within `within` words of phrase a.
+
+        Distance counts word steps between the nearest ends of the two
+        phrases (adjacent words are 1 apart). With ordered, b must follow a.
+        """
+        words_a = [w for w, _, _ in tokenize(a)]
+        words_b = [w for w, _, _ in tokenize(b)]
+        matches_a = self._matches(words_a)
+        matches_b = self._matches(words_b) if matches_a else {}
+        hits = []
+        for doc in sorted(matches_a.keys() & matches_b.keys()):
+            for sa in matches_a[doc]:
+                ea = sa + len(words_a)
+                for sb in matches_b[doc]:
+                    eb = sb + len(words_b)
+                    if sb >= ea:
+                        distance = sb - ea + 1
+                    elif sa >= eb and not ordered:
+                        distance = sa - eb + 1
+                    else:
+                        continue
+                    if distance <= within:
+                        hits.append(Hit(doc, min(sa, sb), max(ea, eb)))
+        return hits
+
+    def kwic(self, hits: list[Hit], width: int = 5) -> Iterator[KwicLine]:
+        """Render hits as keyword-in-context lines with `width` words on each side."""
+        for hit in hits:
+            sentence = self.sentence(hit.doc)
+            text = sentence.hawaiian_text
+            spans = tokenize(text)
+            first, last = spans[hit.start], spans[hit.end - 1]
+            left_start = spans[max(0, hit.start - width)][1]
+            right_end = spans[min(len(spans), hit.end + width) - 1][2]
+            yield KwicLine(
+                left=text[left_start:first[1]].strip(),
+                match=text[first[1]:last[2]],
+                right=text[last[2]:right_end].strip(),
+                sentence=sentence,
+            )
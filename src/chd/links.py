@@ -147,11 +147,13 @@ def extract_linked_words(element: Tag) -> list[LinkedWord]:
     return words
 
 
+def word_token(surface: str, href: str) -> WordToken:
+    """Build a WordToken from an <a class="ex"> text and href."""
+    _, anchor = _parse_target(href, urljoin(BASE_URL, href))
+    return WordToken(surface=surface, anchor=anchor)
+
+
 def extract_word_tokens(element: Tag) -> list[WordToken]:
     """Extract all <a class="ex"> as WordToken records."""
-    tokens = []
-    for a_tag in element.find_all("a", class_="ex"):
-        href = a_tag.get("href", "") or ""
-        _, anchor = _parse_target(href, urljoin(BASE_URL, href))
-        tokens.append(WordToken(surface=a_tag.get_text(strip=True), anchor=anchor))
-    return tokens
+    return [word_token(a_tag.get_text(strip=True), a_tag.get("href", "") or "")
+            for a_tag in element.find_all("a", class_="ex")]
@@ -156,6 +156,7 @@ class Entry(CHDModel):
     headword: str = ""
     headword_display: str = ""
     headword_ascii: str = ""
+    sort_key: str = ""  # chd.collation.sort_key(headword, subscript), set at export
     subscript: str = ""
     letter_page: str = ""
     trussel_display_type: str = "main"
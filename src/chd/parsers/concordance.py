@@ -1,77 +1,156 @@
-"""Parse Concordance pages (haw-conc-*.htm and overflow con-*.htm pages)."""
+"""Parse Concordance pages (haw-conc-*.htm and overflow con-*.htm pages).
+
+Concordance is the largest dataset, so pages are parsed incrementally with
+lxml's HTMLPullParser: each top-level <tr> is turned into
+ConcordanceInstances as soon as it closes and is then discarded, keeping
+memory flat per page.
+
+Output matches the BeautifulSoup parser this replaced, which walked every
+<table> in document order and took all of its descendant rows: a nested
+table's rows follow the row holding it, and are repeated once the
+enclosing top-level table closes. <tr>s outside any table are skipped.
+"""
 
 from __future__ import annotations
 
+import codecs
+from collections.abc import Iterator
 from pathlib import Path
 
-from bs4 import Tag
+from lxml import etree
 
-from chd.links import extract_word_tokens
-from chd.models import ConcordanceInstance, WordToken
-from chd.preprocess import parse_html
+from chd.links import word_token
+from chd.models import ConcordanceInstance
 
 RAW_DIR = Path(__file__).resolve().parent.parent.parent.parent / "data" / "raw"
 
+CHUNK_SIZE = 64 * 1024
+
+
+def _has_class(el: etree._Element, cls: str) -> bool:
+    return cls in (el.get("class") or "").split()
+
+
+def _find(el: etree._Element, tag: str, cls: str) -> etree._Element | None:
+    for child in el.iter(tag):
+        if _has_class(child, cls):
+            return child
+    return None
+
+
+def _text(el: etree._Element, strip: bool = False) -> str:
+    """Element text, matching BeautifulSoup's get_text(strip=...)."""
+    if strip:
+        return "".join(s.strip() for s in el.itertext())
+    return "".join(el.itertext())
+
+
+def _parse_row(tr: etree._Element) -> ConcordanceInstance | None:
+    tds = list(tr.iter("td"))
+    if len(tds) < 4 or tds[0].get("colspan"):
+        return None
+
+    inst = ConcordanceInstance()
+
+    # Cell 0: headword
+    fw_link = _find(tds[0], "a", "fw")
+    if fw_link is not None:
+        inst.word = _text(fw_link, strip=True)
+        href = fw_link.get("href", "") or ""
+        if "#" in href:
+            inst.word_anchor = href.rsplit("#", 1)[1]
+    else:
+        inst.word = _text(tds[0], strip=True)
+
+    # Cell 1: Hawaiian sentence with word tokens
+    inst.hawaiian_text = _text(tds[1])
+    inst.word_tokens = [
+        word_token(_text(a, strip=True), a.get("href", "") or "")
+        for a in tds[1].iter("a") if _has_class(a, "ex")
+    ]
+
+    # Cell 2: English translation + note
+    eng_span = _find(tds[2], "span", "EngEx")
+    inst.english_text = _text(eng_span if eng_span is not None else tds[2], strip=True)
+    xn_span = _find(tds[2], "span", "xn")
+    if xn_span is not None:
+        inst.note = _text(xn_span, strip=True).strip("[] ")
+
+    # Cell 3: parent entry link
+    cf_link = _find(tds[3], "a", "cf")
+    if cf_link is not None:
+        href = cf_link.get("href", "") or ""
+        if "#" in href:
+            inst.parent_entry_page, inst.parent_entry_anchor = href.rsplit("#", 1)
+
+    return inst if inst.word else None
+
+
+def _rows(el: etree._Element) -> list[ConcordanceInstance]:
+    """Data rows among el and its descendant <tr>s, in document order."""
+    return [inst for tr in el.iter("tr") if (inst := _parse_row(tr)) is not None]
+
+
+def _discard(el: etree._Element) -> None:
+    """Free a finished element and everything before it in its parent."""
+    el.clear()
+    parent = el.getparent()
+    if parent is not None:
+        while el.getprevious() is not None:
+            del parent[0]
+
+
+def iter_concordance_page(filepath: Path) -> Iterator[ConcordanceInstance]:
+    """Yield one ConcordanceInstance per data row as the page is read."""
+    parser = etree.HTMLPullParser(events=("end",), tag=("tr", "table"))
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    # Rows of tables nested in the current top-level table, repeated when it closes
+    nested: list[ConcordanceInstance] = []
+    with filepath.open("rb") as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            parser.feed(decoder.decode(chunk, final=not chunk))
+            if not chunk:
+                parser.close()
+            for _, el in parser.read_events():
+                if next(el.iterancestors("tr"), None) is not None:
+                    continue  # handled with its outermost row
+                in_table = next(el.iterancestors("table"), None) is not None
+                if el.tag == "tr":
+                    if in_table:
+                        yield from _rows(el)
+                        for table in el.iter("table"):
+                            nested.extend(_rows(table))
+                elif in_table:
+                    continue  # a table directly inside a table; its rows are the outer table's
+                else:
+                    yield from nested
+                    nested.clear()
+                _discard(el)
+            if not chunk:
+                break
+
 
 def parse_concordance_page(filepath: Path) -> list[ConcordanceInstance]:
-    html = filepath.read_bytes()
-    soup = parse_html(html, fix_p_tags=False)
-    instances = []
-
-    for table in soup.find_all("table"):
-        for tr in table.find_all("tr"):
-            tds = tr.find_all("td")
-            if len(tds) < 4:
-                continue
-            if tds[0].get("colspan"):
-                continue
-
-            inst = ConcordanceInstance()
-
-            # Cell 0: headword
-            fw_link = tds[0].find("a", class_="fw")
-            if fw_link:
-                inst.word = fw_link.get_text(strip=True)
-                href = fw_link.get("href", "") or ""
-                if "#" in href:
-                    inst.word_anchor = href.rsplit("#", 1)[1]
-            else:
-                inst.word = tds[0].get_text(strip=True)
-
-            # Cell 1: Hawaiian sentence with word tokens
-            inst.hawaiian_text = tds[1].get_text()
-            inst.word_tokens = extract_word_tokens(tds[1])
-
-            # Cell 2: English translation + note
-            eng_span = tds[2].find("span", class_="EngEx")
-            inst.english_text = eng_span.get_text(strip=True) if eng_span else tds[2].get_text(strip=True)
-            xn_span = tds[2].find("span", class_="xn")
-            if xn_span:
-                inst.note = xn_span.get_text(strip=True).strip("[] ")
-
-            # Cell 3: parent entry link
-            cf_link = tds[3].find("a", class_="cf")
-            if cf_link:
-                href = cf_link.get("href", "") or ""
-                if "#" in href:
-                    parts = href.rsplit("#", 1)
-                    inst.parent_entry_page = parts[0]
-                    inst.parent_entry_anchor = parts[1]
-
-            if inst.word:
-                instances.append(inst)
-
-    return instances
+    return list(iter_concordance_page(filepath))
+
+
+def concordance_pages(raw_dir: Path = RAW_DIR) -> list[tuple[str, Path]]:
+    """(letter, path) for every concordance page, main pages before overflow."""
+    pages = [(f.stem.replace("haw-conc-", ""), f) for f in sorted(raw_dir.glob("haw-conc-*.htm"))]
+    pages += [(f.stem.replace("con-", "").split("-")[0][:1], f) for f in sorted(raw_dir.glob("con-*.htm"))]
+    return pages
+
+
+def iter_all_concordance(raw_dir: Path = RAW_DIR) -> Iterator[tuple[str, ConcordanceInstance]]:
+    """Stream (letter, instance) over all concordance pages."""
+    for letter, f in concordance_pages(raw_dir):
+        for inst in iter_concordance_page(f):
+            yield letter, inst
 
 
 def parse_all_concordance(raw_dir: Path = RAW_DIR) -> dict[str, list[ConcordanceInstance]]:
-    results = {}
-    for f in sorted(raw_dir.glob("haw-conc-*.htm")):
-        letter = f.stem.replace("haw-conc-", "")
-        instances = parse_concordance_page(f)
-        results[letter] = results.get(letter, []) + instances
-    for f in sorted(raw_dir.glob("con-*.htm")):
-        instances = parse_concordance_page(f)
-        letter = f.stem.replace("con-", "").split("-")[0][:1]
-        results[letter] = results.get(letter, []) + instances
+    results: dict[str, list[ConcordanceInstance]] = {}
+    for letter, inst in iter_all_concordance(raw_dir):
+        results.setdefault(letter, []).append(inst)
     return results
@@ -105,6 +105,19 @@ def parse_all_index_pages(raw_dir: Path = RAW_DIR) -> list[IndexPage]:
     return results
 
 
+def parse_combo_anchors(filepath: Path) -> list[str]:
+    """Two-letter jump anchors (aa, ab, ...) from a haw-{letter}.htm <p class="indexline">."""
+    soup = BeautifulSoup(filepath.read_bytes(), "lxml")
+    combos: list[str] = []
+    indexline = soup.find("p", class_="indexline")
+    if indexline:
+        for a_tag in indexline.find_all("a", href=re.compile(r"^#")):
+            text = a_tag.get_text(strip=True)
+            if len(text) >= 2 and text.isalpha() and text not in combos:
+                combos.append(text)
+    return combos
+
+
 # ─── Reverse Index Pages ───────────────────────────────────────────────────
 
 
@@ -0,0 +1,197 @@
+"""Memory-mappable postings lists (key → sorted doc ids with positions).
+
+File layout (little-endian):
+
+    header     magic "CHDPOST1", u32 key count, u64 offsets of the key blob,
+               the postings blob and the end of file
+    directory  one fixed-size record per key, sorted by UTF-8 key bytes:
+               u32 key offset, u32 key length, u64 postings offset, u32 doc count
+    keys       concatenated UTF-8 keys
+    postings   per key, per doc: varint doc-id delta, varint position count,
+               varint position deltas
+
+Readers binary-search the directory in the mmap and decode only the
+postings of the requested key.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+from collections.abc import Iterator
+from pathlib import Path
+
+MAGIC = b"CHDPOST1"
+HEADER = struct.Struct("<8sIQQQ")
+DIR_ENTRY = struct.Struct("<IIQI")
+
+Postings = list[tuple[int, list[int]]]
+
+
+def encode_varint(value: int, out: bytearray) -> None:
+    """Append an unsigned LEB128 varint."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(buf, pos: int) -> tuple[int, int]:
+    """Decode a varint at pos. Returns (value, next position)."""
+    result = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def encode_postings(postings: Postings) -> bytes:
+    out = bytearray()
+    prev_doc = 0
+    for doc, positions in postings:
+        encode_varint(doc - prev_doc, out)
+        prev_doc = doc
+        encode_varint(len(positions), out)
+        prev_pos = 0
+        for p in positions:
+            encode_varint(p - prev_pos, out)
+            prev_pos = p
+    return bytes(out)
+
+
+def decode_postings(buf, pos: int, doc_count: int) -> Postings:
+    postings = []
+    doc = 0
+    for _ in range(doc_count):
+        delta, pos = decode_varint(buf, pos)
+        doc += delta
+        n, pos = decode_varint(buf, pos)
+        positions = []
+        p = 0
+        for _ in range(n):
+            delta, pos = decode_varint(buf, pos)
+            p += delta
+            positions.append(p)
+        postings.append((doc, positions))
+    return postings
+
+
+class PostingsBuilder:
+    """Accumulate (key, doc, position) occurrences and write a postings file."""
+
+    def __init__(self):
+        self._postings: dict[str, dict[int, list[int]]] = {}
+
+    def add(self, key: str, doc: int, position: int) -> None:
+        self._postings.setdefault(key, {}).setdefault(doc, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def write(self, path: Path) -> None:
+        items = sorted(((k.encode("utf-8"), docs) for k, docs in self._postings.items()),
+                       key=lambda kv: kv[0])
+        keys = bytearray()
+        blob = bytearray()
+        directory = bytearray()
+        for key, docs in items:
+            encoded = encode_postings([(d, sorted(docs[d])) for d in sorted(docs)])
+            directory += DIR_ENTRY.pack(len(keys), len(key), len(blob), len(docs))
+            keys += key
+            blob += encoded
+        keys_start = HEADER.size + len(directory)
+        postings_start = keys_start + len(keys)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as f:
+            f.write(HEADER.pack(MAGIC, len(items), keys_start, postings_start, postings_start + len(blob)))
+            f.write(directory)
+            f.write(keys)
+            f.write(blob)
+
+
+class PostingsIndex:
+    """Read-only postings file opened with mmap."""
+
+    def __init__(self, path: Path):
+        self._file = path.open("rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, self._keys_start, self._postings_start, _ = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a postings file")
+
+    def close(self) -> None:
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> PostingsIndex:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _entry(self, i: int) -> tuple[bytes, int, int]:
+        key_off, key_len, post_off, doc_count = DIR_ENTRY.unpack_from(self._mm, HEADER.size + i * DIR_ENTRY.size)
+        start = self._keys_start + key_off
+        return self._mm[start:start + key_len], post_off, doc_count
+
+    def _lower_bound(self, target: bytes) -> int:
+        """Directory slot of the first key >= target."""
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._entry(mid)[0] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _find(self, key: str) -> int:
+        target = key.encode("utf-8")
+        i = self._lower_bound(target)
+        if i < self._count and self._entry(i)[0] == target:
+            return i
+        return -1
+
+    def __contains__(self, key: str) -> bool:
+        return self._find(key) >= 0
+
+    def doc_count(self, key: str) -> int:
+        i = self._find(key)
+        return self._entry(i)[2] if i >= 0 else 0
+
+    def get(self, key: str) -> Postings:
+        """[(doc id, [positions])] for key, or [] if absent."""
+        i = self._find(key)
+        if i < 0:
+            return []
+        _, post_off, doc_count = self._entry(i)
+        return decode_postings(self._mm, self._postings_start + post_off, doc_count)
+
+    def docs(self, key: str) -> list[int]:
+        return [doc for doc, _ in self.get(key)]
+
+    def keys(self) -> Iterator[str]:
+        for i in range(self._count):
+            yield self._entry(i)[0].decode("utf-8")
+
+    def key_range(self, lo: str, hi: str | None = None) -> Iterator[str]:
+        """Keys k with lo <= k < hi (UTF-8 byte order); hi=None means no upper bound."""
+        end = self._count if hi is None else self._lower_bound(hi.encode("utf-8"))
+        for i in range(self._lower_bound(lo.encode("utf-8")), end):
+            yield self._entry(i)[0].decode("utf-8")
+
+    def key_prefix(self, prefix: str) -> Iterator[str]:
+        """Keys starting with prefix."""
+        target = prefix.encode("utf-8")
+        for i in range(self._lower_bound(target), self._count):
+            key = self._entry(i)[0]
+            if not key.startswith(target):
+                break
+            yield key.decode("utf-8")
@@ -0,0 +1,140 @@
+"""Restore ʻokina and kahakō to ASCII Hawaiian text.
+
+to_ascii is many-to-one (kai, kaʻi and kāī all fold to "kai"), so the
+reverse direction needs candidates. Built during export:
+
+    index/restore.json   folded word → [[diacritized form, corpus count], ...]
+
+Candidate forms are the words of every headword, headword_ascii excluded.
+Counts are occurrences of the exact form (case-insensitive) in example and
+concordance Hawaiian text; candidates are ranked by count, then
+alphabetically. Multi-word headwords (ʻōlelo noʻeau) are also counted as
+phrases, wherever their forms appear consecutively. The file is loaded into a dict, so each lookup is O(1).
+"""
+
+from __future__ import annotations
+
+import json
+from collections import Counter
+from collections.abc import Iterable
+from functools import lru_cache
+from pathlib import Path
+
+from chd.kwic import WORD_RE, fold
+from chd.models import ConcordanceInstance, Entry
+from chd.unicode import ASCII_CACHE_SIZE, normalize_okina
+
+RESTORE_FILE = "restore.json"
+
+
+def _forms(text: str) -> Iterable[str]:
+    """Lowercased words of text with ʻokina unified (ʻokina is matched by \\w)."""
+    return (m.group().lower() for m in WORD_RE.finditer(normalize_okina(text)))
+
+
+class RestorationBuilder:
+    """Collects headword forms and corpus counts as the export streams past."""
+
+    def __init__(self):
+        self.candidates: dict[str, set[str]] = {}
+        self.counts: Counter[str] = Counter()
+        # First form → multi-word headwords starting with it
+        self.phrases: dict[str, set[tuple[str, ...]]] = {}
+        self.phrase_counts: Counter[tuple[str, ...]] = Counter()
+
+    def add_headwords(self, entries: list[Entry]) -> None:
+        """Register candidate forms and phrases; call before any text is added."""
+        for e in entries:
+            forms = tuple(_forms(e.headword))
+            for form in forms:
+                self.candidates.setdefault(fold(form), set()).add(form)
+            if len(forms) > 1:
+                self.phrases.setdefault(forms[0], set()).add(forms)
+
+    def add_text(self, text: str) -> None:
+        words = list(_forms(text))
+        self.counts.update(words)
+        for i, word in enumerate(words):
+            for phrase in self.phrases.get(word, ()):
+                if tuple(words[i:i + len(phrase)]) == phrase:
+                    self.phrase_counts[phrase] += 1
+
+    def add_examples(self, entries: list[Entry]) -> None:
+        for e in entries:
+            for ex in e.examples:
+                self.add_text(ex.hawaiian_text)
+
+    def add_concordance(self, letter: str, ordinal: int, inst: ConcordanceInstance) -> None:
+        """Export consumer: called once per concordance row in write order."""
+        self.add_text(inst.hawaiian_text)
+
+    def form_count(self, text: str) -> int:
+        """Corpus occurrences of text's exact form.
+
+        A registered multi-word headword counts its consecutive occurrences;
+        any other phrase is bounded by its rarest word.
+        """
+        forms = tuple(_forms(text))
+        if len(forms) <= 1:
+            return self.counts[forms[0]] if forms else 0
+        if forms in self.phrases.get(forms[0], ()):
+            return self.phrase_counts[forms]
+        return min(self.counts[form] for form in forms)
+
+    def table(self) -> dict[str, list[tuple[str, int]]]:
+        return {
+            key: sorted(((f, self.counts[f]) for f in forms), key=lambda c: (-c[1], c[0]))
+            for key, forms in sorted(self.candidates.items())
+        }
+
+    def write(self, index_dir: Path) -> None:
+        index_dir.mkdir(parents=True, exist_ok=True)
+        (index_dir / RESTORE_FILE).write_text(json.dumps(self.table(), ensure_ascii=False), encoding="utf-8")
+
+
+class Restorer:
+    """Candidate lookup and whole-text diacritic restoration."""
+
+    def __init__(self, table: dict[str, list[tuple[str, int]]]):
+        self.table = table
+        self._best = {key: cands[0][0] for key, cands in table.items() if cands}
+        # Running text repeats a small vocabulary; memoize per surface word
+        self._restore_word = lru_cache(maxsize=ASCII_CACHE_SIZE)(self._restore_word)
+
+    @classmethod
+    def load(cls, index_dir: Path) -> Restorer:
+        return cls(json.loads((index_dir / RESTORE_FILE).read_text(encoding="utf-8")))
+
+    @classmethod
+    def from_builder(cls, builder: RestorationBuilder) -> Restorer:
+        return cls(builder.table())
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def candidates(self, word: str, n: int = 5) -> list[tuple[str, int]]:
+        """Up to n (diacritized form, corpus count) pairs, most frequent first."""
+        return [tuple(c) for c in self.table.get(fold(word), [])[:n]]
+
+    def _restore_word(self, word: str) -> str:
+        best = self._best.get(fold(word))
+        if best is None:
+            return word
+        if word.isupper() and len(word) > 1:
+            return best.upper()
+        if word[0].isupper():
+            # Capitalize the first letter, skipping a leading ʻokina
+            lead = 1 if best[0] == "\u02BB" else 0
+            return best[:lead] + best[lead:lead + 1].upper() + best[lead + 1:]
+        return best
+
+    def restore(self, text: str) -> str:
+        """Replace each known word with its most frequent diacritized form.
+
+        Unknown words, punctuation and spacing are kept as-is; capitalization
+        of the first letter (or whole word) carries over.
+        """
+        return WORD_RE.sub(lambda m: self._restore_word(m.group()), normalize_okina(text))
+
+    def restore_many(self, texts: Iterable[str]) -> list[str]:
+        return [self.restore(t) for t in texts]
@@ -0,0 +1,155 @@
+"""English → Hawaiian reverse lookup with BM25 ranking.
+
+Each Hawaiian entry is a document with two fields:
+
+  - "def": the English definition text of its senses (Sense.text, plus any
+    SubDefinition.text not already part of it)
+  - "eng": English words whose EngHawEntry.translations point at the entry
+
+Both fields are scored with BM25 and summed with FIELD_WEIGHTS, so an
+entry PE lists under an English word outranks one that only mentions it in
+passing. Built during export:
+
+    index/reverse_postings.bin   "<field>\\t<term>" → [(doc, [positions])] (chd.postings)
+    index/reverse_docs.json      doc → entry id, headword, per-field lengths
+
+Terms are chd.kwic.tokenize words (lowercased, diacritics folded) minus
+ENGLISH_STOPWORDS.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import math
+from collections.abc import Iterable
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+from chd.kwic import tokenize
+from chd.models import EngHawEntry, Entry, Sense
+from chd.postings import PostingsBuilder, PostingsIndex
+from chd.validate import LinkResolver
+
+POSTINGS_FILE = "reverse_postings.bin"
+DOCS_FILE = "reverse_docs.json"
+
+FIELDS = ("def", "eng")
+FIELD_WEIGHTS = {"def": 1.0, "eng": 2.5}
+K1 = 1.2
+B = 0.75
+POSTINGS_CACHE_SIZE = 4096
+
+ENGLISH_STOPWORDS = frozenset("""
+a an and are as at be by for from in into is it of on or so the to with
+""".split())
+
+
+class ReverseHit(NamedTuple):
+    entry_id: str
+    headword: str
+    score: float
+
+
+def terms(text: str) -> list[str]:
+    return [w for w, _, _ in tokenize(text) if w not in ENGLISH_STOPWORDS]
+
+
+def _definition_text(sense: Sense) -> str:
+    parts = [sense.text]
+    parts += [sd.text for sd in sense.sub_definitions if sd.text and sd.text not in sense.text]
+    return " ".join(p for p in parts if p)
+
+
+class ReverseIndexBuilder:
+    """Tokenizes definitions and EH translations into per-field postings."""
+
+    def __init__(self):
+        self.postings = PostingsBuilder()
+        self.docs: list[tuple[str, str]] = []  # (entry id, headword)
+        self.lengths: dict[str, list[int]] = {f: [] for f in FIELDS}
+        self._doc_index: dict[str, int] = {}
+
+    def _add_terms(self, field: str, doc: int, words: list[str]) -> None:
+        start = self.lengths[field][doc]
+        for pos, word in enumerate(words, start):
+            self.postings.add(f"{field}\t{word}", doc, pos)
+        self.lengths[field][doc] += len(words)
+
+    def add_entries(self, entries: list[Entry]) -> None:
+        for e in entries:
+            if not e.id or e.id in self._doc_index:
+                continue
+            doc = self._doc_index[e.id] = len(self.docs)
+            self.docs.append((e.id, e.headword_display or e.headword))
+            for field in FIELDS:
+                self.lengths[field].append(0)
+            for sense in e.senses:
+                self._add_terms("def", doc, terms(_definition_text(sense)))
+
+    def add_translations(self, eng_entries: Iterable[EngHawEntry], resolver: LinkResolver) -> None:
+        """Credit each English word to every entry its translations resolve to."""
+        for eng in eng_entries:
+            words = terms(eng.english_word)
+            if not words:
+                continue
+            seen = set()
+            for t in eng.translations:
+                doc = self._doc_index.get(resolver.resolve(t.target_anchor or t.hawaiian_word) or "")
+                if doc is not None and doc not in seen:
+                    seen.add(doc)
+                    self._add_terms("eng", doc, words)
+
+    def write(self, index_dir: Path) -> None:
+        self.postings.write(index_dir / POSTINGS_FILE)
+        meta = {"docs": self.docs, "lengths": self.lengths}
+        (index_dir / DOCS_FILE).write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+
+
+class ReverseIndex:
+    """BM25 query API over an index written by ReverseIndexBuilder."""
+
+    def __init__(self, index_dir: Path):
+        self.postings = PostingsIndex(index_dir / POSTINGS_FILE)
+        meta = json.loads((index_dir / DOCS_FILE).read_text(encoding="utf-8"))
+        self.docs = [tuple(d) for d in meta["docs"]]
+        self.lengths = meta["lengths"]
+        self._field_docs = {f: sum(1 for n in self.lengths[f] if n) or 1 for f in FIELDS}
+        self._avgdl = {f: (sum(self.lengths[f]) / self._field_docs[f]) or 1.0 for f in FIELDS}
+        self._get = lru_cache(maxsize=POSTINGS_CACHE_SIZE)(self.postings.get)
+
+    def close(self) -> None:
+        self.postings.close()
+
+    def __enter__(self) -> ReverseIndex:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def scores(self, query: str) -> dict[int, float]:
+        """{doc: BM25 score} for every document matching any query term."""
+        scores: dict[int, float] = {}
+        for term in dict.fromkeys(terms(query)):
+            for field in FIELDS:
+                postings = self._get(f"{field}\t{term}")
+                if not postings:
+                    continue
+                n = self._field_docs[field]
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                weight = FIELD_WEIGHTS[field] * idf
+                lengths, avgdl = self.lengths[field], self._avgdl[field]
+                for doc, positions in postings:
+                    tf = len(positions)
+                    norm = K1 * (1 - B + B * lengths[doc] / avgdl)
+                    scores[doc] = scores.get(doc, 0.0) + weight * tf * (K1 + 1) / (tf + norm)
+        return scores
+
+    def search(self, query: str, n: int = 20) -> list[ReverseHit]:
+        """Top n entries for an English query, best first."""
+        ranked = heapq.nsmallest(n, self.scores(query).items(), key=lambda s: (-s[1], s[0]))
+        return [ReverseHit(*self.docs[doc], round(score, 4)) for doc, score in ranked]
@@ -0,0 +1,112 @@
+"""Suffix (rhyme) index over headwords.
+
+Headwords are normalized to their letters (ʻokina unified and kept,
+lowercased; spaces, hyphens and digits dropped), reversed, and sorted.
+Every headword ending in X then occupies one contiguous range of the
+array, found by binary search on reversed(X). Two arrays are kept: one
+exact (kahakō and ʻokina significant) and one ASCII-folded, so "ends in
+-kai" can match kāī and kaʻi too.
+
+Syllables follow Hawaiian (C)V structure: each vowel (short or long) closes
+a syllable, and ʻokina counts as a consonant. Saved as index/rhyme.json.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+from pathlib import Path
+
+from chd.models import Entry
+from chd.unicode import normalize_okina, to_ascii
+
+RHYME_FILE = "rhyme.json"
+VOWELS = frozenset("aeiouāēīōū")
+
+
+def letters(word: str, ascii: bool = False) -> str:
+    """Lowercased letters of word; ʻokina is a letter unless ascii folds it away."""
+    text = normalize_okina(word).lower()
+    if ascii:
+        text = to_ascii(text)
+    return "".join(ch for ch in text if ch.isalpha())
+
+
+def syllables(word: str) -> list[str]:
+    """(C)V syllables of word; trailing consonants (loanwords) join the last syllable."""
+    result: list[str] = []
+    current = ""
+    for ch in letters(word):
+        current += ch
+        if ch in VOWELS:
+            result.append(current)
+            current = ""
+    if current:
+        if result:
+            result[-1] += current
+        else:
+            result.append(current)
+    return result
+
+
+class RhymeIndex:
+    """Sorted reversed-headword arrays with ends-with and shared-syllable queries."""
+
+    def __init__(self, entries: list[tuple[str, str]], exact: list[tuple[str, int]], folded: list[tuple[str, int]]):
+        self.entries = entries  # (entry id, headword)
+        self._keys = {False: [k for k, _ in exact], True: [k for k, _ in folded]}
+        self._rows = {False: [i for _, i in exact], True: [i for _, i in folded]}
+
+    @classmethod
+    def build(cls, entries: list[Entry]) -> RhymeIndex:
+        rows = [(e.id, e.headword) for e in entries if e.id and letters(e.headword)]
+        exact = sorted((letters(hw)[::-1], i) for i, (_, hw) in enumerate(rows))
+        folded = sorted((letters(hw, ascii=True)[::-1], i) for i, (_, hw) in enumerate(rows))
+        return cls(rows, exact, folded)
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "entries": self.entries,
+            "exact": list(zip(self._keys[False], self._rows[False])),
+            "ascii": list(zip(self._keys[True], self._rows[True])),
+        }
+        path.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> RhymeIndex:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls([tuple(e) for e in data["entries"]], data["exact"], data["ascii"])
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _range(self, suffix: str, ascii: bool) -> range:
+        keys = self._keys[ascii]
+        rev = suffix[::-1]
+        start = bisect.bisect_left(keys, rev)
+        return range(start, bisect.bisect_right(keys, rev + "\U0010FFFF", start))
+
+    def ends_with(self, suffix: str, ascii: bool = False, limit: int | None = None) -> list[tuple[str, str]]:
+        """(entry id, headword) for every headword ending in suffix, grouped by ending."""
+        key = letters(suffix, ascii)
+        if not key:
+            return []
+        rows = self._rows[ascii]
+        return [self.entries[rows[i]] for i in self._range(key, ascii)][:limit]
+
+    def rhymes(self, word: str, n: int = 2, ascii: bool = False, limit: int | None = None) -> list[tuple[str, str]]:
+        """Headwords sharing word's last n syllables, excluding word itself."""
+        tail = letters("".join(syllables(word)[-n:]), ascii)
+        own = letters(word)
+        results = []
+        for entry in self.ends_with(tail, ascii):
+            if letters(entry[1]) == own:
+                continue
+            key = letters(entry[1], ascii)
+            # A vowel-initial tail must start a syllable: kina (ki-na) doesn't share ʻaina's -i-na
+            head = key[:-len(tail)] if tail else key
+            if tail[:1] in VOWELS and head and head[-1] not in VOWELS:
+                continue
+            results.append(entry)
+        return results[:limit]
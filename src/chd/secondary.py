@@ -0,0 +1,164 @@
+"""Secondary indexes: sorted key → ids tables over entry and example fields.
+
+Each index is declared as a SecondaryIndex, which names a target ("entry"
+or "example") and a key extractor. Every declared index is filled in one
+shared pass over the entries and their examples. Written during export to
+index/secondary/:
+
+    {name}.bin    normalized key → ordinals into the target's id list (chd.postings)
+    ids.json      {"indexes": {name: target}, "entry": [ids], "example": [ids]}
+
+Example ids are "{entry id}#{index in entry.examples}". Keys are normalized
+(ʻokina unified, lowercased, whitespace collapsed), and indexes over
+citations zero-pad their numbers so ON 200 < ON 1681 and Hal. 3:7 < Hal.
+3:10 in key order. Queries go through the same normalizer, so lookups,
+prefix scans and [lo, hi) ranges take the keys as a reader would write
+them. The built-in INDEXES cover etymology, loanwords, dialects and
+example citations; callers can pass their own declarations instead.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import NamedTuple
+
+from chd.models import Entry, Example
+from chd.postings import PostingsBuilder, PostingsIndex
+from chd.unicode import normalize_okina
+
+SECONDARY_DIR = "secondary"
+IDS_FILE = "ids.json"
+TARGETS = ("entry", "example")
+NUMBER_WIDTH = 6
+
+NUMBER_RE = re.compile(r"\d+")
+
+
+def normalize_key(text: str) -> str:
+    return " ".join(normalize_okina(text).lower().split())
+
+
+def normalize_citation(text: str) -> str:
+    """normalize_key with numbers zero-padded, so citations sort numerically."""
+    return NUMBER_RE.sub(lambda m: m.group().zfill(NUMBER_WIDTH), normalize_key(text))
+
+
+class SecondaryIndex(NamedTuple):
+    """An index declaration. extract takes an Entry (target "entry") or an Example ("example")."""
+    name: str
+    target: str
+    extract: Callable[..., Iterable[str]]
+    normalize: Callable[[str], str] = normalize_key
+
+
+def _proto_form(entry: Entry) -> Iterable[str]:
+    etym = entry.etymology
+    if etym and etym.proto_form:
+        yield f"{etym.proto_language} {etym.proto_form}" if etym.proto_language else etym.proto_form
+
+
+def _source_ref(example: Example) -> Iterable[str]:
+    ref = example.source_ref
+    # Bible citations keep their book in bible_ref; "BIBLE 3:7" alone is ambiguous
+    if ref and ref.id and ref.type != "BIBLE":
+        yield f"{ref.type} {ref.id}"
+
+
+INDEXES = (
+    SecondaryIndex("proto_form", "entry", _proto_form),
+    SecondaryIndex("loan_language", "entry", lambda e: [e.loan_language]),
+    SecondaryIndex("dialect", "entry", lambda e: [e.dialect]),
+    SecondaryIndex("source_ref", "example", _source_ref, normalize_citation),
+    SecondaryIndex("bible_ref", "example", lambda ex: [ex.bible_ref], normalize_citation),
+)
+
+
+class SecondaryIndexBuilder:
+    def __init__(self, indexes: Sequence[SecondaryIndex] = INDEXES):
+        for index in indexes:
+            if index.target not in TARGETS:
+                raise ValueError(f"{index.name}: unknown target {index.target!r}")
+        self.indexes = list(indexes)
+        self.ids: dict[str, list[str]] = {target: [] for target in TARGETS}
+        self.postings = {index.name: PostingsBuilder() for index in self.indexes}
+
+    def _add(self, target: str, doc_id: str, item) -> None:
+        ordinal = -1
+        for index in self.indexes:
+            if index.target != target:
+                continue
+            for key in index.extract(item):
+                key = index.normalize(key) if key else ""
+                if not key:
+                    continue
+                if ordinal < 0:
+                    ordinal = len(self.ids[target])
+                    self.ids[target].append(doc_id)
+                self.postings[index.name].add(key, ordinal, 0)
+
+    def add_entries(self, entries: Iterable[Entry]) -> None:
+        """One pass over entries and their examples, feeding every declared index."""
+        for e in entries:
+            if not e.id:
+                continue
+            self._add("entry", e.id, e)
+            for i, ex in enumerate(e.examples):
+                self._add("example", f"{e.id}#{i}", ex)
+
+    def write(self, out_dir: Path) -> None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for name, postings in self.postings.items():
+            postings.write(out_dir / f"{name}.bin")
+        data = {"indexes": {index.name: index.target for index in self.indexes}, **self.ids}
+        (out_dir / IDS_FILE).write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+
+class SecondaryIndexes:
+    """Reader over index/secondary/. Unknown index names raise KeyError."""
+
+    def __init__(self, out_dir: Path, indexes: Sequence[SecondaryIndex] = INDEXES):
+        data = json.loads((out_dir / IDS_FILE).read_text(encoding="utf-8"))
+        self.targets: dict[str, str] = data["indexes"]
+        self._ids = {target: data.get(target, []) for target in TARGETS}
+        self._normalize = {index.name: index.normalize for index in indexes}
+        self._tables = {name: PostingsIndex(out_dir / f"{name}.bin") for name in self.targets}
+
+    def close(self) -> None:
+        for table in self._tables.values():
+            table.close()
+
+    def __enter__(self) -> SecondaryIndexes:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _norm(self, name: str, key: str) -> str:
+        if name not in self._tables:
+            raise KeyError(name)
+        return self._normalize.get(name, normalize_key)(key)
+
+    def _lookup(self, name: str, key: str) -> list[str]:
+        ids = self._ids[self.targets[name]]
+        return [ids[doc] for doc in self._tables[name].docs(key)]
+
+    def get(self, name: str, key: str) -> list[str]:
+        """Ids whose name key equals key (after normalization)."""
+        return self._lookup(name, self._norm(name, key))
+
+    def keys(self, name: str) -> Iterator[str]:
+        return self._tables[name].keys()
+
+    def prefix(self, name: str, prefix: str) -> dict[str, list[str]]:
+        """{key: ids} for every key starting with prefix, in key order."""
+        prefix = self._norm(name, prefix)
+        return {key: self._lookup(name, key) for key in self._tables[name].key_prefix(prefix)}
+
+    def range(self, name: str, lo: str, hi: str | None = None) -> dict[str, list[str]]:
+        """{key: ids} for lo <= key < hi, in key order; hi=None means no upper bound."""
+        lo = self._norm(name, lo)
+        hi = None if hi is None else self._norm(name, hi)
+        return {key: self._lookup(name, key) for key in self._tables[name].key_range(lo, hi)}
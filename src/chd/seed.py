@@ -1,7 +1,10 @@
 """Seed Supabase database from exported JSON files via REST API.
 
 Usage:
-    python -m chd.seed [--dir data/processed]
+    python -m chd.seed [--dir data/processed] [--count exact|planned|estimated]
+    python -m chd.seed --verify-only [--count planned]
+    python -m chd.seed --resume   # continue an interrupted seed from its checkpoint
+    python -m chd.seed --documents-only   # sync entry_document with the export, nothing else
 
 Uses SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY env vars, or falls back to
 hardcoded project values.
@@ -10,10 +13,15 @@ hardcoded project values.
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
 import sys
+import threading
 import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import requests
@@ -23,6 +31,23 @@ PROCESSED_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "proces
 # Project defaults
 DEFAULT_URL = "https://oldmeegmnudyosbztast.supabase.co"
 BATCH = 500  # rows per REST API call
+WORKERS = 4  # concurrent requests for independent batches
+COUNT_MODES = ("exact", "planned", "estimated")
+COUNTS_FILE = "seed_counts.json"  # expected row counts written after a seed
+CHECKPOINT_FILE = ".seed_checkpoint.json"  # committed batches of an unfinished seed
+DOCUMENTS_CHECKPOINT_FILE = ".seed_documents_checkpoint.json"  # same, for --documents-only
+
+# Every seeded table, in the order verify_counts reports them
+TABLES = [
+    "entry", "entry_document", "sense", "sub_definition", "sub_definition_domain",
+    "linked_word", "example", "word_token", "etymology", "cross_ref",
+    "grammar_ref", "hawaiian_gloss", "image", "alt_spelling",
+    "topic", "entry_topic", "eng_haw_entry", "eng_haw_translation",
+    "concordance", "reference",
+    "dictionary_source", "preface", "wordlist", "wordlist_entry",
+    "wordlist_entry_link", "gloss_source_text", "image_detail",
+    "structural_page",
+]
 
 
 def get_config() -> tuple[str, str]:
@@ -39,8 +64,83 @@ def load_json(filepath: Path):
     return json.loads(filepath.read_text(encoding="utf-8"))
 
 
+class SeedError(RuntimeError):
+    """A REST call failed; committed progress is kept in the checkpoint."""
+
+
+def data_fingerprint(data_dir: Path) -> str:
+    """Hash of every input file's path, size and mtime."""
+    h = hashlib.sha256()
+    for f in sorted(data_dir.rglob("*.json")):
+        if f.name in (CHECKPOINT_FILE, DOCUMENTS_CHECKPOINT_FILE, COUNTS_FILE):
+            continue
+        st = f.stat()
+        h.update(f"{f.relative_to(data_dir)}:{st.st_size}:{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()[:16]
+
+
+@dataclass
+class Checkpoint:
+    """Committed seed batches, persisted so an interrupted run can resume.
+
+    A step names one table (and input file) and its batches are numbered in
+    the deterministic order the seeder builds rows. `pending` holds parent
+    IDs created by the in-flight batch; they are deleted before resuming so
+    a half-written batch (parent rows without children) is redone cleanly.
+    `expected` only sums the rows of committed batches, each added as its
+    batch commits, so a batch redone on resume is never counted twice.
+    """
+    path: Path | None = None
+    fingerprint: str = ""
+    done: dict[str, set[int]] = field(default_factory=dict)
+    pending: dict[str, list[int]] = field(default_factory=dict)
+    expected: dict[str, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @classmethod
+    def load(cls, path: Path) -> Checkpoint:
+        if not path.exists():
+            return cls(path=path)
+        data = load_json(path)
+        return cls(
+            path=path, fingerprint=data.get("fingerprint", ""),
+            done={k: set(v) for k, v in data.get("done", {}).items()},
+            pending=data.get("pending", {}), expected=data.get("expected", {}),
+        )
+
+    def is_done(self, step: str, batch_num: int) -> bool:
+        return batch_num in self.done.get(step, ())
+
+    def add_pending(self, table: str, ids: list[int]) -> None:
+        with self._lock:
+            self.pending.setdefault(table, []).extend(ids)
+            self.save()
+
+    def commit(self, step: str, batch_num: int, counts: dict[str, int]) -> None:
+        """Mark a batch done and add the rows it sent, per table, to expected."""
+        with self._lock:
+            self.done.setdefault(step, set()).add(batch_num)
+            self.pending.clear()
+            for table, n in counts.items():
+                self.expected[table] = self.expected.get(table, 0) + n
+            self.save()
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        data = {
+            "fingerprint": self.fingerprint,
+            "done": {k: sorted(v) for k, v in self.done.items()},
+            "pending": self.pending,
+            "expected": self.expected,
+        }
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        tmp.replace(self.path)
+
+
 class SupabaseSeeder:
-    def __init__(self, url: str, key: str):
+    def __init__(self, url: str, key: str, checkpoint: Checkpoint | None = None):
         self.base = url + "/rest/v1"
         self.headers = {
             "apikey": key,
@@ -52,40 +152,127 @@ class SupabaseSeeder:
             **self.headers,
             "Prefer": "return=representation",
         }
-
-    def _post(self, table: str, rows: list[dict], upsert: bool = False) -> int:
-        """Insert rows in batches. Returns total inserted."""
+        self.checkpoint = checkpoint or Checkpoint()
+        # Rows sent per table (including resumed runs); verify_counts checks against it
+        self.expected: dict[str, int] = dict(self.checkpoint.expected)
+        self._lock = threading.Lock()
+
+    def _send(self, table: str, batch: list[dict], headers: dict, batch_num: int,
+              params: dict | None = None) -> requests.Response:
+        """POST one batch, raising SeedError on a non-2xx response."""
+        resp = requests.post(f"{self.base}/{table}", headers=headers, params=params, json=batch)
+        if resp.status_code not in (200, 201):
+            raise SeedError(f"inserting into {table} (batch {batch_num}): "
+                            f"{resp.status_code} {resp.text[:300]}")
+        return resp
+
+    def _count(self, table: str, n: int) -> None:
+        with self._lock:
+            self.expected[table] = self.expected.get(table, 0) + n
+
+    def _counted(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self.expected)
+
+    def _counted_since(self, before: dict[str, int]) -> dict[str, int]:
+        """Rows counted per table since the _counted() snapshot before."""
+        with self._lock:
+            return {t: n - before.get(t, 0) for t, n in self.expected.items() if n != before.get(t, 0)}
+
+    def _batches(self, step: str, rows: list) -> Iterator[tuple[int, list]]:
+        """Yield (batch_num, batch) for batches the checkpoint hasn't committed.
+
+        A batch is committed once the loop body that consumed it finishes, so
+        a failure leaves it to be redone on resume.
+        """
+        for n, i in enumerate(range(0, len(rows), BATCH)):
+            if self.checkpoint.is_done(step, n):
+                continue
+            before = self._counted()
+            yield n, rows[i:i + BATCH]
+            self.checkpoint.commit(step, n, self._counted_since(before))
+
+    def _post(self, table: str, rows: list[dict], upsert: bool = False, workers: int = 1,
+              step: str = "") -> int:
+        """Insert rows in batches. Returns total inserted.
+
+        With workers > 1 the batches are sent concurrently; only use this for
+        rows whose order and server-generated IDs don't matter. With a step
+        name each batch is committed to the checkpoint and skipped on resume.
+        """
         if not rows:
             return 0
         headers = {**self.headers}
         if upsert:
             headers["Prefer"] = "return=minimal,resolution=merge-duplicates"
-        total = 0
-        for i in range(0, len(rows), BATCH):
-            batch = rows[i:i + BATCH]
-            resp = requests.post(f"{self.base}/{table}", headers=headers, json=batch)
-            if resp.status_code not in (200, 201):
-                print(f"  ERROR inserting into {table} (batch {i//BATCH}): {resp.status_code}")
-                print(f"  {resp.text[:300]}")
-                sys.exit(1)
-            total += len(batch)
-        return total
-
-    def _post_returning(self, table: str, rows: list[dict]) -> list[dict]:
-        """Insert rows and return the created records (with server-generated IDs)."""
+        batches = [(n, rows[i:i + BATCH]) for n, i in enumerate(range(0, len(rows), BATCH))
+                   if not (step and self.checkpoint.is_done(step, n))]
+
+        def send(item: tuple[int, list[dict]]) -> int:
+            n, batch = item
+            self._send(table, batch, headers, n)
+            self._count(table, len(batch))
+            if step:
+                # Only this batch's rows: others may be sent but not yet committed
+                self.checkpoint.commit(step, n, {table: len(batch)})
+            return len(batch)
+
+        if workers > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return sum(pool.map(send, batches))
+        return sum(map(send, batches))
+
+    def _post_returning(self, table: str, rows: list[dict], on_conflict: str = "") -> list[dict]:
+        """Insert rows and return the created records (with server-generated IDs).
+
+        If on_conflict names a unique column, rows are upserted on it so that
+        existing records are returned alongside newly created ones.
+        """
         if not rows:
             return []
+        headers = self.headers_returning
+        params = None
+        if on_conflict:
+            headers = {**headers, "Prefer": "return=representation,resolution=merge-duplicates"}
+            params = {"on_conflict": on_conflict}
         results = []
         for i in range(0, len(rows), BATCH):
             batch = rows[i:i + BATCH]
-            resp = requests.post(f"{self.base}/{table}", headers=self.headers_returning, json=batch)
-            if resp.status_code not in (200, 201):
-                print(f"  ERROR inserting into {table} (batch {i//BATCH}): {resp.status_code}")
-                print(f"  {resp.text[:300]}")
-                sys.exit(1)
+            resp = self._send(table, batch, headers, i // BATCH, params)
             results.extend(resp.json())
+        self._count(table, len(results))
         return results
 
+    def _created_ids(self, table: str, rows: list[dict]) -> list[dict]:
+        """_post_returning, with the new IDs held as pending until the batch commits."""
+        created = self._post_returning(table, rows)
+        self.checkpoint.add_pending(table, [r["id"] for r in created])
+        return created
+
+    def rollback_pending(self):
+        """Delete parent rows left by a batch that failed before committing."""
+        for table, ids in self.checkpoint.pending.items():
+            for i in range(0, len(ids), BATCH):
+                chunk = ",".join(str(x) for x in ids[i:i + BATCH])
+                resp = requests.delete(f"{self.base}/{table}", headers=self.headers,
+                                       params={"id": f"in.({chunk})"})
+                if resp.status_code not in (200, 204):
+                    raise SeedError(f"rolling back {table}: {resp.status_code} {resp.text[:300]}")
+            print(f"  rolled back {len(ids)} uncommitted {table} rows")
+        self.checkpoint.pending.clear()
+        self.checkpoint.save()
+
+    def rpc(self, function: str, args: dict | None = None) -> requests.Response:
+        """Call a database function through PostgREST, raising SeedError on failure."""
+        resp = requests.post(f"{self.base}/rpc/{function}", headers=self.headers, json=args or {})
+        if resp.status_code == 404:
+            # PostgREST answers 404 (PGRST202) for a function that doesn't exist
+            raise SeedError(f"database function {function} not found; apply the migrations in "
+                            f"supabase/migrations (supabase db push) before seeding")
+        if resp.status_code not in (200, 204):
+            raise SeedError(f"calling {function}: {resp.status_code} {resp.text[:300]}")
+        return resp
+
     def _delete_all(self, table: str):
         """Delete all rows from a table."""
         # Use a filter that matches everything
@@ -112,7 +299,8 @@ class SupabaseSeeder:
             "word_token", "linked_word", "sub_definition_domain", "sub_definition",
             "sense", "example", "etymology", "cross_ref", "grammar_ref",
             "hawaiian_gloss", "image", "alt_spelling", "entry_topic", "topic",
-            "eng_haw_translation", "eng_haw_entry", "concordance", "reference", "entry",
+            "eng_haw_translation", "eng_haw_entry", "concordance", "reference",
+            "entry_document", "entry",
         ]
         for t in tables:
             # Delete all with a broad filter
@@ -150,6 +338,7 @@ class SupabaseSeeder:
                     "headword": e.get("headword", ""),
                     "headword_display": e.get("headword_display", ""),
                     "headword_ascii": e.get("headword_ascii", ""),
+                    "sort_key": e.get("sort_key", ""),
                     "subscript": e.get("subscript", ""),
                     "letter_page": e.get("letter_page", ""),
                     "display_type": e.get("trussel_display_type", "main"),
@@ -169,9 +358,51 @@ class SupabaseSeeder:
                     "loan_language": e.get("loan_language", ""),
                     "source_tag": e.get("source_tag", ""),
                 })
-            count += self._post("entry", rows, upsert=True)
+            count += self._post("entry", rows, upsert=True, step=f"entry:{jf.stem}")
         return count
 
+    def seed_entry_documents(self, data_dir: Path, delta: bool = False) -> int:
+        """One JSONB document per entry: the exported Entry.model_dump, as-is.
+
+        With delta, only documents whose content hash differs from the
+        database are upserted, and documents of entries no longer exported
+        are deleted; a full seed truncates first and upserts everything.
+        Returns the number of documents in the export.
+        """
+        rows = entry_document_rows(data_dir)
+        if not delta:
+            self._post("entry_document", rows, upsert=True, workers=WORKERS, step="entry_document")
+            return len(rows)
+        current = self.document_hashes()
+        stale = sorted(current.keys() - {r["id"] for r in rows})
+        for i in range(0, len(stale), BATCH):
+            chunk = ",".join(json.dumps(eid, ensure_ascii=False) for eid in stale[i:i + BATCH])
+            resp = requests.delete(f"{self.base}/entry_document", headers=self.headers,
+                                   params={"id": f"in.({chunk})"})
+            if resp.status_code not in (200, 204):
+                raise SeedError(f"deleting stale entry_document rows: {resp.status_code} {resp.text[:300]}")
+        # Batches are numbered over every exported row (fixed by the data
+        # fingerprint), not just the changed ones, so resumed runs skip the same batches
+        changed = 0
+        for _, batch in self._batches("entry_document:delta", rows):
+            upserts = [r for r in batch if current.get(r["id"]) != r["content_hash"]]
+            changed += self._post("entry_document", upserts, upsert=True)
+        print(f"    {changed:,} changed, {len(stale):,} removed")
+        return len(rows)
+
+    def document_hashes(self) -> dict[str, str]:
+        """{entry id: content_hash} for every entry_document row in the database."""
+        hashes = {}
+        while True:
+            resp = requests.get(f"{self.base}/entry_document", headers=self.headers, params={
+                "select": "id,content_hash", "order": "id", "limit": BATCH, "offset": len(hashes)})
+            if resp.status_code != 200:
+                raise SeedError(f"reading entry_document hashes: {resp.status_code} {resp.text[:300]}")
+            page = resp.json()
+            hashes.update((r["id"], r["content_hash"]) for r in page)
+            if len(page) < BATCH:
+                return hashes
+
     def seed_senses(self, data_dir: Path) -> int:
         haw_dir = data_dir / "haw_eng"
         sense_count = 0
@@ -201,10 +432,9 @@ class SupabaseSeeder:
                     })
 
             # Insert senses in batches and get IDs back
-            for i in range(0, len(sense_rows), BATCH):
-                batch = sense_rows[i:i + BATCH]
+            for _, batch in self._batches(f"sense:{letter}", sense_rows):
                 clean_batch = [{k: v for k, v in r.items() if not k.startswith("_")} for r in batch]
-                created = self._post_returning("sense", clean_batch)
+                created = self._created_ids("sense", clean_batch)
                 sense_count += len(created)
 
                 # Now insert linked_words and sub_definitions for each sense
@@ -290,10 +520,9 @@ class SupabaseSeeder:
                         "source_ref_url": src_ref.get("url", ""),
                     })
 
-            for i in range(0, len(ex_rows), BATCH):
-                batch = ex_rows[i:i + BATCH]
+            for _, batch in self._batches(f"example:{letter}", ex_rows):
                 clean = [{k: v for k, v in r.items() if not k.startswith("_")} for r in batch]
-                created = self._post_returning("example", clean)
+                created = self._created_ids("example", clean)
                 count += len(created)
 
                 wt_rows = []
@@ -304,7 +533,7 @@ class SupabaseSeeder:
                             "example_id": ex_id,
                             "surface": wt.get("surface", ""),
                             "anchor": wt.get("anchor", ""),
-                            "target_entry": wt.get("target_entry", ""),
+                            "target_entry": wt.get("target_entry") or None,
                         })
                 self._post("word_token", wt_rows)
 
@@ -323,7 +552,7 @@ class SupabaseSeeder:
                 if not eid:
                     continue
                 rows.extend(extract_fn(eid, e))
-        return self._post(table, rows)
+        return self._post(table, rows, step=table)
 
     def seed_etymologies(self, data_dir: Path) -> int:
         def extract(eid, e):
@@ -377,36 +606,22 @@ class SupabaseSeeder:
 
     def seed_topics(self, data_dir: Path) -> int:
         haw_dir = data_dir / "haw_eng"
-        topic_entries: dict[str, list[str]] = {}
+        pairs: set[tuple[str, str]] = set()
         for jf in sorted(haw_dir.glob("*.json")):
-            entries = load_json(jf)
-            for e in entries:
+            for e in load_json(jf):
                 eid = e.get("id", "")
-                if not eid:
-                    continue
-                for t in e.get("topics", []):
-                    topic_entries.setdefault(t, []).append(eid)
-
-        # Insert topics one by one to get IDs
-        topic_ids = {}
-        for name in sorted(topic_entries):
-            created = self._post_returning("topic", [{"name": name}])
-            if created:
-                topic_ids[name] = created[0]["id"]
-
-        # Insert entry_topic (dedup within each batch)
-        seen = set()
-        rows = []
-        for name, eids in topic_entries.items():
-            tid = topic_ids.get(name)
-            if not tid:
-                continue
-            for eid in eids:
-                key = (eid, tid)
-                if key not in seen:
-                    seen.add(key)
-                    rows.append({"entry_id": eid, "topic_id": tid})
-        self._post("entry_topic", rows)
+                if eid:
+                    pairs.update((eid, t) for t in e.get("topics", []))
+
+        # Upsert every topic on its natural key in one call to learn all IDs
+        names = sorted({name for _, name in pairs})
+        created = self._post_returning("topic", [{"name": n} for n in names], on_conflict="name")
+        topic_ids = {r["name"]: r["id"] for r in created}
+        self.expected["topic"] = len(topic_ids)  # upsert re-returns rows on resume
+
+        rows = [{"entry_id": eid, "topic_id": topic_ids[name]}
+                for eid, name in sorted(pairs) if name in topic_ids]
+        self._post("entry_topic", rows, upsert=True, workers=WORKERS, step="entry_topic")
         return len(topic_ids)
 
     def seed_eng_haw(self, data_dir: Path) -> tuple[int, int]:
@@ -426,10 +641,9 @@ class SupabaseSeeder:
                     "letter_page": e.get("letter_page", ""),
                 })
 
-            for i in range(0, len(ehe_rows), BATCH):
-                batch = ehe_rows[i:i + BATCH]
+            for _, batch in self._batches(f"eng_haw_entry:{letter}", ehe_rows):
                 clean = [{k: v for k, v in r.items() if not k.startswith("_")} for r in batch]
-                created = self._post_returning("eng_haw_entry", clean)
+                created = self._created_ids("eng_haw_entry", clean)
                 entry_count += len(created)
 
                 trans_rows = []
@@ -467,10 +681,9 @@ class SupabaseSeeder:
                     "parent_entry_page": inst.get("parent_entry_page", ""),
                 })
 
-            for i in range(0, len(conc_rows), BATCH):
-                batch = conc_rows[i:i + BATCH]
+            for _, batch in self._batches(f"concordance:{letter}", conc_rows):
                 clean = [{k: v for k, v in r.items() if not k.startswith("_")} for r in batch]
-                created = self._post_returning("concordance", clean)
+                created = self._created_ids("concordance", clean)
                 count += len(created)
 
                 wt_rows = []
@@ -481,7 +694,7 @@ class SupabaseSeeder:
                             "concordance_id": conc_id,
                             "surface": wt.get("surface", ""),
                             "anchor": wt.get("anchor", ""),
-                            "target_entry": wt.get("target_entry", ""),
+                            "target_entry": wt.get("target_entry") or None,
                         })
                 self._post("word_token", wt_rows)
 
@@ -495,7 +708,7 @@ class SupabaseSeeder:
         refs = load_json(refs_path)
         rows = [{"abbreviation": r.get("abbreviation", ""), "anchor": r.get("anchor", ""),
                  "full_text": r.get("full_text", ""), "url": r.get("url", "")} for r in refs]
-        return self._post("reference", rows)
+        return self._post("reference", rows, step="reference")
 
     # ------------------------------------------------------------------
     # Phase 2-5 seeders
@@ -520,7 +733,7 @@ class SupabaseSeeder:
                     "cover_images": ed.get("cover_images", []),
                     "intro_pdf_url": ed.get("intro_pdf_url"),
                 })
-        return self._post("dictionary_source", rows)
+        return self._post("dictionary_source", rows, step="dictionary_source")
 
     def seed_prefaces(self, data_dir: Path) -> int:
         """Seed preface from preface_pages.json."""
@@ -540,7 +753,7 @@ class SupabaseSeeder:
                 "images": p.get("images", []),
                 "referenced_assets": p.get("referenced_assets", []),
             })
-        return self._post("preface", rows)
+        return self._post("preface", rows, step="preface")
 
     def seed_wordlists(self, data_dir: Path) -> tuple[int, int, int]:
         """Seed wordlist, wordlist_entry, wordlist_entry_link from wordlist_pages.json."""
@@ -552,7 +765,10 @@ class SupabaseSeeder:
         we_count = 0
         link_count = 0
 
-        for page in pages:
+        for n, page in enumerate(pages):
+            if self.checkpoint.is_done("wordlist", n):
+                continue
+            before = self._counted()
             entries = page.get("entries", [])
             wl_row = {
                 "filename": page.get("filename", ""),
@@ -562,7 +778,7 @@ class SupabaseSeeder:
                 "intro_text": page.get("intro_text"),
                 "entry_count": len(entries),
             }
-            created_wl = self._post_returning("wordlist", [wl_row])
+            created_wl = self._created_ids("wordlist", [wl_row])
             if not created_wl:
                 continue
             wl_id = created_wl[0]["id"]
@@ -601,6 +817,7 @@ class SupabaseSeeder:
                         })
                 link_count += self._post("wordlist_entry_link", lk_rows)
 
+            self.checkpoint.commit("wordlist", n, self._counted_since(before))
             print(f"    {page.get('filename', '?')}: {len(entries)} entries")
 
         return wl_count, we_count, link_count
@@ -624,7 +841,7 @@ class SupabaseSeeder:
                 "cover_image_url": t.get("cover_image_url"),
                 "ulukau_url": t.get("ulukau_url"),
             })
-        return self._post("gloss_source_text", rows)
+        return self._post("gloss_source_text", rows, step="gloss_source_text")
 
     def seed_image_details(self, data_dir: Path) -> int:
         """Seed image_detail from image_detail_pages.json."""
@@ -643,7 +860,7 @@ class SupabaseSeeder:
                 "source_link_url": p.get("source_link_url"),
                 "source_link_text": p.get("source_link_text"),
             })
-        return self._post("image_detail", rows)
+        return self._post("image_detail", rows, step="image_detail")
 
     def seed_structural_pages(self, data_dir: Path) -> int:
         """Seed structural_page from structural_pages.json."""
@@ -662,123 +879,232 @@ class SupabaseSeeder:
                 "external_links": p.get("external_links", []),
                 "referenced_assets": p.get("referenced_assets", []),
             })
-        return self._post("structural_page", rows)
+        return self._post("structural_page", rows, step="structural_page")
 
-    def verify_counts(self):
-        """Check row counts via REST API."""
-        tables = [
-            "entry", "sense", "sub_definition", "sub_definition_domain",
-            "linked_word", "example", "word_token", "etymology", "cross_ref",
-            "grammar_ref", "hawaiian_gloss", "image", "alt_spelling",
-            "topic", "entry_topic", "eng_haw_entry", "eng_haw_translation",
-            "concordance", "reference",
-            "dictionary_source", "preface", "wordlist", "wordlist_entry",
-            "wordlist_entry_link", "gloss_source_text", "image_detail",
-            "structural_page",
-        ]
+    def count_rows(self, table: str, mode: str = "exact") -> int:
+        """Row count for one table; 'planned'/'estimated' avoid a full scan."""
+        resp = requests.head(
+            f"{self.base}/{table}?select=count",
+            headers={**self.headers, "Prefer": f"count={mode}"},
+        )
+        total = resp.headers.get("content-range", "*/0").split("/")[1]
+        return int(total) if total.isdigit() else -1
+
+    def verify_counts(self, mode: str = "exact", expected: dict[str, int] | None = None,
+                      tolerance: float | None = None) -> dict[str, dict]:
+        """Check row counts via REST API, querying all tables concurrently.
+
+        Compares against expected counts (default: rows sent during this run)
+        and returns {table: {"count", "expected", "ok"}}. Non-exact modes are
+        approximate, so they pass within a relative tolerance (default 10%).
+        """
+        if mode not in COUNT_MODES:
+            raise ValueError(f"count mode must be one of {COUNT_MODES}, got {mode!r}")
+        if expected is None:
+            expected = self.expected
+        if tolerance is None:
+            tolerance = 0.0 if mode == "exact" else 0.1
+
+        with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+            counts = dict(zip(TABLES, pool.map(lambda t: self.count_rows(t, mode), TABLES)))
+
+        report = {}
         total = 0
-        for t in tables:
-            resp = requests.head(
-                f"{self.base}/{t}?select=count",
-                headers={**self.headers, "Prefer": "count=exact"},
-            )
-            count = int(resp.headers.get("content-range", "*/0").split("/")[1])
-            total += count
-            print(f"  {t:30s} {count:>10,}")
+        for t in TABLES:
+            count = counts[t]
+            total += max(count, 0)
+            want = expected.get(t)
+            ok = want is None or abs(count - want) <= tolerance * want
+            report[t] = {"count": count, "expected": want, "ok": ok}
+            line = f"  {t:30s} {count:>10,}"
+            if want is not None:
+                line += f"  expected {want:>10,}" + ("" if ok else "  MISMATCH")
+            print(line)
         print(f"  {'TOTAL':30s} {total:>10,}")
 
+        mismatches = [t for t, r in report.items() if not r["ok"]]
+        if mismatches:
+            print(f"  {len(mismatches)} table(s) differ from expected: {', '.join(mismatches)}")
+        return report
 
-def seed_all(data_dir: Path = PROCESSED_DIR):
-    url, key = get_config()
-    seeder = SupabaseSeeder(url, key)
-
-    print("=" * 60)
-    print("CHD Database Seed (via REST API)")
-    print("=" * 60)
-
-    print("\nClearing existing data...")
-    seeder.truncate_all()
-
-    print("\nSeeding entries...")
-    n = seeder.seed_entries(data_dir)
-    print(f"  entries: {n:,}")
-
-    print("\nSeeding senses + sub-definitions + linked words...")
-    n = seeder.seed_senses(data_dir)
-    print(f"  senses: {n:,}")
-
-    print("\nSeeding examples + word tokens...")
-    n = seeder.seed_examples(data_dir)
-    print(f"  examples: {n:,}")
-
-    print("\nSeeding etymologies...")
-    n = seeder.seed_etymologies(data_dir)
-    print(f"  etymologies: {n:,}")
 
-    print("\nSeeding cross-references...")
-    n = seeder.seed_cross_refs(data_dir)
-    print(f"  cross_refs: {n:,}")
+def entry_document_rows(data_dir: Path) -> list[dict]:
+    """entry_document rows from haw_eng/*.json, first occurrence of each ID."""
+    rows = {}
+    for jf in sorted((data_dir / "haw_eng").glob("*.json")):
+        for e in load_json(jf):
+            eid = e.get("id", "")
+            if eid and eid not in rows:
+                canonical = json.dumps(e, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+                rows[eid] = {"id": eid, "document": e,
+                             "content_hash": hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]}
+    return list(rows.values())
 
-    print("\nSeeding grammar references...")
-    n = seeder.seed_grammar_refs(data_dir)
-    print(f"  grammar_refs: {n:,}")
 
-    print("\nSeeding hawaiian glosses...")
-    n = seeder.seed_hawaiian_glosses(data_dir)
-    print(f"  hawaiian_glosses: {n:,}")
+def load_expected_counts(data_dir: Path) -> dict[str, int]:
+    path = data_dir / COUNTS_FILE
+    return load_json(path) if path.exists() else {}
 
-    print("\nSeeding images...")
-    n = seeder.seed_images(data_dir)
-    print(f"  images: {n:,}")
 
-    print("\nSeeding alt spellings...")
-    n = seeder.seed_alt_spellings(data_dir)
-    print(f"  alt_spellings: {n:,}")
-
-    print("\nSeeding topics...")
-    n = seeder.seed_topics(data_dir)
-    print(f"  topics: {n:,}")
-
-    print("\nSeeding English-Hawaiian...")
-    ne, nt = seeder.seed_eng_haw(data_dir)
-    print(f"  eng_haw_entries: {ne:,}, translations: {nt:,}")
-
-    print("\nSeeding concordance...")
-    n = seeder.seed_concordance(data_dir)
-    print(f"  concordance: {n:,}")
-
-    print("\nSeeding references...")
-    n = seeder.seed_references(data_dir)
-    print(f"  references: {n:,}")
-
-    # Phase 2-5 tables
-    print("\nSeeding dictionary sources...")
-    n = seeder.seed_dictionary_sources(data_dir)
-    print(f"  dictionary_sources: {n:,}")
+def verify_only(data_dir: Path = PROCESSED_DIR, mode: str = "exact") -> dict[str, dict]:
+    """Verify the database against the counts recorded by the last seed."""
+    url, key = get_config()
+    seeder = SupabaseSeeder(url, key)
+    return seeder.verify_counts(mode, expected=load_expected_counts(data_dir))
 
-    print("\nSeeding prefaces...")
-    n = seeder.seed_prefaces(data_dir)
-    print(f"  prefaces: {n:,}")
 
-    print("\nSeeding wordlists...")
-    nw, ne, nl = seeder.seed_wordlists(data_dir)
-    print(f"  wordlists: {nw:,}, entries: {ne:,}, links: {nl:,}")
+def sync_documents(data_dir: Path = PROCESSED_DIR) -> int:
+    """Delta seed of entry_document alone, after a re-export.
 
-    print("\nSeeding gloss source texts...")
-    n = seeder.seed_gloss_source_texts(data_dir)
-    print(f"  gloss_source_texts: {n:,}")
+    Progress is checkpointed in DOCUMENTS_CHECKPOINT_FILE; rerunning after
+    an interruption continues from it unless the export changed meanwhile.
+    """
+    url, key = get_config()
+    checkpoint_path = data_dir / DOCUMENTS_CHECKPOINT_FILE
+    fingerprint = data_fingerprint(data_dir)
+    checkpoint = Checkpoint.load(checkpoint_path)
+    if checkpoint.fingerprint != fingerprint:
+        checkpoint = Checkpoint(path=checkpoint_path, fingerprint=fingerprint)
+    seeder = SupabaseSeeder(url, key, checkpoint)
+    print("Syncing entry documents...")
+    n = seeder.seed_entry_documents(data_dir, delta=True)
+    counts = load_expected_counts(data_dir)
+    if counts:
+        counts["entry_document"] = n
+        (data_dir / COUNTS_FILE).write_text(json.dumps(counts, indent=2), encoding="utf-8")
+    checkpoint_path.unlink(missing_ok=True)
+    print(f"  entry_documents: {n:,}")
+    return n
+
+
+def _create_trgm_indexes(seeder: SupabaseSeeder) -> None:
+    print("\nBuilding trigram search indexes...")
+    seeder.rpc("chd_create_trgm_indexes")
+
+
+def seed_all(data_dir: Path = PROCESSED_DIR, count_mode: str = "exact", resume: bool = False):
+    url, key = get_config()
+    checkpoint_path = data_dir / CHECKPOINT_FILE
+    fingerprint = data_fingerprint(data_dir)
+    if resume:
+        checkpoint = Checkpoint.load(checkpoint_path)
+        if checkpoint.done and checkpoint.fingerprint != fingerprint:
+            raise SeedError(f"{data_dir} changed since the checkpointed run; reseed without --resume")
+    else:
+        checkpoint = Checkpoint(path=checkpoint_path)
+    checkpoint.fingerprint = fingerprint
+    seeder = SupabaseSeeder(url, key, checkpoint)
 
-    print("\nSeeding image details...")
-    n = seeder.seed_image_details(data_dir)
-    print(f"  image_details: {n:,}")
+    print("=" * 60)
+    print("CHD Database Seed (via REST API)")
+    print("=" * 60)
 
-    print("\nSeeding structural pages...")
-    n = seeder.seed_structural_pages(data_dir)
-    print(f"  structural_pages: {n:,}")
+    if resume and checkpoint.done:
+        print(f"\nResuming: {sum(len(b) for b in checkpoint.done.values()):,} batches already committed")
+        seeder.rollback_pending()
+    else:
+        print("\nClearing existing data...")
+        seeder.truncate_all()
+        checkpoint.save()
+    # Trigram GIN indexes are rebuilt once at the end rather than updated per batch
+    seeder.rpc("chd_drop_trgm_indexes")
+
+    try:
+        print("\nSeeding entries...")
+        n = seeder.seed_entries(data_dir)
+        print(f"  entries: {n:,}")
+
+        print("\nSeeding entry documents...")
+        n = seeder.seed_entry_documents(data_dir)
+        print(f"  entry_documents: {n:,}")
+
+        print("\nSeeding senses + sub-definitions + linked words...")
+        n = seeder.seed_senses(data_dir)
+        print(f"  senses: {n:,}")
+
+        print("\nSeeding examples + word tokens...")
+        n = seeder.seed_examples(data_dir)
+        print(f"  examples: {n:,}")
+
+        print("\nSeeding etymologies...")
+        n = seeder.seed_etymologies(data_dir)
+        print(f"  etymologies: {n:,}")
+
+        print("\nSeeding cross-references...")
+        n = seeder.seed_cross_refs(data_dir)
+        print(f"  cross_refs: {n:,}")
+
+        print("\nSeeding grammar references...")
+        n = seeder.seed_grammar_refs(data_dir)
+        print(f"  grammar_refs: {n:,}")
+
+        print("\nSeeding hawaiian glosses...")
+        n = seeder.seed_hawaiian_glosses(data_dir)
+        print(f"  hawaiian_glosses: {n:,}")
+
+        print("\nSeeding images...")
+        n = seeder.seed_images(data_dir)
+        print(f"  images: {n:,}")
+
+        print("\nSeeding alt spellings...")
+        n = seeder.seed_alt_spellings(data_dir)
+        print(f"  alt_spellings: {n:,}")
+
+        print("\nSeeding topics...")
+        n = seeder.seed_topics(data_dir)
+        print(f"  topics: {n:,}")
+
+        print("\nSeeding English-Hawaiian...")
+        ne, nt = seeder.seed_eng_haw(data_dir)
+        print(f"  eng_haw_entries: {ne:,}, translations: {nt:,}")
+
+        print("\nSeeding concordance...")
+        n = seeder.seed_concordance(data_dir)
+        print(f"  concordance: {n:,}")
+
+        print("\nSeeding references...")
+        n = seeder.seed_references(data_dir)
+        print(f"  references: {n:,}")
+
+        # Phase 2-5 tables
+        print("\nSeeding dictionary sources...")
+        n = seeder.seed_dictionary_sources(data_dir)
+        print(f"  dictionary_sources: {n:,}")
+
+        print("\nSeeding prefaces...")
+        n = seeder.seed_prefaces(data_dir)
+        print(f"  prefaces: {n:,}")
+
+        print("\nSeeding wordlists...")
+        nw, ne, nl = seeder.seed_wordlists(data_dir)
+        print(f"  wordlists: {nw:,}, entries: {ne:,}, links: {nl:,}")
+
+        print("\nSeeding gloss source texts...")
+        n = seeder.seed_gloss_source_texts(data_dir)
+        print(f"  gloss_source_texts: {n:,}")
+
+        print("\nSeeding image details...")
+        n = seeder.seed_image_details(data_dir)
+        print(f"  image_details: {n:,}")
+
+        print("\nSeeding structural pages...")
+        n = seeder.seed_structural_pages(data_dir)
+        print(f"  structural_pages: {n:,}")
+    except BaseException:
+        # Rebuild even after a failed step, so search doesn't stay unindexed until --resume
+        # finishes, but never let a rebuild failure hide the step's own error
+        try:
+            _create_trgm_indexes(seeder)
+        except Exception as e:
+            print(f"  ERROR rebuilding trigram indexes: {e}")
+        raise
+    _create_trgm_indexes(seeder)
 
     print(f"\n{'=' * 60}")
+    (data_dir / COUNTS_FILE).write_text(json.dumps(seeder.expected, indent=2), encoding="utf-8")
+    checkpoint_path.unlink(missing_ok=True)
     print("Verifying row counts...")
-    seeder.verify_counts()
+    seeder.verify_counts(count_mode)
     print(f"{'=' * 60}")
     print("Seed complete!")
 
@@ -786,8 +1112,31 @@ def seed_all(data_dir: Path = PROCESSED_DIR):
 def main():
     parser = argparse.ArgumentParser(description="Seed Supabase database from exported JSON")
     parser.add_argument("--dir", type=Path, default=PROCESSED_DIR, help="Path to processed JSON directory")
+    parser.add_argument("--count", choices=COUNT_MODES, default="exact",
+                        help="Row count method for verification (planned/estimated skip full scans)")
+    parser.add_argument("--verify-only", action="store_true",
+                        help=f"Only compare table counts against {COUNTS_FILE} from the last seed")
+    parser.add_argument("--resume", action="store_true",
+                        help=f"Continue from {CHECKPOINT_FILE} instead of truncating and starting over")
+    parser.add_argument("--documents-only", action="store_true",
+                        help="Only upsert changed entry_document rows and delete stale ones")
     args = parser.parse_args()
-    seed_all(args.dir)
+    if args.verify_only:
+        verify_only(args.dir, args.count)
+        return
+    if args.documents_only:
+        try:
+            sync_documents(args.dir)
+        except SeedError as e:
+            print(f"  ERROR {e}")
+            sys.exit(1)
+        return
+    try:
+        seed_all(args.dir, args.count, resume=args.resume)
+    except SeedError as e:
+        print(f"  ERROR {e}")
+        print("  Progress is checkpointed; rerun with --resume to continue.")
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,352 @@
+"""Local HTTP query API over the exported dictionary.
+
+    python -m chd.serve [--dir data/processed] [--port 8787]
+
+Endpoints (GET or HEAD, JSON responses):
+
+    /entry/<id>                       one entry from store/
+    /prefix?q=<text>&limit=N          headwords starting with text (diacritic-insensitive)
+    /search?q=<text>&limit=N          headword matches plus English → Hawaiian BM25 hits
+    /concordance?word=<text>&limit=N  KWIC lines for a Hawaiian word or phrase
+    /concordance?anchor=<anchor>      sentences linking to a word anchor
+    /topics                           topic names with entry counts
+    /topic/<name>                     entries tagged with a topic
+    /stats                            response cache counters
+
+Built on asyncio streams only: HTTP/1.1 keep-alive, an LRU cache of
+encoded responses (plain and gzip), and gzip when the client accepts it.
+Index lookups are mmap-backed and fast enough to run inline on the event
+loop. Indexes missing from (or unreadable in) the export answer 503;
+unexpected errors are logged and answer an uncached 500.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import bisect
+import gzip
+import json
+import logging
+import struct
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from chd.facets import FACETS_FILE, FacetIndex
+from chd.kwic import PhraseIndex, fold
+from chd.reverse import ReverseIndex
+from chd.store import StoreReader
+from chd.word_index import WordIndex
+
+logger = logging.getLogger(__name__)
+
+PROCESSED_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "processed"
+DEFAULT_PORT = 8787
+CACHE_SIZE = 4096
+MAX_LIMIT = 500
+GZIP_MIN_BYTES = 512
+MAX_HEADER_BYTES = 16384
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           431: "Request Header Fields Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _optional(loader, *args):
+    """loader(*args), or None if the index is missing or unreadable (its endpoints answer 503)."""
+    try:
+        return loader(*args)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, struct.error) as exc:
+        # Truncated or corrupt index (JSONDecodeError is a ValueError)
+        logger.warning("Disabling %s: %s", args[0], exc)
+        return None
+
+
+class DictionaryAPI:
+    """Routes request paths to the exported indexes and returns JSON-able results."""
+
+    def __init__(self, data_dir: Path):
+        self.store = _optional(StoreReader, data_dir / "store")
+        index_dir = data_dir / "index"
+        self.phrases = _optional(PhraseIndex, index_dir)
+        self.words = _optional(WordIndex, index_dir)
+        self.reverse = _optional(ReverseIndex, index_dir)
+        self.facets = _optional(FacetIndex.load, index_dir / FACETS_FILE)
+
+        # (folded headword, headword, id), sorted for prefix bisection
+        self.headwords: list[tuple[str, str, str]] = []
+        self.labels: dict[str, str] = {}
+        if self.store is not None:
+            for r in self.store.records():
+                headword = r.get("headword", "")
+                self.labels[r["id"]] = r.get("headword_display") or headword
+                self.headwords.append((fold(headword), headword, r["id"]))
+            self.headwords.sort()
+
+    def close(self) -> None:
+        for index in (self.store, self.phrases, self.words, self.reverse):
+            if index is not None:
+                index.close()
+
+    @staticmethod
+    def _require(index, name: str):
+        if index is None:
+            raise HTTPError(503, f"{name} not found in the export")
+        return index
+
+    @staticmethod
+    def _limit(params: dict[str, str], default: int = 20) -> int:
+        try:
+            return max(1, min(int(params.get("limit", default)), MAX_LIMIT))
+        except ValueError:
+            raise HTTPError(400, "limit must be an integer") from None
+
+    @staticmethod
+    def _param(params: dict[str, str], name: str) -> str:
+        value = params.get(name, "").strip()
+        if not value:
+            raise HTTPError(400, f"Missing query parameter {name!r}")
+        return value
+
+    def handle(self, path: str, params: dict[str, str]) -> bytes | object:
+        """Result for one request: raw JSON bytes or a JSON-serializable object."""
+        parts = [unquote(p) for p in path.strip("/").split("/")]
+        route, rest = parts[0], parts[1:]
+        if route == "entry" and len(rest) == 1:
+            raw = self._require(self.store, "Entry store").get_bytes(rest[0])
+            if raw is None:
+                raise HTTPError(404, f"No entry {rest[0]!r}")
+            return raw
+        if route == "prefix" and not rest:
+            return self.prefix(self._param(params, "q"), self._limit(params))
+        if route == "search" and not rest:
+            return self.search(self._param(params, "q"), self._limit(params))
+        if route == "concordance" and not rest:
+            if "anchor" in params:
+                return self.anchor_concordance(self._param(params, "anchor"), self._limit(params, 50))
+            return self.concordance(self._param(params, "word"), self._limit(params, 50))
+        if route == "topics" and not rest:
+            return self._require(self.facets, "Facet index").facet_counts("topics")
+        if route == "topic" and len(rest) == 1:
+            return self.topic(rest[0], self._limit(params, MAX_LIMIT))
+        raise HTTPError(404, f"No route for /{path.strip('/')}")
+
+    def _entry_refs(self, ids) -> list[dict]:
+        return [{"id": i, "headword": self.labels.get(i, "")} for i in ids]
+
+    def prefix(self, text: str, limit: int) -> list[dict]:
+        self._require(self.store, "Entry store")
+        key = fold(text)
+        start = bisect.bisect_left(self.headwords, (key,))
+        results = []
+        for i in range(start, min(start + limit, len(self.headwords))):
+            folded, headword, entry_id = self.headwords[i]
+            if not folded.startswith(key):
+                break
+            results.append({"id": entry_id, "headword": headword})
+        return results
+
+    def search(self, text: str, limit: int) -> dict:
+        key = fold(text)
+        start = bisect.bisect_left(self.headwords, (key,))
+        exact = []
+        for i in range(start, min(start + limit, len(self.headwords))):
+            folded, _, entry_id = self.headwords[i]
+            if folded != key:
+                break
+            exact.append(entry_id)
+        english = self.reverse.search(text, limit) if self.reverse is not None else []
+        return {
+            "headwords": self._entry_refs(exact),
+            "english": [h._asdict() for h in english],
+        }
+
+    def concordance(self, word: str, limit: int) -> list[dict]:
+        phrases = self._require(self.phrases, "Phrase index")
+        hits = phrases.phrase(word)[:limit]
+        return [{
+            "left": line.left, "match": line.match, "right": line.right,
+            "english": line.sentence.english_text,
+            "source": {"kind": line.sentence.kind, "key": line.sentence.key, "ordinal": line.sentence.ordinal},
+        } for line in phrases.kwic(hits)]
+
+    def anchor_concordance(self, anchor: str, limit: int) -> list[dict]:
+        words = self._require(self.words, "Word index")
+        return [{"kind": kind, "key": key, "ordinal": ordinal, "positions": positions}
+                for (kind, key, ordinal), positions in words.lookup(anchor)[:limit]]
+
+    def topic(self, name: str, limit: int) -> dict:
+        facets = self._require(self.facets, "Facet index")
+        bits = facets.query({"topics": name})
+        return {"topic": name, "count": facets.count(bits), "entries": self._entry_refs(facets.ids_of(bits)[:limit])}
+
+
+class ResponseCache:
+    """LRU of request target → (status, body, gzipped body)."""
+
+    def __init__(self, size: int = CACHE_SIZE):
+        self.size = size
+        self._items: OrderedDict[str, tuple[int, bytes, bytes | None]] = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, target: str) -> tuple[int, bytes, bytes | None] | None:
+        item = self._items.get(target)
+        if item is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._items.move_to_end(target)
+        return item
+
+    def put(self, target: str, item: tuple[int, bytes, bytes | None]) -> None:
+        self._items[target] = item
+        self._items.move_to_end(target)
+        if len(self._items) > self.size:
+            self._items.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._items),
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0}
+
+
+def _encode(result: bytes | object) -> bytes:
+    if isinstance(result, bytes):
+        return result
+    return json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class Server:
+    """HTTP/1.1 front end for a DictionaryAPI."""
+
+    def __init__(self, api: DictionaryAPI, cache_size: int = CACHE_SIZE):
+        self.api = api
+        self.cache = ResponseCache(cache_size)
+
+    def respond(self, target: str) -> tuple[int, bytes, bytes | None]:
+        """(status, body, gzipped body or None) for a request target, cached."""
+        cached = self.cache.get(target)
+        if cached is not None:
+            return cached
+        url = urlsplit(target)
+        if url.path.rstrip("/") == "/stats":
+            # Never cached: counters change on every request
+            return 200, _encode({"response_cache": self.cache.stats()}), None
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        try:
+            status, body = 200, _encode(self.api.handle(url.path, params))
+        except HTTPError as exc:
+            status, body = exc.status, _encode({"error": str(exc)})
+        except Exception:
+            logger.exception("Error handling %s", target)
+            status, body = 500, _encode({"error": "Internal server error"})
+        gzipped = gzip.compress(body, compresslevel=5) if len(body) >= GZIP_MIN_BYTES else None
+        item = (status, body, gzipped)
+        if status < 500:
+            self.cache.put(target, item)
+        return item
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(self._head(431, 0, False, None))
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    writer.write(self._head(400, 0, False, None))
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+                try:
+                    body_length = int(headers.get("content-length", 0))
+                except ValueError:
+                    body_length = -1
+                if not 0 <= body_length <= MAX_HEADER_BYTES:
+                    writer.write(self._head(400, 0, False, None))
+                    break
+                if body_length:
+                    await reader.readexactly(body_length)  # request bodies are ignored
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                if method not in ("GET", "HEAD"):
+                    status, body, gzipped = 405, _encode({"error": f"{method} not allowed"}), None
+                else:
+                    status, body, gzipped = self.respond(target)
+                encoding = None
+                if gzipped is not None and "gzip" in headers.get("accept-encoding", ""):
+                    body, encoding = gzipped, "gzip"
+                writer.write(self._head(status, len(body), keep_alive, encoding))
+                if method != "HEAD":
+                    writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    def _head(status: int, length: int, keep_alive: bool, encoding: str | None) -> bytes:
+        lines = [
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {length}",
+            "Vary: Accept-Encoding",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if encoding:
+            lines.append(f"Content-Encoding: {encoding}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def start(self, host: str, port: int) -> asyncio.Server:
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER_BYTES)
+
+
+async def _serve(data_dir: Path, host: str, port: int, cache_size: int) -> None:
+    api = DictionaryAPI(data_dir)
+    server = await Server(api, cache_size).start(host, port)
+    print(f"Serving {data_dir} on http://{host}:{port} ({len(api.headwords)} entries)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        api.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the exported dictionary over a local HTTP API")
+    parser.add_argument("--dir", type=Path, default=PROCESSED_DIR, help="Path to processed export directory")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE, help="Cached responses to keep")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args.dir, args.host, args.port, args.cache_size))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Static JSON shards for the front end's entry and browse pages.
+
+Written during export to site/:
+
+    entry/{id}.json                       one entry (children nested) plus its
+                                          resolved cross-ref / linked-word targets
+    browse/{letter}/index.json            two-letter prefixes with entry and page counts
+    browse/{letter}/{prefix}-{page}.json  PAGE_SIZE headword summaries per page
+    manifest.json                         path → {"etag", "bytes"}
+
+Prefixes are the two-letter jump anchors of each haw-{letter}.htm page
+(parse_combo_anchors); an entry falls under the last anchor that sorts at
+or before its headword. Prefixes and the rows within them are in Hawaiian
+alphabetical order (chd.collation), matching Trussel's pages. Every shard
+gets a .gz sibling and, when the optional brotli package is installed, a
+.br sibling, so a static host can serve precompressed bytes. ETags are
+content hashes; shards whose hash is unchanged since the previous manifest
+are not rewritten, and shards it listed that this run no longer produces
+are deleted along with their compressed siblings.
+"""
+
+from __future__ import annotations
+
+import bisect
+import gzip
+import hashlib
+import json
+from pathlib import Path
+
+from chd.collation import primary_key, sort_key
+from chd.kwic import fold
+from chd.models import Entry
+from chd.parsers.structural import ALL_LETTERS, parse_combo_anchors
+from chd.validate import LinkResolver
+
+try:
+    import brotli
+except ImportError:  # optional: .br variants are skipped without it
+    brotli = None
+
+PAGE_SIZE = 100
+GLOSS_CHARS = 120
+MANIFEST_FILE = "manifest.json"
+# Letter page keys: haw-aa.htm is the ā page, a core page like the single letters
+LETTER_PAGES = (*ALL_LETTERS, "aa")
+
+
+def _encode(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:20] + '"'
+
+
+def shard_name(entry_id: str) -> str:
+    return entry_id.replace("/", "_")
+
+
+def prefix_key(headword: str) -> str:
+    """Letters of the folded headword, for placing it under a two-letter prefix."""
+    return "".join(ch for ch in fold(headword) if ch.isalpha())
+
+
+def assign_prefix(headword: str, combos: list[str]) -> str:
+    """The prefix headword browses under; combos must be in Hawaiian order."""
+    if not combos:
+        return prefix_key(headword)[:2] or "_"
+    i = bisect.bisect_right(combos, primary_key(headword), key=primary_key)
+    return combos[max(i - 1, 0)]
+
+
+def summarize(entry: Entry) -> dict:
+    """Browse-row fields: enough to render a headword list without the full entry."""
+    sense = entry.senses[0] if entry.senses else None
+    gloss = sense.text if sense else ""
+    if len(gloss) > GLOSS_CHARS:
+        gloss = gloss[:GLOSS_CHARS].rsplit(" ", 1)[0] + "…"
+    row = {"id": entry.id, "headword": entry.headword_display or entry.headword, "gloss": gloss}
+    if sense and sense.pos_english:
+        row["pos"] = sense.pos_english
+    return row
+
+
+def entry_document(entry: Entry, resolver: LinkResolver, labels: dict[str, str]) -> dict:
+    """The entry with cross-ref and linked-word targets resolved to {id, headword}."""
+    doc = entry.model_dump(exclude_defaults=True)
+    related = {}
+    targets = [(x.ref_type, x.target_anchor or x.target_headword) for x in entry.cross_refs]
+    targets += [("linked_word", lw.target_anchor or lw.surface) for s in entry.senses for lw in s.linked_words]
+    for kind, target in targets:
+        target_id = resolver.resolve(target)
+        if target_id and target_id != entry.id and target_id not in related:
+            related[target_id] = {"id": target_id, "headword": labels.get(target_id, ""), "type": kind}
+    if related:
+        doc["related"] = list(related.values())
+    return doc
+
+
+class ShardWriter:
+    """Writes shards with compressed variants and records their ETags."""
+
+    def __init__(self, site_dir: Path):
+        self.site_dir = site_dir
+        self.manifest: dict[str, dict] = {}
+        self.written = self.unchanged = self.removed = 0
+        path = site_dir / MANIFEST_FILE
+        self._previous = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+    def write(self, rel_path: str, data) -> None:
+        body = _encode(data)
+        tag = etag(body)
+        self.manifest[rel_path] = {"etag": tag, "bytes": len(body)}
+        path = self.site_dir / rel_path
+        if self._previous.get(rel_path, {}).get("etag") == tag and path.exists():
+            self.unchanged += 1
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(body)
+        path.with_name(path.name + ".gz").write_bytes(gzip.compress(body, compresslevel=9, mtime=0))
+        if brotli is not None:
+            path.with_name(path.name + ".br").write_bytes(brotli.compress(body))
+        self.written += 1
+
+    def close(self) -> None:
+        """Delete shards the previous manifest listed but this run didn't write, then save the manifest."""
+        for rel_path in sorted(self._previous.keys() - self.manifest.keys()):
+            path = self.site_dir / rel_path
+            for stale in (path, path.with_name(path.name + ".gz"), path.with_name(path.name + ".br")):
+                stale.unlink(missing_ok=True)
+            self.removed += 1
+        path = self.site_dir / MANIFEST_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.manifest, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+
+
+def write_shards(
+    entries: list[Entry], site_dir: Path, combos: dict[str, list[str]] | None = None,
+    resolver: LinkResolver | None = None,
+) -> ShardWriter:
+    """Write entry and browse shards. combos maps letter page → two-letter anchors."""
+    combos = {letter: sorted(c, key=primary_key) for letter, c in (combos or {}).items()}
+    resolver = resolver or LinkResolver(entries)
+    labels = {e.id: e.headword_display or e.headword for e in entries if e.id}
+    writer = ShardWriter(site_dir)
+
+    seen: set[str] = set()
+    by_letter: dict[str, dict[str, list[tuple[str, dict]]]] = {}
+    for e in entries:
+        if not e.id or e.id in seen:
+            continue
+        seen.add(e.id)
+        writer.write(f"entry/{shard_name(e.id)}.json", entry_document(e, resolver, labels))
+        letter = e.letter_page or "other"
+        prefix = assign_prefix(e.headword, combos.get(letter, []))
+        key = e.sort_key or sort_key(e.headword, e.subscript)
+        by_letter.setdefault(letter, {}).setdefault(prefix, []).append((key, summarize(e)))
+
+    for letter, prefixes in sorted(by_letter.items()):
+        index = []
+        for prefix in sorted(prefixes, key=primary_key):
+            rows = [row for _, row in sorted(prefixes[prefix], key=lambda kr: kr[0])]
+            pages = (len(rows) + PAGE_SIZE - 1) // PAGE_SIZE
+            index.append({"prefix": prefix, "entries": len(rows), "pages": pages})
+            for page in range(pages):
+                writer.write(f"browse/{letter}/{prefix}-{page + 1}.json", {
+                    "letter": letter, "prefix": prefix, "page": page + 1, "pages": pages, "total": len(rows),
+                    "entries": rows[page * PAGE_SIZE:(page + 1) * PAGE_SIZE],
+                })
+        writer.write(f"browse/{letter}/index.json", {"letter": letter, "prefixes": index})
+    writer.close()
+    return writer
+
+
+def load_combos(raw_dir: Path) -> dict[str, list[str]]:
+    """Two-letter anchors for every letter page haw-{letter}.htm (LETTER_PAGES) in raw_dir.
+
+    Only letter pages are read; haw-conc-* and topical haw-*-* pages have no
+    jump anchors and are far too large to parse for nothing.
+    """
+    combos = {}
+    for letter in LETTER_PAGES:
+        path = raw_dir / f"haw-{letter}.htm"
+        if path.exists():
+            anchors = parse_combo_anchors(path)
+            if anchors:
+                combos[letter] = anchors
+    return combos
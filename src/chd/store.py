@@ -0,0 +1,282 @@
+"""Memory-mapped random-access entry store.
+
+Written during export to store/:
+
+    entries.dat   magic "CHDSTOR1", then one record per entry in export order:
+                  u32 length + compact JSON (model_dump(exclude_defaults=True))
+    entries.idx   magic "CHDSIDX1", u32 count, then fixed-size records sorted
+                  by UTF-8 id bytes (u32 key offset, u16 key length, u64 record
+                  offset), then the concatenated ids
+
+StoreReader maps both files and binary-searches the index, so a lookup
+decodes one record instead of a whole haw_eng/{letter}.json, and every
+process reading the store shares the same page cache. EntryStore adds a
+thread-safe LRU/TTL cache of decoded entries on top for long-running
+services.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+from chd.models import Entry
+
+DATA_FILE = "entries.dat"
+INDEX_FILE = "entries.idx"
+
+DATA_MAGIC = b"CHDSTOR1"
+INDEX_MAGIC = b"CHDSIDX1"
+INDEX_HEADER = struct.Struct("<8sI")
+INDEX_ENTRY = struct.Struct("<IHQ")
+LENGTH = struct.Struct("<I")
+
+
+def encode_entry(entry: Entry) -> bytes:
+    return json.dumps(entry.model_dump(exclude_defaults=True), ensure_ascii=False,
+                      separators=(",", ":"), default=str).encode("utf-8")
+
+
+def write_store(entries: Iterable[Entry], store_dir: Path) -> int:
+    """Write the data and index files. Entries without an ID or with a repeated ID are skipped."""
+    store_dir.mkdir(parents=True, exist_ok=True)
+    offsets: dict[bytes, int] = {}
+    with (store_dir / DATA_FILE).open("wb") as f:
+        f.write(DATA_MAGIC)
+        pos = len(DATA_MAGIC)
+        for e in entries:
+            key = e.id.encode("utf-8")
+            if not key or key in offsets:
+                continue
+            blob = encode_entry(e)
+            offsets[key] = pos
+            f.write(LENGTH.pack(len(blob)))
+            f.write(blob)
+            pos += LENGTH.size + len(blob)
+
+    records = bytearray()
+    keys = bytearray()
+    for key in sorted(offsets):
+        records += INDEX_ENTRY.pack(len(keys), len(key), offsets[key])
+        keys += key
+    with (store_dir / INDEX_FILE).open("wb") as f:
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, len(offsets)))
+        f.write(records)
+        f.write(keys)
+    return len(offsets)
+
+
+def _map(path: Path, magic: bytes) -> tuple[BinaryIO, mmap.mmap]:
+    f = path.open("rb")
+    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mm[:len(magic)] != magic:
+        mm.close()
+        f.close()
+        raise ValueError(f"{path} is not an entry store file")
+    return f, mm
+
+
+class StoreReader:
+    """Read-only access to a store written by write_store."""
+
+    def __init__(self, store_dir: Path):
+        self._data_file, self._data = _map(store_dir / DATA_FILE, DATA_MAGIC)
+        try:
+            self._index_file, self._index = _map(store_dir / INDEX_FILE, INDEX_MAGIC)
+        except ValueError:
+            self._data.close()
+            self._data_file.close()
+            raise
+        _, self._count = INDEX_HEADER.unpack_from(self._index, 0)
+        self._keys_start = INDEX_HEADER.size + self._count * INDEX_ENTRY.size
+
+    def close(self) -> None:
+        for mm, f in ((self._data, self._data_file), (self._index, self._index_file)):
+            mm.close()
+            f.close()
+
+    def __enter__(self) -> StoreReader:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _slot(self, i: int) -> tuple[bytes, int]:
+        key_off, key_len, offset = INDEX_ENTRY.unpack_from(self._index, INDEX_HEADER.size + i * INDEX_ENTRY.size)
+        start = self._keys_start + key_off
+        return self._index[start:start + key_len], offset
+
+    def _offset(self, entry_id: str) -> int:
+        target = entry_id.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._slot(mid)[0] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count:
+            key, offset = self._slot(lo)
+            if key == target:
+                return offset
+        return -1
+
+    def __contains__(self, entry_id: str) -> bool:
+        return self._offset(entry_id) >= 0
+
+    def get_bytes(self, entry_id: str) -> bytes | None:
+        """The encoded record for entry_id, or None."""
+        offset = self._offset(entry_id)
+        if offset < 0:
+            return None
+        (length,) = LENGTH.unpack_from(self._data, offset)
+        start = offset + LENGTH.size
+        return self._data[start:start + length]
+
+    def get_dict(self, entry_id: str) -> dict | None:
+        """The entry as a dict holding only its non-default fields."""
+        raw = self.get_bytes(entry_id)
+        return None if raw is None else json.loads(raw)
+
+    def get(self, entry_id: str) -> Entry | None:
+        raw = self.get_bytes(entry_id)
+        return None if raw is None else Entry.model_validate_json(raw)
+
+    def ids(self) -> Iterator[str]:
+        """Every entry ID in sorted (UTF-8 byte) order."""
+        for i in range(self._count):
+            yield self._slot(i)[0].decode("utf-8")
+
+    def records(self) -> Iterator[dict]:
+        """Every entry as a dict (non-default fields only), in export order."""
+        pos = len(DATA_MAGIC)
+        end = len(self._data)
+        while pos < end:
+            (length,) = LENGTH.unpack_from(self._data, pos)
+            pos += LENGTH.size
+            yield json.loads(self._data[pos:pos + length])
+            pos += length
+
+
+class EntryStore:
+    """Shared, thread-safe entry lookup with an LRU cache of decoded entries.
+
+    The store files are opened on first use. The cache is bounded by entry
+    count (max_entries) and/or encoded record bytes (max_bytes); ttl, if set,
+    expires entries that many seconds after they were cached. Unknown IDs
+    are not cached.
+    """
+
+    def __init__(self, store_dir: Path, max_entries: int = 4096, max_bytes: int | None = None,
+                 ttl: float | None = None, clock: Callable[[], float] = time.monotonic):
+        self.store_dir = store_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._reader: StoreReader | None = None
+        self._cache: OrderedDict[str, tuple[Entry, int, float]] = OrderedDict()  # id → (entry, bytes, cached at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def _open(self) -> StoreReader:
+        """The reader, opened on first use; caller holds the lock."""
+        if self._reader is None:
+            self._reader = StoreReader(self.store_dir)
+        return self._reader
+
+    def close(self) -> None:
+        with self._lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+            self._cache.clear()
+            self._bytes = 0
+
+    def __enter__(self) -> EntryStore:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _cached(self, entry_id: str) -> Entry | None:
+        """Cache lookup; caller holds the lock."""
+        item = self._cache.get(entry_id)
+        if item is None:
+            return None
+        entry, size, cached_at = item
+        if self.ttl is not None and self._clock() - cached_at >= self.ttl:
+            del self._cache[entry_id]
+            self._bytes -= size
+            self.expirations += 1
+            return None
+        self._cache.move_to_end(entry_id)
+        return entry
+
+    def _insert(self, entry_id: str, entry: Entry, size: int) -> None:
+        """Cache an entry and evict down to the bounds; caller holds the lock."""
+        old = self._cache.pop(entry_id, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._cache[entry_id] = (entry, size, self._clock())
+        self._bytes += size
+        while self._cache and (len(self._cache) > self.max_entries
+                               or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            _, (_, evicted, _) = self._cache.popitem(last=False)
+            self._bytes -= evicted
+            self.evictions += 1
+
+    def get(self, entry_id: str) -> Entry | None:
+        with self._lock:
+            entry = self._cached(entry_id)
+            if entry is not None:
+                self.hits += 1
+                return entry
+            self.misses += 1
+            # Copy the record out of the mmap before close() can unmap it
+            raw = self._open().get_bytes(entry_id)
+        # Decode outside the lock so concurrent misses don't serialize
+        if raw is None:
+            return None
+        entry = Entry.model_validate_json(raw)
+        with self._lock:
+            self._insert(entry_id, entry, len(raw))
+        return entry
+
+    def get_many(self, entry_ids: Iterable[str]) -> dict[str, Entry]:
+        """{id: entry} for every ID that exists, in request order."""
+        found = {}
+        for entry_id in entry_ids:
+            if entry_id not in found:
+                entry = self.get(entry_id)
+                if entry is not None:
+                    found[entry_id] = entry
+        return found
+
+    def __contains__(self, entry_id: str) -> bool:
+        with self._lock:
+            return entry_id in self._open()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "cached_entries": len(self._cache),
+                "cached_bytes": self._bytes,
+            }
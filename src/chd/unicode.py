@@ -1,10 +1,20 @@
-"""Unicode utilities for Hawaiian text processing."""
+"""Unicode utilities for Hawaiian text processing.
+
+Translate tables are built once at import, so every normalization is a
+single str.translate pass. to_ascii is also memoized, since the same
+headwords and anchors are normalized repeatedly (entries, links,
+validation probes). The *_many functions join a whole batch and translate
+the joined buffer once (see scripts/bench_unicode.py).
+"""
 
 from __future__ import annotations
 
 import re
+from collections.abc import Iterable
+from functools import lru_cache
 
 SUBSCRIPT_DIGITS = str.maketrans("₀₁₂₃₄₅₆₇₈₉", "0123456789")
+DISPLAY_SUBSCRIPTS = str.maketrans("0123456789", "₀₁₂₃₄₅₆₇₈₉")
 SUBSCRIPT_RE = re.compile(r"[₀₁₂₃₄₅₆₇₈₉]+$")
 
 OKINA_VARIANTS = ["\u2018", "\u2019", "\u0060", "\u00B4", "\u0027"]
@@ -14,6 +24,14 @@ KAHAKO_MAP = {
     "Ā": "A", "Ē": "E", "Ī": "I", "Ō": "O", "Ū": "U",
 }
 
+OKINA_TABLE = str.maketrans(dict.fromkeys(OKINA_VARIANTS, "\u02BB"))
+ASCII_TABLE = str.maketrans({"\u02BB": None, **KAHAKO_MAP})
+
+ASCII_CACHE_SIZE = 1 << 16
+
+# Joins batches into one buffer; no table maps it
+_BATCH_SEP = "\x00"
+
 
 def strip_subscript(text: str) -> str:
     """Remove trailing Unicode subscript digits. 'ā₁' → 'ā'"""
@@ -28,19 +46,37 @@ def extract_subscript(text: str) -> str:
 
 def normalize_okina(text: str) -> str:
     """Normalize ʻokina variants to U+02BB."""
-    for variant in OKINA_VARIANTS:
-        text = text.replace(variant, "\u02BB")
-    return text
+    return text.translate(OKINA_TABLE)
 
 
+@lru_cache(maxsize=ASCII_CACHE_SIZE)
 def to_ascii(text: str) -> str:
     """Strip all Hawaiian diacriticals for URL/anchor matching."""
-    result = text.replace("\u02BB", "")
-    for accented, plain in KAHAKO_MAP.items():
-        result = result.replace(accented, plain)
-    return result
+    return text.translate(ASCII_TABLE)
 
 
 def subscript_to_display(num: int | str) -> str:
     """Convert plain number to Unicode subscript. 1 → '₁'"""
-    return str(num).translate(str.maketrans("0123456789", "₀₁₂₃₄₅₆₇₈₉"))
+    return str(num).translate(DISPLAY_SUBSCRIPTS)
+
+
+def _translate_many(texts: Iterable[str], table: dict[int, str | None]) -> list[str]:
+    """Translate the joined batch in one pass, then split it back."""
+    texts = list(texts)
+    if not texts:
+        return []
+    joined = _BATCH_SEP.join(texts)
+    if joined.count(_BATCH_SEP) != len(texts) - 1:
+        # A string contains the separator; translate each one instead
+        return [t.translate(table) for t in texts]
+    return joined.translate(table).split(_BATCH_SEP)
+
+
+def to_ascii_many(texts: Iterable[str]) -> list[str]:
+    """Batch to_ascii. ['ʻā', 'Niʻihau'] → ['a', 'Niihau']"""
+    return _translate_many(texts, ASCII_TABLE)
+
+
+def normalize_okina_many(texts: Iterable[str]) -> list[str]:
+    """Batch normalize_okina."""
+    return _translate_many(texts, OKINA_TABLE)
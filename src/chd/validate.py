@@ -2,86 +2,196 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left
 from collections import defaultdict
+from difflib import get_close_matches
 
-from chd.models import Entry
-from chd.unicode import to_ascii
+from chd.models import ConcordanceInstance, Entry, WordToken
+from chd.unicode import ASCII_TABLE
 
 
-def validate_link_resolution(entries: list[Entry]) -> dict:
+_COMPACT_TABLE = str.maketrans("", "", " -")
+_ASCII_COMPACT_TABLE = str.maketrans({**ASCII_TABLE, ord(" "): None, ord("-"): None})
+
+
+class LinkResolver:
+    """Precomputed entry keys for resolving link targets in bulk.
+
+    A target resolves if it is an anchor ID, a headword (as written, ASCII,
+    or display form), its ASCII form is a headword, or it matches an ASCII
+    headword with spaces/hyphens stripped (multi-word compound anchors).
+    Entries without an anchor ID and empty keys are skipped, so every
+    resolution is a real entry ID. Every key variant is built once here;
+    resolutions are memoized.
+    """
+
+    def __init__(self, entries: list[Entry]):
+        self.anchors: set[str] = set()
+        self.headwords: dict[str, str] = {}
+        self.compact: dict[str, str] = {}
+        self.display: dict[str, str] = {}
+        for e in entries:
+            if not e.id:
+                continue
+            self.anchors.add(e.id)
+            self.display.setdefault(e.id, e.headword_display or e.headword)
+            for key in (e.headword, e.headword.translate(ASCII_TABLE), e.headword_display):
+                if key:
+                    self.headwords.setdefault(key, e.id)
+            compact = e.headword.translate(_ASCII_COMPACT_TABLE).lower()
+            if compact:
+                self.compact.setdefault(compact, e.id)
+        self._sorted_compact = sorted(self.compact)
+        self._cache: dict[str, str | None] = {}
+
+    def resolve(self, target: str) -> str | None:
+        """Return the matching entry ID, or None."""
+        try:
+            return self._cache[target]
+        except KeyError:
+            pass
+        if target in self.anchors:
+            found = target
+        else:
+            found = self.headwords.get(target)
+            if found is None:
+                found = self.headwords.get(target.translate(ASCII_TABLE))
+            if found is None:
+                found = self.compact.get(target.translate(_COMPACT_TABLE).lower())
+        self._cache[target] = found
+        return found
+
+    def resolve_many(self, targets: list[str]) -> list[str | None]:
+        """resolve() over a batch, in order; repeated targets come from the memo."""
+        return [self.resolve(t) for t in targets]
+
+    def suggest(self, target: str, n: int = 3) -> list[str]:
+        """Closest headwords by compact ASCII key, from a window around the target's sort position."""
+        key = target.translate(_ASCII_COMPACT_TABLE).lower()
+        keys = self._sorted_compact
+        pos = bisect_left(keys, key)
+        window = keys[max(0, pos - 25):pos + 25]
+        matches = get_close_matches(key, window, n=n, cutoff=0.6)
+        return [self.display.get(self.compact[m], m) for m in matches]
+
+
+class WordTokenResolver:
+    """Fill WordToken.target_entry in bulk and tally resolution per source.
+
+    Tokens resolve by anchor (falling back to surface) through a LinkResolver,
+    either passed in or built once over all entries by resolve_examples.
+    Resolving anything before one exists raises RuntimeError.
+    """
+
+    def __init__(self, links: LinkResolver | None = None):
+        self.links = links
+        self.stats: dict[str, dict[str, int]] = {}
+
+    def resolve(self, tokens: list[WordToken], source: str) -> None:
+        if self.links is None:
+            raise RuntimeError("WordTokenResolver has no LinkResolver; pass links= or call resolve_examples first")
+        stats = self.stats.setdefault(source, {"total": 0, "resolved": 0})
+        found = self.links.resolve_many([token.anchor or token.surface for token in tokens])
+        for token, entry_id in zip(tokens, found):
+            token.target_entry = entry_id or ""
+        stats["total"] += len(tokens)
+        stats["resolved"] += sum(entry_id is not None for entry_id in found)
+
+    def resolve_examples(self, entries: list[Entry]) -> None:
+        """Build the resolver from entries and resolve their example tokens."""
+        if self.links is None:
+            self.links = LinkResolver(entries)
+        for e in entries:
+            for ex in e.examples:
+                self.resolve(ex.word_tokens, "examples")
+
+    def resolve_concordance(self, letter: str, ordinal: int, inst: ConcordanceInstance) -> None:
+        """Export consumer for concordance rows."""
+        self.resolve(inst.word_tokens, "concordance")
+
+    def report(self) -> dict:
+        return {
+            source: {**s, "resolution_rate": round(s["resolved"] / s["total"] * 100, 1) if s["total"] else 0}
+            for source, s in self.stats.items()
+        }
+
+
+def _tally(stats: dict, key: str, resolved: bool) -> None:
+    bucket = stats.setdefault(key or "(none)", {"total": 0, "resolved": 0})
+    bucket["total"] += 1
+    bucket["resolved"] += resolved
+
+
+def _section(total: int, resolved: int, by_source: dict, by_class: dict, unresolved: list) -> dict:
+    rate = (resolved / total * 100) if total else 0
+    return {
+        "total": total,
+        "resolved": resolved,
+        "resolution_rate": round(rate, 1),
+        "by_source": by_source,
+        "by_class": by_class,
+        "unresolved_sample": unresolved[:50],
+        "unresolved": unresolved,
+    }
+
+
+def validate_link_resolution(entries: list[Entry], resolver: LinkResolver | None = None) -> dict:
     """Check how many cross-refs and linked words resolve to actual entries.
 
-    Returns a report dict with resolution rates and unresolved links.
+    Returns a report dict with resolution rates, per-source-dictionary and
+    per-link-class stats, and every unresolved link with target suggestions.
     """
-    # Build anchor index with multiple matching strategies
-    anchor_set = set()
-    headword_set = set()
-    ascii_nospace_set = set()
-    for e in entries:
-        if e.id:
-            anchor_set.add(e.id)
-        headword_set.add(e.headword)
-        headword_set.add(to_ascii(e.headword))
-        headword_set.add(e.headword_display)
-        # ASCII with spaces/hyphens stripped for multi-word compound matching
-        ascii_ns = to_ascii(e.headword).replace(" ", "").replace("-", "").lower()
-        ascii_nospace_set.add(ascii_ns)
-
-    def _resolves(target: str) -> bool:
-        if target in anchor_set or target in headword_set:
-            return True
-        ascii_t = to_ascii(target)
-        if ascii_t in headword_set:
-            return True
-        # Try as concatenated ASCII (handles multi-word compound anchors)
-        ascii_ns = target.replace(" ", "").replace("-", "").lower()
-        return ascii_ns in ascii_nospace_set
-
-    # Check cross-refs
-    xref_total = 0
-    xref_resolved = 0
-    xref_unresolved = []
-    for e in entries:
-        for xref in e.cross_refs:
-            xref_total += 1
-            target = xref.target_anchor or xref.target_headword
-            if _resolves(target):
-                xref_resolved += 1
-            else:
-                xref_unresolved.append({
-                    "from_entry": e.id,
-                    "from_headword": e.headword_display,
-                    "ref_type": xref.ref_type,
-                    "target": xref.target_headword,
-                    "target_anchor": xref.target_anchor,
-                })
-
-    # Check linked words in senses
-    link_total = 0
-    link_resolved = 0
-    for e in entries:
-        for sense in e.senses:
-            for lw in sense.linked_words:
-                link_total += 1
-                target = lw.target_anchor or lw.surface
-                if _resolves(target):
-                    link_resolved += 1
+    resolver = resolver or LinkResolver(entries)
 
-    xref_rate = (xref_resolved / xref_total * 100) if xref_total else 0
-    link_rate = (link_resolved / link_total * 100) if link_total else 0
+    xref_total = xref_resolved = 0
+    xref_by_source: dict = {}
+    xref_by_type: dict = {}
+    xref_unresolved = []
+    link_total = link_resolved = 0
+    link_by_source: dict = {}
+    link_by_class: dict = {}
+    link_unresolved = []
+
+    # Collect every link target first, then resolve them in one bulk call per kind
+    xrefs = [(e, xref, xref.target_anchor or xref.target_headword) for e in entries for xref in e.cross_refs]
+    for (e, xref, target), found in zip(xrefs, resolver.resolve_many([t for _, _, t in xrefs])):
+        ok = found is not None
+        xref_total += 1
+        xref_resolved += ok
+        _tally(xref_by_source, xref.source_dict, ok)
+        _tally(xref_by_type, xref.ref_type, ok)
+        if not ok:
+            xref_unresolved.append({
+                "from_entry": e.id,
+                "from_headword": e.headword_display,
+                "ref_type": xref.ref_type,
+                "target": xref.target_headword,
+                "target_anchor": xref.target_anchor,
+                "suggestions": resolver.suggest(xref.target_headword or target),
+            })
+
+    # Linked words in senses
+    links = [(e, sense, lw, lw.target_anchor or lw.surface)
+             for e in entries for sense in e.senses for lw in sense.linked_words]
+    for (e, sense, lw, target), found in zip(links, resolver.resolve_many([t for *_, t in links])):
+        ok = found is not None
+        link_total += 1
+        link_resolved += ok
+        _tally(link_by_source, sense.source_dict, ok)
+        _tally(link_by_class, lw.link_class, ok)
+        if not ok:
+            link_unresolved.append({
+                "from_entry": e.id,
+                "from_headword": e.headword_display,
+                "link_class": lw.link_class,
+                "target": lw.surface,
+                "target_anchor": lw.target_anchor,
+                "suggestions": resolver.suggest(lw.surface or target),
+            })
 
     return {
-        "cross_refs": {
-            "total": xref_total,
-            "resolved": xref_resolved,
-            "resolution_rate": round(xref_rate, 1),
-            "unresolved_sample": xref_unresolved[:50],
-        },
-        "linked_words": {
-            "total": link_total,
-            "resolved": link_resolved,
-            "resolution_rate": round(link_rate, 1),
-        },
+        "cross_refs": _section(xref_total, xref_resolved, xref_by_source, xref_by_type, xref_unresolved),
+        "linked_words": _section(link_total, link_resolved, link_by_source, link_by_class, link_unresolved),
     }
 
 
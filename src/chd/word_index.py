@@ -0,0 +1,109 @@
+"""Inverted index from word anchors to the examples and concordance rows using them.
+
+Built during export from WordToken anchors:
+
+    index/word_postings.bin   anchor → [(doc id, [token positions])] (chd.postings)
+    index/word_docs.bin       doc id → (kind, key, ordinal), fixed-size records
+
+A doc is an example ("example", entry id, index in entry.examples) or a
+concordance row ("concordance", letter, index in concordance/{letter}.json).
+Both files are memory-mapped, so a lookup costs O(postings) rather than a
+scan of every concordance file.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+from collections.abc import Iterable
+from pathlib import Path
+
+from chd.models import ConcordanceInstance, Entry, WordToken
+from chd.postings import PostingsBuilder, PostingsIndex
+
+POSTINGS_FILE = "word_postings.bin"
+DOCS_FILE = "word_docs.bin"
+
+DOC_KINDS = ("example", "concordance")
+DOCS_MAGIC = b"CHDDOCS1"
+DOCS_HEADER = struct.Struct("<8sI")
+DOC_RECORD = struct.Struct("<BIHI")  # kind, key offset, key length, ordinal
+
+Locator = tuple[str, str, int]
+
+
+class WordIndexBuilder:
+    """Collects word-token occurrences as examples and concordance rows stream past."""
+
+    def __init__(self):
+        self.postings = PostingsBuilder()
+        self.docs: list[Locator] = []
+
+    def add(self, locator: Locator, tokens: Iterable[WordToken]) -> int:
+        doc = len(self.docs)
+        self.docs.append(locator)
+        for pos, token in enumerate(tokens):
+            if token.anchor:
+                self.postings.add(token.anchor, doc, pos)
+        return doc
+
+    def add_examples(self, entries: list[Entry]) -> None:
+        for e in entries:
+            for i, ex in enumerate(e.examples):
+                self.add(("example", e.id, i), ex.word_tokens)
+
+    def add_concordance(self, letter: str, ordinal: int, inst: ConcordanceInstance) -> None:
+        """Export consumer: called once per concordance row in write order."""
+        self.add(("concordance", letter, ordinal), inst.word_tokens)
+
+    def write(self, index_dir: Path) -> None:
+        self.postings.write(index_dir / POSTINGS_FILE)
+        records = bytearray()
+        keys = bytearray()
+        for kind, key, ordinal in self.docs:
+            raw = key.encode("utf-8")
+            records += DOC_RECORD.pack(DOC_KINDS.index(kind), len(keys), len(raw), ordinal)
+            keys += raw
+        with (index_dir / DOCS_FILE).open("wb") as f:
+            f.write(DOCS_HEADER.pack(DOCS_MAGIC, len(self.docs)))
+            f.write(records)
+            f.write(keys)
+
+
+class WordIndex:
+    """Reader for the word index written by WordIndexBuilder."""
+
+    def __init__(self, index_dir: Path):
+        self.postings = PostingsIndex(index_dir / POSTINGS_FILE)
+        self._file = (index_dir / DOCS_FILE).open("rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = DOCS_HEADER.unpack_from(self._mm, 0)
+        if magic != DOCS_MAGIC:
+            self.close()
+            raise ValueError(f"{index_dir / DOCS_FILE} is not a word docs file")
+        self._keys_start = DOCS_HEADER.size + self._count * DOC_RECORD.size
+
+    def close(self) -> None:
+        self.postings.close()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> WordIndex:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def doc(self, doc_id: int) -> Locator:
+        kind, key_off, key_len, ordinal = DOC_RECORD.unpack_from(
+            self._mm, DOCS_HEADER.size + doc_id * DOC_RECORD.size)
+        start = self._keys_start + key_off
+        return DOC_KINDS[kind], self._mm[start:start + key_len].decode("utf-8"), ordinal
+
+    def lookup(self, anchor: str, kind: str = "") -> list[tuple[Locator, list[int]]]:
+        """Every (locator, token positions) using anchor, optionally one kind only."""
+        hits = [(self.doc(d), positions) for d, positions in self.postings.get(anchor)]
+        return [h for h in hits if h[0][0] == kind] if kind else hits
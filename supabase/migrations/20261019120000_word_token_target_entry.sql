@@ -0,0 +1,20 @@
+-- word_token.target_entry is now resolved at export time: the linked
+-- entry's ID, or NULL when the token's anchor matches no entry. Make it a
+-- real foreign key so entry pages can join tokens to entries directly,
+-- and index it to look up "tokens linking to entry X".
+
+ALTER TABLE word_token ALTER COLUMN target_entry DROP NOT NULL;
+ALTER TABLE word_token ALTER COLUMN target_entry DROP DEFAULT;
+
+-- Rows seeded before export-time resolution hold '' (or a stale ID)
+UPDATE word_token SET target_entry = NULL
+  WHERE target_entry IS NOT NULL
+    AND NOT EXISTS (SELECT 1 FROM entry WHERE entry.id = word_token.target_entry);
+
+ALTER TABLE word_token
+  ADD CONSTRAINT word_token_target_entry_fkey
+  FOREIGN KEY (target_entry) REFERENCES entry(id) ON DELETE SET NULL;
+
+CREATE INDEX idx_word_token_target_entry ON word_token(target_entry)
+  WHERE target_entry IS NOT NULL;
+CREATE INDEX idx_word_token_anchor ON word_token(anchor);
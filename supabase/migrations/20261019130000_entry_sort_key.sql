@@ -0,0 +1,9 @@
+-- entry.sort_key is the Hawaiian collation key computed at export
+-- (chd.collation.sort_key): lowercase hex of a byte string, so COLLATE "C"
+-- ordering is Hawaiian alphabetical order (a e i o u h k l m n p w, then
+-- loan letters; ʻokina and kahakō break ties). ORDER BY sort_key and
+-- keyset pagination on it need no collation support from the database.
+
+ALTER TABLE entry ADD COLUMN sort_key TEXT COLLATE "C" NOT NULL DEFAULT '';
+CREATE INDEX idx_entry_sort_key ON entry(sort_key);
+CREATE INDEX idx_entry_letter_sort_key ON entry(letter_page, sort_key);
@@ -0,0 +1,34 @@
+-- entry_document: one denormalized JSONB document per entry, exactly the
+-- exported Entry.model_dump(exclude_defaults=True) (senses, sub-definitions,
+-- linked words, examples and word tokens, etymology, cross-refs, grammar
+-- refs, glosses, images, alt spellings, topics). An entry page is then one
+-- primary-key read instead of a dozen table fetches. The normalized tables
+-- stay the source for search and joins.
+--
+-- content_hash is a hash of the canonical document JSON, so a delta seed
+-- (python -m chd.seed --documents-only) upserts only changed documents.
+-- No foreign key to entry, so documents can be synced without reseeding
+-- the entry table.
+
+CREATE TABLE entry_document (
+  id            TEXT PRIMARY KEY,  -- entry.id
+  document      JSONB NOT NULL,
+  content_hash  TEXT NOT NULL,
+  updated_at    TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE OR REPLACE FUNCTION touch_entry_document() RETURNS trigger AS $$
+BEGIN
+  NEW.updated_at := NOW();
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER entry_document_touch
+  BEFORE UPDATE ON entry_document
+  FOR EACH ROW
+  WHEN (OLD.content_hash IS DISTINCT FROM NEW.content_hash)
+  EXECUTE FUNCTION touch_entry_document();
+
+ALTER TABLE entry_document ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "Public read" ON entry_document FOR SELECT USING (true);
@@ -0,0 +1,82 @@
+-- Substring and typo-tolerant search: pg_trgm GIN indexes over folded text.
+--
+-- chd_fold() agrees with chd.kwic.fold (normalize_okina + to_ascii + lower):
+-- ʻokina and its look-alikes are dropped, kahakō vowels lose the macron,
+-- and case is folded. unaccent then strips any other Latin accents
+-- (English definitions, loanwords), which to_ascii leaves alone. Queries
+-- must apply chd_fold to both sides to hit the indexes, e.g.
+--
+--   WHERE chd_fold(headword) LIKE '%' || chd_fold('kahakō') || '%'
+--   WHERE chd_fold(headword) % chd_fold('kahako') ORDER BY similarity(...)
+--
+-- The indexes are created by chd_create_trgm_indexes() so the seeder can
+-- drop them for a bulk load and rebuild them once afterwards, instead of
+-- updating five GIN indexes on every inserted batch.
+
+CREATE SCHEMA IF NOT EXISTS extensions;
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA extensions;
+CREATE EXTENSION IF NOT EXISTS unaccent WITH SCHEMA extensions;
+
+-- IMMUTABLE so it can be indexed; unaccent is only STABLE because its
+-- dictionary could change, so the dictionary is named explicitly.
+CREATE OR REPLACE FUNCTION chd_fold(t TEXT) RETURNS TEXT
+  LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+AS $$
+  SELECT lower(extensions.unaccent(
+    'extensions.unaccent'::regdictionary,
+    translate(t, 'āēīōūĀĒĪŌŪʻ‘’`´''', 'aeiouAEIOU')
+  ))
+$$;
+
+-- SECURITY DEFINER: the seeder calls these over PostgREST as service_role,
+-- but only the table owner (postgres, which runs the migrations) may create
+-- or drop indexes on them. search_path is pinned so the definer's rights
+-- can't be redirected to other objects.
+CREATE OR REPLACE FUNCTION chd_create_trgm_indexes() RETURNS void
+  LANGUAGE plpgsql
+  SECURITY DEFINER
+  SET search_path = public, extensions
+AS $$
+BEGIN
+  CREATE INDEX IF NOT EXISTS idx_entry_headword_trgm
+    ON entry USING GIN (chd_fold(headword) gin_trgm_ops);
+  CREATE INDEX IF NOT EXISTS idx_sense_definition_trgm
+    ON sense USING GIN (chd_fold(definition_text) gin_trgm_ops);
+  CREATE INDEX IF NOT EXISTS idx_eng_haw_word_trgm
+    ON eng_haw_entry USING GIN (chd_fold(english_word) gin_trgm_ops);
+  CREATE INDEX IF NOT EXISTS idx_concordance_hawaiian_trgm
+    ON concordance USING GIN (chd_fold(hawaiian_text) gin_trgm_ops);
+  CREATE INDEX IF NOT EXISTS idx_concordance_english_trgm
+    ON concordance USING GIN (chd_fold(english_text) gin_trgm_ops);
+  ANALYZE entry, sense, eng_haw_entry, concordance;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION chd_drop_trgm_indexes() RETURNS void
+  LANGUAGE plpgsql
+  SECURITY DEFINER
+  SET search_path = public, extensions
+AS $$
+BEGIN
+  DROP INDEX IF EXISTS idx_entry_headword_trgm;
+  DROP INDEX IF EXISTS idx_sense_definition_trgm;
+  DROP INDEX IF EXISTS idx_eng_haw_word_trgm;
+  DROP INDEX IF EXISTS idx_concordance_hawaiian_trgm;
+  DROP INDEX IF EXISTS idx_concordance_english_trgm;
+END;
+$$;
+
+-- Index maintenance is for the seeder (service role) only
+REVOKE EXECUTE ON FUNCTION chd_create_trgm_indexes(), chd_drop_trgm_indexes() FROM PUBLIC;
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'anon') THEN
+    REVOKE EXECUTE ON FUNCTION chd_create_trgm_indexes(), chd_drop_trgm_indexes() FROM anon, authenticated;
+  END IF;
+  IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'service_role') THEN
+    GRANT EXECUTE ON FUNCTION chd_create_trgm_indexes(), chd_drop_trgm_indexes() TO service_role;
+  END IF;
+END;
+$$;
+
+SELECT chd_create_trgm_indexes();
@@ -0,0 +1,70 @@
+"""Tests for chd.autocomplete module."""
+
+from chd.autocomplete import Autocomplete, AutocompleteBuilder, Suggestion, front_code, front_decode
+from chd.models import Entry, IndexEntry, IndexPage, Sense
+from chd.restore import RestorationBuilder
+
+FREQ = {"kai": 50, "kaʻi": 5, "kahakai": 9, "kāne": 30}
+
+
+def _build(tmp_path):
+    builder = AutocompleteBuilder(lambda hw: FREQ.get(hw, 0))
+    builder.add_index_pages([IndexPage(letter="k", entries=[
+        IndexEntry(headword="kai", target_anchor="kai.1", pos="n.", definition="Sea, sea water."),
+        IndexEntry(headword="kaʻi", target_anchor="kaʻi.1", pos="vt.", definition="To lead. " * 20),
+        IndexEntry(headword="kāne", target_anchor="kāne.1", pos="n.", definition="Male, husband."),
+        IndexEntry(headword="kai", target_anchor="kai.1", pos="n.", definition="duplicate"),
+    ])])
+    builder.add_entries([
+        Entry(id="kai.1", headword="kai"),
+        Entry(id="kahakai", headword="kahakai", senses=[Sense(pos_raw="n.", text="Beach.")]),
+        Entry(id="a.1", headword="a"),
+    ])
+    assert len(builder) == 5
+    builder.write(tmp_path)
+    return Autocomplete(tmp_path)
+
+
+def test_front_coding_roundtrip():
+    keys = ["ka", "kahakai", "kai", "kai", "kane", "ke"]
+    coded = front_code(keys)
+    assert coded[:3] == [[0, "ka"], [2, "hakai"], [2, "i"]]
+    assert front_decode(coded) == keys
+
+
+def test_complete_ranks_by_frequency(tmp_path):
+    ac = _build(tmp_path)
+    assert [s.headword for s in ac.complete("ka")] == ["kai", "kāne", "kahakai", "kaʻi"]
+    assert [s.headword for s in ac.complete("KAʻI", n=5)] == ["kai", "kaʻi"]
+    assert [s.headword for s in ac.complete("kah")] == ["kahakai"]
+    assert ac.complete("kx") == []
+    assert ac.complete("zz") == []
+
+
+def test_one_letter_uses_top_list(tmp_path):
+    ac = _build(tmp_path)
+    assert [s.headword for s in ac.complete("k", n=2)] == ["kai", "kāne"]
+    assert ac.complete("a") == [Suggestion("a", "a.1", "", "", 0)]
+
+
+def test_rows_and_glosses(tmp_path):
+    ac = _build(tmp_path)
+    [kai] = ac.complete("kai", n=1)
+    assert kai == Suggestion("kai", "kai.1", "n.", "Sea, sea water.", 50)
+    [kai_okina] = [s for s in ac.complete("kai") if s.entry_id == "kaʻi.1"]
+    assert kai_okina.gloss.endswith("…") and len(kai_okina.gloss) <= 61
+    assert sorted(ac.chunk_counts) == ["a", "ka"]
+
+
+def test_exact_form_frequency(tmp_path):
+    entries = [Entry(id="kai.1", headword="kai"), Entry(id="kai.2", headword="kaʻi"),
+               Entry(id="kai.3", headword="kāī"), Entry(id="ke kai", headword="ke kai")]
+    corpus = RestorationBuilder()
+    corpus.add_headwords(entries)
+    corpus.add_text("Ke kai, ke kaʻi. Kai nui, kai.")
+    builder = AutocompleteBuilder(corpus.form_count)
+    builder.add_entries(entries)
+    builder.write(tmp_path)
+    # The phrase counts where "ke kai" occurs, not every "ke"
+    assert [(s.headword, s.frequency) for s in Autocomplete(tmp_path).complete("k")] == [
+        ("kai", 3), ("kaʻi", 1), ("ke kai", 1), ("kāī", 0)]
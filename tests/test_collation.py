@@ -0,0 +1,38 @@
+"""Tests for chd.collation module."""
+
+import bisect
+
+from chd.collation import collate, collation_key, prefix_bounds, primary_key, sort_key
+
+
+def test_hawaiian_order():
+    assert collate(["wai", "hale", "ulu", "akamai", "pali", "kai", "ele", "bipi", "lima"]) == [
+        "akamai", "ele", "ulu", "hale", "kai", "lima", "pali", "wai", "bipi",
+    ]
+    # Vowels before consonants at every position, not just the first
+    assert collate(["kha", "kua", "kaha"]) == ["kaha", "kua", "kha"]
+
+
+def test_diacritic_tie_breaks():
+    assert collate(["kaʻi", "kāī", "kai", "kaʻī"]) == ["kai", "kaʻi", "kaʻī", "kāī"]
+    assert collate(["ʻaʻa", "ʻā", "a", "ā", "aa"]) == ["a", "ā", "ʻā", "aa", "ʻaʻa"]
+    assert collate(["Kai", "kai"]) == ["kai", "Kai"]
+    assert collation_key("kai", "2") > collation_key("kai", "1") > collation_key("kai")
+    assert collation_key("kaʻi") == collation_key("ka‘i")
+
+
+def test_separators_ignored():
+    assert primary_key("Ka-lani") == primary_key("ka lani") == primary_key("kalani")
+    assert primary_key("café") == primary_key("cafe")
+
+
+def test_sort_key_hex_preserves_order():
+    words = ["ʻaʻa", "ā", "kai", "kāī", "kaʻi", "wai", "zebra", "a"]
+    assert sorted(words, key=sort_key) == sorted(words, key=collation_key)
+
+
+def test_prefix_bounds():
+    words = collate(["hale", "ka", "kai", "kaʻi", "kāhea", "kea", "kha", "lima"])
+    keys = [collation_key(w) for w in words]
+    lo, hi = prefix_bounds("ka")
+    assert words[bisect.bisect_left(keys, lo):bisect.bisect_left(keys, hi)] == ["ka", "kai", "kaʻi", "kāhea"]
@@ -0,0 +1,88 @@
+"""Tests for chd.parsers.concordance (streaming row parser)."""
+
+import pytest
+
+from chd.links import extract_word_tokens
+from chd.models import ConcordanceInstance
+from chd.parsers import concordance
+from chd.parsers.concordance import iter_concordance_page, parse_all_concordance, parse_concordance_page
+from chd.preprocess import parse_html
+
+
+def _soup_parse(filepath):
+    """The BeautifulSoup parser the streaming one replaced, as the reference output."""
+    soup = parse_html(filepath.read_bytes(), fix_p_tags=False)
+    instances = []
+    for table in soup.find_all("table"):
+        for tr in table.find_all("tr"):
+            tds = tr.find_all("td")
+            if len(tds) < 4 or tds[0].get("colspan"):
+                continue
+            inst = ConcordanceInstance()
+            fw_link = tds[0].find("a", class_="fw")
+            if fw_link:
+                inst.word = fw_link.get_text(strip=True)
+                href = fw_link.get("href", "") or ""
+                if "#" in href:
+                    inst.word_anchor = href.rsplit("#", 1)[1]
+            else:
+                inst.word = tds[0].get_text(strip=True)
+            inst.hawaiian_text = tds[1].get_text()
+            inst.word_tokens = extract_word_tokens(tds[1])
+            eng_span = tds[2].find("span", class_="EngEx")
+            inst.english_text = eng_span.get_text(strip=True) if eng_span else tds[2].get_text(strip=True)
+            xn_span = tds[2].find("span", class_="xn")
+            if xn_span:
+                inst.note = xn_span.get_text(strip=True).strip("[] ")
+            cf_link = tds[3].find("a", class_="cf")
+            if cf_link:
+                href = cf_link.get("href", "") or ""
+                if "#" in href:
+                    inst.parent_entry_page, inst.parent_entry_anchor = href.rsplit("#", 1)
+            if inst.word:
+                instances.append(inst)
+    return instances
+
+
+def test_parse_rows(fixtures_dir):
+    rows = parse_concordance_page(fixtures_dir / "concordance_page.html")
+    assert [r.word for r in rows] == ["aloha", "ʻai"]
+    first = rows[0]
+    assert first.word_anchor == "aloha"
+    assert first.hawaiian_text == "Aloha kākou."
+    assert [(t.surface, t.anchor) for t in first.word_tokens] == [("Aloha", "aloha"), ("kākou", "kakou")]
+    assert first.english_text == "Greetings to  all."
+    assert first.note == "common greeting"
+    assert (first.parent_entry_page, first.parent_entry_anchor) == ("haw-a.htm", "57179")
+    second = rows[1]
+    assert second.word_anchor == ""
+    assert second.english_text == "Eat the food."
+    assert second.parent_entry_anchor == ""
+
+
+def test_small_chunks_match(fixtures_dir, monkeypatch):
+    expected = parse_concordance_page(fixtures_dir / "concordance_page.html")
+    monkeypatch.setattr(concordance, "CHUNK_SIZE", 7)
+    assert list(iter_concordance_page(fixtures_dir / "concordance_page.html")) == expected
+
+
+def test_overflow_pages_merge_in_order(fixtures_dir, tmp_path):
+    page = (fixtures_dir / "concordance_page.html").read_bytes()
+    (tmp_path / "haw-conc-a.htm").write_bytes(page)
+    (tmp_path / "con-a-2.htm").write_bytes(page)
+    results = parse_all_concordance(tmp_path)
+    assert list(results) == ["a"]
+    assert [r.word for r in results["a"]] == ["aloha", "ʻai", "aloha", "ʻai"]
+
+
+@pytest.mark.parametrize("page", ["concordance_page.html", "concordance_nested.html"])
+@pytest.mark.parametrize("chunk_size", [7, 64 * 1024])
+def test_matches_soup_parser(fixtures_dir, monkeypatch, page, chunk_size):
+    monkeypatch.setattr(concordance, "CHUNK_SIZE", chunk_size)
+    assert list(iter_concordance_page(fixtures_dir / page)) == _soup_parse(fixtures_dir / page)
+
+
+def test_nested_table_order(fixtures_dir):
+    rows = parse_concordance_page(fixtures_dir / "concordance_nested.html")
+    # Nested rows follow their outer row, then repeat when the outer table closes; the stray row is skipped
+    assert [r.word for r in rows] == ["kai", "kaʻi", "kāne", "kaʻi", "kahakai"]
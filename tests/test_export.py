@@ -0,0 +1,17 @@
+"""Tests for chd.export helpers."""
+
+import json
+
+from chd.export import JsonArrayWriter, _write_json
+
+
+def test_json_array_writer_matches_write_json(tmp_path):
+    items = [{"word": "ʻā", "word_tokens": [{"surface": "a"}]}, {"word": "kau", "note": ""}]
+    for data in (items, items[:1], []):
+        writer = JsonArrayWriter(tmp_path / "streamed.json")
+        for item in data:
+            writer.write(item)
+        writer.close()
+        _write_json(data, tmp_path / "whole.json")
+        assert (tmp_path / "streamed.json").read_bytes() == (tmp_path / "whole.json").read_bytes()
+        assert json.loads((tmp_path / "streamed.json").read_text(encoding="utf-8")) == data
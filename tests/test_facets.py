@@ -0,0 +1,50 @@
+"""Tests for chd.facets module."""
+
+import pytest
+
+from chd.facets import FACETS_FILE, FacetIndex
+from chd.models import Entry, Sense
+
+
+@pytest.fixture
+def facets():
+    return FacetIndex.build([
+        Entry(id="a", in_pe=True, dialect="Niʻihau", topics=["plants"],
+              senses=[Sense(pos_english="noun", source_dict="PE")]),
+        Entry(id="b", in_pe=True, in_mk=True, topics=["plants", "fish"],
+              senses=[Sense(pos_english="verb", source_dict="PE"), Sense(pos_english="noun", source_dict="MK")]),
+        Entry(id="c", in_mk=True, is_loanword=True, senses=[Sense(pos_english="noun", source_dict="MK")]),
+        Entry(id="d", in_andrews=True, usage_register="archaic", senses=[Sense(source_dict="Andrews")]),
+    ])
+
+
+def test_and_or_not(facets):
+    assert facets.ids_of(facets.query({"in_pe": "true", "pos_english": "noun"})) == ["a", "b"]
+    assert facets.ids_of(facets.query({"source_dict": ["MK", "Andrews"]})) == ["b", "c", "d"]
+    assert facets.ids_of(facets.query({"pos_english": "noun"}, exclude={"topics": "plants"})) == ["c"]
+    assert facets.ids_of(facets.negate(facets.bitmap("in_pe"))) == ["c", "d"]
+    assert facets.ids_of(facets.query()) == ["a", "b", "c", "d"]
+    assert facets.query({"topics": "unknown"}) == 0
+
+
+def test_facet_counts(facets):
+    assert facets.facet_counts("pos_english") == {"noun": 3, "verb": 1}
+    plants = facets.query({"topics": "plants"})
+    assert facets.facet_counts("source_dict", within=plants) == {"MK": 1, "PE": 2}
+    assert facets.facet_counts("in_mk") == {"false": 2, "true": 2}
+    assert facets.count(plants) == 2
+    with pytest.raises(KeyError):
+        facets.facet_counts("colour")
+
+
+def test_save_load(tmp_path, facets):
+    facets.save(tmp_path / FACETS_FILE)
+    loaded = FacetIndex.load(tmp_path / FACETS_FILE)
+    assert loaded.ids == facets.ids
+    assert loaded.bitmaps == facets.bitmaps
+    assert loaded.ids_of(loaded.query({"dialect": "Niʻihau"})) == ["a"]
+
+
+def test_ids_of_spans_bytes():
+    facets = FacetIndex.build([Entry(id=str(i), in_pe=i % 7 == 0) for i in range(50)])
+    assert facets.ids_of(facets.bitmap("in_pe")) == [str(i) for i in range(0, 50, 7)]
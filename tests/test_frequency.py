@@ -0,0 +1,53 @@
+"""Tests for chd.frequency module."""
+
+import pytest
+
+from chd.frequency import ANCHOR, WORD, FrequencyBuilder, FrequencyTable
+from chd.models import ConcordanceInstance, Entry, Example, WordToken
+
+
+@pytest.fixture
+def table(tmp_path):
+    builder = FrequencyBuilder()
+    builder.add_examples([Entry(id="1", headword="kai", examples=[
+        Example(hawaiian_text="Ke kai, ke Kaʻi.", source_dict="PE",
+                word_tokens=[WordToken(surface="kai", anchor="kai.1"), WordToken(surface="kaʻi", anchor="kai.2")]),
+        Example(hawaiian_text="Ke kāī.", source_dict="MK"),
+    ])])
+    builder.add_concordance("k", 0, ConcordanceInstance(
+        hawaiian_text="Ke kai nui.", word_tokens=[WordToken(surface="kai", anchor="kai.1")]))
+    builder.write(tmp_path / "frequency.bin")
+    with FrequencyTable(tmp_path / "frequency.bin") as t:
+        yield t
+
+
+def test_word_counts(table):
+    assert table.word("kai") == 4
+    assert table.word("KAʻI", source="PE") == 2
+    assert table.word("kai", source="concordance") == 1
+    assert table.word("missing") == 0
+    assert table.counts(WORD, "ke")["MK"] == 1
+
+
+def test_bigrams(table):
+    assert table.word_bigram("ke", "kai") == 4
+    assert table.word_bigram("kai", "nui", source="concordance") == 1
+    assert table.word_bigram("nui", "kai") == 0
+    assert table.anchor_bigram("kai.1", "kai.2") == 1
+
+
+def test_anchor_counts(table):
+    assert table.anchor("kai.1") == 2
+    assert table.counts(ANCHOR, "kai.2") == {**dict.fromkeys(table.sources, 0), "PE": 1}
+
+
+def test_items_sorted(table):
+    keys = [k for k, _ in table.items()]
+    assert keys == sorted(keys, key=lambda k: k.encode("utf-8"))
+    assert len(keys) == len(table)
+
+
+def test_rejects_other_files(tmp_path):
+    (tmp_path / "bogus.bin").write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        FrequencyTable(tmp_path / "bogus.bin")
@@ -0,0 +1,50 @@
+"""Tests for chd.glosser module."""
+
+import json
+
+import pytest
+
+from chd.glosser import Glosser
+from chd.models import Entry
+
+
+@pytest.fixture
+def glosser():
+    return Glosser([
+        Entry(id="1", headword="ʻai", headword_ascii="ai"),
+        Entry(id="2", headword="ai", headword_ascii="ai"),
+        Entry(id="3", headword="ʻai kepakepa", headword_ascii="ai kepakepa"),
+        Entry(id="4", headword="kepakepa", headword_ascii="kepakepa"),
+        Entry(id="5", headword="ʻōlelo noʻeau", headword_ascii="olelo noeau", alt_spellings=["olelo no'eau"]),
+        Entry(id="6", headword="noʻeau", headword_ascii="noeau"),
+        Entry(id="", headword="orphan"),
+    ])
+
+
+def test_finds_overlapping_compounds(glosser):
+    text = "Ua ʻai kepakepa ʻo ia."
+    found = [(m.text, m.entry_ids) for m in glosser.find(text)]
+    assert found == [("ʻai kepakepa", ["3"]), ("ʻai", ["1", "2"]), ("kepakepa", ["4"])]
+
+
+def test_exact_diacritics_rank_first(glosser):
+    [match] = glosser.find("he ai")
+    assert match.entry_ids == ["2", "1"]
+    assert (match.start, match.end) == (3, 5)
+
+
+def test_longest_only(glosser):
+    text = "Kēia ʻŌlelo Noʻeau, a me ke ʻai kepakepa."
+    found = [(m.text, m.entry_ids) for m in glosser.find(text, longest=True)]
+    assert found == [("ʻŌlelo Noʻeau", ["5"]), ("ʻai kepakepa", ["3"])]
+
+
+def test_word_boundaries(glosser):
+    assert glosser.find("kaikepakepa aia") == []
+    assert glosser.find("orphan") == []
+
+
+def test_from_export(tmp_path):
+    (tmp_path / "haw_eng").mkdir()
+    (tmp_path / "haw_eng" / "a.json").write_text(json.dumps([{"id": "7", "headword": "aloha"}]))
+    assert [m.entry_ids for m in Glosser.from_export(tmp_path).find("Aloha nō")] == [["7"]]
@@ -0,0 +1,54 @@
+"""Tests for chd.graph module."""
+
+import pytest
+
+from chd.graph import EntryGraph
+from chd.models import CrossRef, EngHawEntry, EngHawTranslation, Entry, LinkedWord, Sense
+
+
+@pytest.fixture
+def graph():
+    entries = [
+        Entry(id="1", headword="kau", cross_refs=[CrossRef(ref_type="see", target_anchor="2")]),
+        Entry(id="2", headword="kaukau", cross_refs=[
+            CrossRef(ref_type="redup. of", target_headword="kau"),
+            CrossRef(ref_type="cf.", target_headword="missing"),
+        ]),
+        Entry(id="3", headword="ʻai", senses=[Sense(linked_words=[LinkedWord(surface="kaukau")])]),
+        Entry(id="4", headword="moe"),
+        Entry(id="5", headword="hiamoe"),
+    ]
+    eng = [EngHawEntry(english_word="sleep", translations=[
+        EngHawTranslation(hawaiian_word="moe"), EngHawTranslation(hawaiian_word="hiamoe", target_anchor="5")])]
+    return EntryGraph.build(entries, eng)
+
+
+def test_build(graph):
+    assert graph.nodes == ["1", "2", "3", "4", "5", "eng:sleep"]
+    assert graph.edge_count == 5
+    assert graph.edges("2") == [("1", "redup. of")]
+    assert sorted(graph.edges("2", direction="in")) == [("1", "see"), ("3", "linked_word")]
+
+
+def test_neighborhood(graph):
+    assert graph.neighborhood("1", k=1) == {"1": 0, "2": 1}
+    assert graph.neighborhood("1", k=2) == {"1": 0, "2": 1, "3": 2}
+    assert graph.neighborhood("3", k=2, direction="out") == {"3": 0, "2": 1, "1": 2}
+    assert graph.neighborhood("3", k=3, types=["linked_word"]) == {"3": 0, "2": 1}
+
+
+def test_shortest_path_and_components(graph):
+    assert graph.shortest_path("4", "5") == ["4", "eng:sleep", "5"]
+    assert graph.shortest_path("4", "5", direction="out") == []
+    assert graph.shortest_path("1", "4") == []
+    assert sorted(map(sorted, graph.components())) == [["1", "2", "3"], ["4", "5", "eng:sleep"]]
+    assert sorted(graph.components(types=["see"])[0]) == ["1", "2"]
+
+
+def test_save_load(graph, tmp_path):
+    graph.save(tmp_path)
+    loaded = EntryGraph.load(tmp_path)
+    assert loaded.nodes == graph.nodes
+    assert loaded.labels == graph.labels
+    assert loaded.edges("2", direction="both") == graph.edges("2", direction="both")
+    assert loaded.components() == graph.components()
@@ -0,0 +1,61 @@
+"""Tests for chd.kwic module."""
+
+import pytest
+
+from chd.kwic import PhraseIndex, PhraseIndexBuilder, Sentence, fold, tokenize
+from chd.models import ConcordanceInstance, Entry, Example
+
+
+@pytest.fixture
+def index(tmp_path):
+    builder = PhraseIndexBuilder(tmp_path)
+    builder.add_examples([Entry(id="1", examples=[
+        Example(hawaiian_text="Ua ʻai ka wahine i ka ʻai.", english_text="The woman ate the food."),
+        Example(hawaiian_text="Hele mai ʻoe i ka hale.", english_text="You come to the house."),
+    ])])
+    builder.add_concordance("h", 0, ConcordanceInstance(
+        word="hale", hawaiian_text="Aia ka hale nui ma kahakai.", english_text="The big house is at the beach."))
+    builder.write()
+    with PhraseIndex(tmp_path) as idx:
+        yield idx
+
+
+def test_fold_and_tokenize():
+    assert fold("‘Āina") == "aina"
+    assert tokenize("ʻO ka ʻāina.") == [("o", 0, 2), ("ka", 3, 5), ("aina", 6, 11)]
+
+
+def test_phrase_is_diacritic_insensitive(index):
+    hits = index.phrase("ka ai")
+    assert [(h.doc, h.start, h.end) for h in hits] == [(0, 5, 7)]
+    assert [h.doc for h in index.phrase("ka hale")] == [1, 2]
+    assert index.phrase("hale ka") == []
+    assert index.phrase("") == []
+
+
+def test_near(index):
+    assert [h.doc for h in index.near("ai", "wahine", within=2)] == [0]
+    assert index.near("wahine", "ai", within=2, ordered=True) == []
+    assert index.near("wahine", "ai", within=3, ordered=True) == [(0, 3, 7)]
+    assert index.near("hele", "hale", within=4) == []
+    assert [h.doc for h in index.near("hale", "hele", within=5)] == [1]
+
+
+def test_kwic(index):
+    [line] = index.kwic(index.phrase("hale nui"), width=2)
+    assert (line.left, line.match, line.right) == ("Aia ka", "hale nui", "ma kahakai")
+    assert line.sentence == Sentence("concordance", "h", 0, "Aia ka hale nui ma kahakai.",
+                                     "The big house is at the beach.")
+    [line] = index.kwic(index.phrase("ua"), width=0)
+    assert (line.left, line.match, line.right) == ("", "Ua", "")
+
+
+def test_sentences_stream_to_disk(tmp_path):
+    builder = PhraseIndexBuilder(tmp_path)
+    builder.add(Sentence("example", "1", 0, "Aloha ʻoe.", "Farewell to you."))
+    with pytest.raises((FileNotFoundError, ValueError)):
+        PhraseIndex(tmp_path)  # nothing readable until write()
+    builder.write()
+    with PhraseIndex(tmp_path) as idx:
+        assert len(idx) == len(builder) == 1
+        assert idx.sentence(0).english_text == "Farewell to you."
@@ -0,0 +1,53 @@
+"""Tests for chd.postings module."""
+
+import pytest
+
+from chd.postings import PostingsBuilder, PostingsIndex, decode_varint, encode_varint
+
+
+def test_varint_round_trip():
+    for value in (0, 1, 127, 128, 300, 2**32 + 5):
+        buf = bytearray()
+        encode_varint(value, buf)
+        assert decode_varint(buf, 0) == (value, len(buf))
+
+
+def test_build_and_lookup(tmp_path):
+    builder = PostingsBuilder()
+    for key, doc, pos in [("kau", 5, 2), ("ʻai", 1, 0), ("kau", 1, 3), ("kau", 5, 0), ("a", 900, 70)]:
+        builder.add(key, doc, pos)
+    builder.write(tmp_path / "p.bin")
+    with PostingsIndex(tmp_path / "p.bin") as index:
+        assert len(index) == 3
+        assert index.get("kau") == [(1, [3]), (5, [0, 2])]
+        assert index.get("ʻai") == [(1, [0])]
+        assert index.get("a") == [(900, [70])]
+        assert index.get("missing") == []
+        assert index.doc_count("kau") == 2
+        assert "kau" in index and "ka" not in index
+        assert list(index.keys()) == sorted(["kau", "ʻai", "a"], key=lambda k: k.encode())
+
+
+def test_key_range_and_prefix(tmp_path):
+    builder = PostingsBuilder()
+    for i, key in enumerate(["ka", "kai", "kaua", "ke", "la"]):
+        builder.add(key, i, 0)
+    builder.write(tmp_path / "p.bin")
+    with PostingsIndex(tmp_path / "p.bin") as index:
+        assert list(index.key_range("kai", "ke")) == ["kai", "kaua"]
+        assert list(index.key_range("kb")) == ["ke", "la"]
+        assert list(index.key_prefix("ka")) == ["ka", "kai", "kaua"]
+        assert list(index.key_prefix("m")) == []
+
+
+def test_empty_index(tmp_path):
+    PostingsBuilder().write(tmp_path / "p.bin")
+    with PostingsIndex(tmp_path / "p.bin") as index:
+        assert len(index) == 0
+        assert index.get("a") == []
+
+
+def test_rejects_other_files(tmp_path):
+    (tmp_path / "x.bin").write_bytes(b"not an index at all, nope" * 2)
+    with pytest.raises(ValueError):
+        PostingsIndex(tmp_path / "x.bin")
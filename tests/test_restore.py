@@ -0,0 +1,54 @@
+"""Tests for chd.restore module."""
+
+from chd.models import ConcordanceInstance, Entry, Example
+from chd.restore import RestorationBuilder, Restorer
+
+
+def _builder():
+    builder = RestorationBuilder()
+    builder.add_headwords([
+        Entry(id="kai.1", headword="kai", headword_ascii="kai"),
+        Entry(id="kai.2", headword="kaʻi", headword_ascii="kai"),
+        Entry(id="kai.3", headword="kāī", headword_ascii="kai"),
+        Entry(id="aloha", headword="aloha", headword_ascii="aloha"),
+        Entry(id="olelo", headword="ʻōlelo noʻeau", headword_ascii="olelo noeau"),
+    ])
+    builder.add_examples([
+        Entry(id="x", headword="x", examples=[Example(hawaiian_text="Ua ʻauʻau mākou i ke kai. Kai!")]),
+    ])
+    builder.add_concordance("k", 0, ConcordanceInstance(hawaiian_text="Ka'i aʻela ʻo ia."))
+    return builder
+
+
+def test_candidates_ranked_by_frequency():
+    restorer = Restorer.from_builder(_builder())
+    assert restorer.candidates("kai") == [("kai", 2), ("kaʻi", 1), ("kāī", 0)]
+    assert restorer.candidates("KAʻI", n=1) == [("kai", 2)]
+    assert restorer.candidates("noeau") == [("noʻeau", 0)]
+    assert restorer.candidates("xyz") == []
+
+
+def test_form_count_is_exact():
+    builder = _builder()
+    builder.add_text("He ʻōlelo noʻeau kēia. ʻŌlelo mai, noʻeau.")
+    assert builder.form_count("Kai") == 2
+    assert builder.form_count("kaʻi") == 1
+    assert builder.form_count("kāī") == 0
+    assert builder.form_count("ʻŌlelo noʻeau") == 1
+    assert builder.form_count("ʻōlelo") == 2
+    # Not a headword: bounded by its rarest word
+    assert builder.form_count("ke kai") == 1
+
+
+def test_restore_text():
+    restorer = Restorer.from_builder(_builder())
+    assert restorer.restore("Olelo noeau, aloha!") == "ʻŌlelo noʻeau, aloha!"
+    assert restorer.restore("OLELO unknown") == "ʻŌLELO unknown"
+    assert restorer.restore_many(["kai", ""]) == ["kai", ""]
+
+
+def test_write_and_load(tmp_path):
+    _builder().write(tmp_path)
+    restorer = Restorer.load(tmp_path)
+    assert len(restorer) == 4
+    assert restorer.restore("olelo") == "ʻōlelo"
@@ -0,0 +1,52 @@
+"""Tests for chd.reverse module."""
+
+import pytest
+
+from chd.models import EngHawEntry, EngHawTranslation, Entry, Sense, SubDefinition
+from chd.reverse import ReverseIndex, ReverseIndexBuilder, terms
+from chd.validate import LinkResolver
+
+
+@pytest.fixture
+def index(tmp_path):
+    entries = [
+        Entry(id="kai.1", headword="kai", senses=[Sense(text="Sea, sea water; area near the sea.")]),
+        Entry(id="moana", headword="moana", senses=[Sense(text="Ocean, open sea.")]),
+        Entry(id="wai", headword="wai", senses=[Sense(
+            text="Fresh water.", sub_definitions=[SubDefinition(text="Fresh water."), SubDefinition(text="Liquid")])]),
+        Entry(id="hale", headword="hale", senses=[Sense(text="House, building.")]),
+    ]
+    eng = [
+        EngHawEntry(english_word="ocean", translations=[EngHawTranslation(hawaiian_word="kai", target_anchor="kai.1"),
+                                                        EngHawTranslation(hawaiian_word="moana")]),
+        EngHawEntry(english_word="water", translations=[EngHawTranslation(hawaiian_word="wai", target_anchor="wai")]),
+    ]
+    builder = ReverseIndexBuilder()
+    builder.add_entries(entries)
+    builder.add_translations(eng, LinkResolver(entries))
+    builder.write(tmp_path)
+    with ReverseIndex(tmp_path) as idx:
+        yield idx
+
+
+def test_terms_drop_stopwords_and_fold():
+    assert terms("The Sea of Kāne") == ["sea", "kane"]
+
+
+def test_definition_hits_ranked(index):
+    hits = index.search("sea")
+    assert [h.entry_id for h in hits] == ["kai.1", "moana"]
+    assert hits[0].score > hits[1].score
+
+
+def test_translations_boost(index):
+    assert [h.entry_id for h in index.search("water")] == ["wai", "kai.1"]
+    assert [h.entry_id for h in index.search("ocean")][0] == "moana"
+    assert index.search("liquid")[0].headword == "wai"
+
+
+def test_multi_term_and_misses(index):
+    assert index.search("house building")[0].entry_id == "hale"
+    assert index.search("the") == []
+    assert index.search("zebra") == []
+    assert len(index.search("sea water ocean", n=2)) == 2
@@ -0,0 +1,57 @@
+"""Tests for chd.rhyme module."""
+
+import pytest
+
+from chd.models import Entry
+from chd.rhyme import RHYME_FILE, RhymeIndex, letters, syllables
+
+
+@pytest.fixture
+def index():
+    return RhymeIndex.build([
+        Entry(id="kai", headword="kai"),
+        Entry(id="kahakai", headword="kahakai"),
+        Entry(id="kāī", headword="kāī"),
+        Entry(id="kaʻi", headword="kaʻi"),
+        Entry(id="aina", headword="ʻāina"),
+        Entry(id="kina", headword="kina"),
+        Entry(id="haina", headword="haʻina"),
+        Entry(id="laina", headword="laina"),
+        Entry(id="lani", headword="lani"),
+        Entry(id="kalani", headword="Ka-lani"),
+        Entry(id="", headword="no id"),
+    ])
+
+
+def test_letters_and_syllables():
+    assert letters("Ka-lani 2") == "kalani"
+    assert letters("ʻĀina", ascii=True) == "aina"
+    assert syllables("ʻāina") == ["ʻā", "i", "na"]
+    assert syllables("kalapu") == ["ka", "la", "pu"]
+    assert syllables("kēmu") == ["kē", "mu"]
+    assert syllables("pp") == ["pp"]
+
+
+def test_ends_with(index):
+    assert sorted(h for _, h in index.ends_with("kai")) == ["kahakai", "kai"]
+    assert sorted(h for _, h in index.ends_with("kai", ascii=True)) == ["kahakai", "kai", "kaʻi", "kāī"]
+    assert [h for _, h in index.ends_with("lani")] == ["lani", "Ka-lani"]
+    assert index.ends_with("xyz") == []
+    assert index.ends_with("") == []
+    assert len(index.ends_with("i", limit=2)) == 2
+
+
+def test_rhymes(index):
+    # ʻā-i-na: -i-na needs a vowel before it, so ki-na and ha-ʻi-na don't count
+    assert index.rhymes("ʻāina") == [("laina", "laina")]
+    assert sorted(h for _, h in index.rhymes("ʻāina", ascii=True)) == ["haʻina", "laina"]
+    assert [h for _, h in index.rhymes("lani", n=2)] == ["Ka-lani"]
+    assert sorted(h for _, h in index.rhymes("kahakai", n=1)) == ["kai"]
+    assert sorted(h for _, h in index.rhymes("kai", ascii=True)) == ["kahakai", "kaʻi", "kāī"]
+
+
+def test_save_load(tmp_path, index):
+    index.save(tmp_path / RHYME_FILE)
+    loaded = RhymeIndex.load(tmp_path / RHYME_FILE)
+    assert len(loaded) == len(index) == 10
+    assert loaded.rhymes("ʻāina") == index.rhymes("ʻāina")
@@ -0,0 +1,69 @@
+"""Tests for chd.secondary module."""
+
+import pytest
+
+from chd.models import Entry, Etymology, Example, SourceRef
+from chd.secondary import SecondaryIndex, SecondaryIndexBuilder, SecondaryIndexes, normalize_citation
+
+
+def _entries():
+    return [
+        Entry(id="1", headword="kai", dialect="Niʻihau",
+              etymology=Etymology(proto_form="*tahi", proto_language="PPN"),
+              examples=[Example(source_ref=SourceRef(type="ON", id="1681")),
+                        Example(source_ref=SourceRef(type="BIBLE", id="3:7"), bible_ref="Hal. 3:7")]),
+        Entry(id="2", headword="pipi", is_loanword=True, loan_language="Eng.",
+              etymology=Etymology(proto_form="*pipi", proto_language="PEP"),
+              examples=[Example(source_ref=SourceRef(type="ON", id="200")),
+                        Example(bible_ref="Hal. 3:10")]),
+        Entry(id="3", headword="kahi", dialect="Ni‘ihau", etymology=Etymology(proto_form="*tasi", proto_language="PPN")),
+        Entry(id="4", headword="kaona"),
+    ]
+
+
+@pytest.fixture
+def index(tmp_path):
+    builder = SecondaryIndexBuilder()
+    builder.add_entries(_entries())
+    builder.write(tmp_path)
+    with SecondaryIndexes(tmp_path) as index:
+        yield index
+
+
+def test_normalize_citation():
+    assert normalize_citation("Hal.  3:7") == "hal. 000003:000007"
+    assert normalize_citation("ON 200") < normalize_citation("ON 1681")
+
+
+def test_entry_lookups(index):
+    assert index.get("dialect", "Niʻihau") == ["1", "3"]
+    assert index.get("dialect", "niʻihau") == ["1", "3"]
+    assert index.get("loan_language", "Eng.") == ["2"]
+    assert index.get("proto_form", "PPN *tahi") == ["1"]
+    assert index.prefix("proto_form", "PPN") == {"ppn *tahi": ["1"], "ppn *tasi": ["3"]}
+    assert index.get("dialect", "Maui") == []
+
+
+def test_example_lookups(index):
+    assert index.get("source_ref", "ON 1681") == ["1#0"]
+    assert list(index.range("source_ref", "ON 1", "ON 1000")) == ["on 000200"]
+    assert index.range("bible_ref", "Hal. 3:1", "Hal. 3:9") == {"hal. 000003:000007": ["1#1"]}
+    assert list(index.prefix("bible_ref", "hal. 3:")) == ["hal. 000003:000007", "hal. 000003:000010"]
+    assert "bible 000003:000007" not in list(index.keys("source_ref"))
+
+
+def test_unknown_index(index):
+    with pytest.raises(KeyError):
+        index.get("nope", "x")
+
+
+def test_custom_indexes(tmp_path):
+    heads = SecondaryIndex("headword", "entry", lambda e: [e.headword])
+    builder = SecondaryIndexBuilder([heads])
+    builder.add_entries(_entries())
+    builder.write(tmp_path)
+    with SecondaryIndexes(tmp_path, [heads]) as index:
+        assert list(index.range("headword", "kah", "kz")) == ["kahi", "kai", "kaona"]
+        assert index.targets == {"headword": "entry"}
+    with pytest.raises(ValueError):
+        SecondaryIndexBuilder([SecondaryIndex("x", "sense", lambda s: [])])
@@ -0,0 +1,285 @@
+"""Tests for chd.seed module (REST calls are faked)."""
+
+import json
+import re
+import threading
+from pathlib import Path
+
+import pytest
+
+from chd import seed
+from chd.kwic import fold
+from chd.seed import SupabaseSeeder
+
+MIGRATIONS = Path(__file__).resolve().parent.parent / "supabase" / "migrations"
+
+
+class FakeResponse:
+    def __init__(self, status_code=201, payload=None, headers=None):
+        self.status_code = status_code
+        self._payload = payload if payload is not None else []
+        self.headers = headers or {}
+        self.text = json.dumps(self._payload)
+
+    def json(self):
+        return self._payload
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Record every POST and answer topic upserts with generated IDs."""
+    recorded = []
+
+    def fake_post(url, headers=None, params=None, json=None):
+        table = url.rsplit("/", 1)[-1]
+        recorded.append({"table": table, "headers": headers, "params": params, "rows": json})
+        if table == "topic":
+            return FakeResponse(payload=[{"id": i + 1, **r} for i, r in enumerate(json)])
+        return FakeResponse()
+
+    monkeypatch.setattr(seed.requests, "post", fake_post)
+    return recorded
+
+
+def _write_entries(data_dir, entries):
+    haw_dir = data_dir / "haw_eng"
+    haw_dir.mkdir(parents=True)
+    (haw_dir / "a.json").write_text(json.dumps(entries), encoding="utf-8")
+
+
+def test_seed_topics_single_upsert(tmp_path, calls):
+    _write_entries(tmp_path, [
+        {"id": "1", "topics": ["fish", "birds"]},
+        {"id": "2", "topics": ["fish", "fish"]},
+        {"id": "", "topics": ["plants"]},
+    ])
+    n = SupabaseSeeder("http://x", "k").seed_topics(tmp_path)
+    assert n == 2
+    topic_calls = [c for c in calls if c["table"] == "topic"]
+    assert len(topic_calls) == 1
+    assert topic_calls[0]["params"] == {"on_conflict": "name"}
+    rows = [r for c in calls if c["table"] == "entry_topic" for r in c["rows"]]
+    assert sorted((r["entry_id"], r["topic_id"]) for r in rows) == [("1", 1), ("1", 2), ("2", 2)]
+
+
+def test_post_parallel_batches(monkeypatch, calls):
+    monkeypatch.setattr(seed, "BATCH", 2)
+    rows = [{"n": i} for i in range(7)]
+    assert SupabaseSeeder("http://x", "k")._post("t", rows, workers=3) == 7
+    assert sorted(r["n"] for c in calls for r in c["rows"]) == list(range(7))
+
+
+def test_parallel_commit_counts_only_its_batch(tmp_path, monkeypatch):
+    monkeypatch.setattr(seed, "BATCH", 2)
+    counted = threading.Event()
+
+    def fake_post(url, headers=None, params=None, json=None):
+        if json[0]["n"] == 0:
+            counted.wait(5)  # batch 1 is sent and counted before batch 0 commits
+        return FakeResponse()
+
+    monkeypatch.setattr(seed.requests, "post", fake_post)
+    checkpoint = seed.Checkpoint(path=tmp_path / seed.CHECKPOINT_FILE)
+    commit = checkpoint.commit
+
+    def killed_before_commit(step, batch_num, counts):
+        if batch_num == 1:
+            counted.set()
+            raise KeyboardInterrupt
+        commit(step, batch_num, counts)
+
+    monkeypatch.setattr(checkpoint, "commit", killed_before_commit)
+    with pytest.raises(KeyboardInterrupt):
+        SupabaseSeeder("http://x", "k", checkpoint)._post("t", [{"n": i} for i in range(4)], workers=2, step="t")
+    saved = seed.Checkpoint.load(checkpoint.path)
+    assert saved.done == {"t": {0}}
+    assert saved.expected == {"t": 2}
+
+
+def test_verify_counts_reports_mismatches(monkeypatch, calls):
+    counts = {"entry": 10, "sense": 7}
+
+    def fake_head(url, headers=None):
+        table = url.rsplit("/", 1)[-1].split("?")[0]
+        assert headers["Prefer"] == "count=planned"
+        return FakeResponse(200, headers={"content-range": f"*/{counts.get(table, 0)}"})
+
+    monkeypatch.setattr(seed.requests, "head", fake_head)
+    seeder = SupabaseSeeder("http://x", "k")
+    seeder._post("entry", [{"id": str(i)} for i in range(10)])
+    seeder.expected["sense"] = 9
+    report = seeder.verify_counts("planned")
+    assert report["entry"] == {"count": 10, "expected": 10, "ok": True}
+    assert not report["sense"]["ok"]
+    assert report["topic"]["expected"] is None
+
+
+def test_verify_counts_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        SupabaseSeeder("http://x", "k").verify_counts("fuzzy")
+
+
+def test_resume_skips_committed_batches_and_rolls_back(tmp_path, monkeypatch):
+    monkeypatch.setattr(seed, "BATCH", 2)
+    _write_entries(tmp_path, [
+        {"id": str(i), "senses": [{"sense_num": 1, "sub_definitions": [{"text": "x"}]}]}
+        for i in range(5)
+    ])
+    next_id = iter(range(1, 1000))
+    posted, deleted = [], []
+    fail = {"sub_definition": 2}  # fail the second sub_definition insert
+
+    def fake_post(url, headers=None, params=None, json=None):
+        table = url.rsplit("/", 1)[-1]
+        posted.append((table, len(json)))
+        if table == "sub_definition":
+            fail[table] -= 1
+            if fail[table] == 0:
+                return FakeResponse(500, payload={"message": "boom"})
+        return FakeResponse(payload=[{"id": next(next_id)} for _ in json])
+
+    def fake_delete(url, headers=None, params=None):
+        deleted.append((url.rsplit("/", 1)[-1], params["id"]))
+        return FakeResponse(204)
+
+    monkeypatch.setattr(seed.requests, "post", fake_post)
+    monkeypatch.setattr(seed.requests, "delete", fake_delete)
+    path = tmp_path / seed.CHECKPOINT_FILE
+
+    with pytest.raises(seed.SeedError):
+        SupabaseSeeder("http://x", "k", seed.Checkpoint(path=path)).seed_senses(tmp_path)
+    checkpoint = seed.Checkpoint.load(path)
+    assert checkpoint.done == {"sense:a": {0}}
+    assert list(checkpoint.pending) == ["sense"]
+    assert checkpoint.expected["sense"] == 2
+
+    posted.clear()
+    seeder = SupabaseSeeder("http://x", "k", checkpoint)
+    seeder.rollback_pending()
+    assert deleted == [("sense", "in.(5,6)")]
+    seeder.seed_senses(tmp_path)
+    assert [n for t, n in posted if t == "sense"] == [2, 1]
+    assert seeder.expected["sense"] == 5
+    assert seed.Checkpoint.load(path).done["sense:a"] == {0, 1, 2}
+
+
+def test_entry_document_rows(tmp_path):
+    _write_entries(tmp_path, [
+        {"id": "1", "headword": "kai", "senses": [{"text": "Sea."}]},
+        {"id": "1", "headword": "kai (dup)"},
+        {"id": "", "headword": "none"},
+        {"id": "2", "headword": "pali"},
+    ])
+    rows = seed.entry_document_rows(tmp_path)
+    assert [r["id"] for r in rows] == ["1", "2"]
+    assert rows[0]["document"] == {"id": "1", "headword": "kai", "senses": [{"text": "Sea."}]}
+    assert len(rows[0]["content_hash"]) == 16
+
+
+def test_entry_documents_delta_sync(tmp_path, monkeypatch, calls):
+    _write_entries(tmp_path, [{"id": "1", "headword": "kai"}, {"id": "2", "headword": "pali"}])
+    hashes = {r["id"]: r["content_hash"] for r in seed.entry_document_rows(tmp_path)}
+    database = {"1": hashes["1"], "2": "outdated", "3": "gone"}
+    deleted = []
+
+    def fake_get(url, headers=None, params=None):
+        rows = [{"id": k, "content_hash": v} for k, v in sorted(database.items())]
+        return FakeResponse(200, payload=rows[params["offset"]:params["offset"] + params["limit"]])
+
+    def fake_delete(url, headers=None, params=None):
+        deleted.append(params["id"])
+        return FakeResponse(204)
+
+    monkeypatch.setattr(seed.requests, "get", fake_get)
+    monkeypatch.setattr(seed.requests, "delete", fake_delete)
+    monkeypatch.setattr(seed, "BATCH", 2)
+    assert SupabaseSeeder("http://x", "k").seed_entry_documents(tmp_path, delta=True) == 2
+    assert [r["id"] for c in calls for r in c["rows"]] == ["2"]
+    assert "merge-duplicates" in calls[0]["headers"]["Prefer"]
+    assert deleted == ['in.("3")']
+
+
+def test_entry_documents_delta_resumes_from_checkpoint(tmp_path, monkeypatch):
+    _write_entries(tmp_path, [{"id": str(i), "headword": f"w{i}"} for i in range(5)])
+    monkeypatch.setattr(seed, "BATCH", 2)
+    monkeypatch.setattr(seed, "get_config", lambda: ("http://x", "k"))
+    monkeypatch.setattr(SupabaseSeeder, "document_hashes", lambda self: {})
+    sent, fail = [], {"at": 2}
+
+    def fake_post(url, headers=None, params=None, json=None):
+        fail["at"] -= 1
+        if fail["at"] == 0:
+            return FakeResponse(500, {"message": "boom"})
+        sent.extend(r["id"] for r in json)
+        return FakeResponse()
+
+    monkeypatch.setattr(seed.requests, "post", fake_post)
+    with pytest.raises(seed.SeedError):
+        seed.sync_documents(tmp_path)
+    assert sent == ["0", "1"]
+    assert seed.Checkpoint.load(tmp_path / seed.DOCUMENTS_CHECKPOINT_FILE).done == {"entry_document:delta": {0}}
+
+    assert seed.sync_documents(tmp_path) == 5
+    assert sent == ["0", "1", "2", "3", "4"]
+    assert not (tmp_path / seed.DOCUMENTS_CHECKPOINT_FILE).exists()
+
+
+def test_rpc_raises_seed_error(monkeypatch):
+    monkeypatch.setattr(seed.requests, "post", lambda url, headers=None, json=None: FakeResponse(404, {"message": "no"}))
+    with pytest.raises(seed.SeedError, match="chd_create_trgm_indexes"):
+        SupabaseSeeder("http://x", "k").rpc("chd_create_trgm_indexes")
+
+
+def test_sql_fold_matches_kwic_fold():
+    sql = (MIGRATIONS / "20261019150000_trigram_search.sql").read_text(encoding="utf-8")
+    src, dst = re.search(r"translate\(t, '((?:[^']|'')*)', '([^']*)'\)", sql).groups()
+    src = src.replace("''", "'")
+    table = str.maketrans(src[:len(dst)], dst, src[len(dst):])
+    for word in ["ʻĀina", "Kahakō", "ka‘i", "Hawai`i", "O'ahu", "pōʻalima"]:
+        assert word.translate(table).lower() == fold(word)
+
+
+def test_seed_all_rebuilds_trgm_indexes_after_failure(tmp_path, monkeypatch):
+    rpcs = []
+    monkeypatch.setattr(seed, "get_config", lambda: ("http://x", "k"))
+    monkeypatch.setattr(SupabaseSeeder, "truncate_all", lambda self: None)
+    monkeypatch.setattr(SupabaseSeeder, "rpc", lambda self, function, args=None: rpcs.append(function))
+
+    def fail(self, data_dir):
+        raise seed.SeedError("boom")
+
+    monkeypatch.setattr(SupabaseSeeder, "seed_entries", fail)
+    with pytest.raises(seed.SeedError, match="boom"):
+        seed.seed_all(tmp_path)
+    assert rpcs == ["chd_drop_trgm_indexes", "chd_create_trgm_indexes"]
+
+
+def test_trgm_index_functions_run_as_owner():
+    sql = (MIGRATIONS / "20261019150000_trigram_search.sql").read_text(encoding="utf-8")
+    for name in ("chd_create_trgm_indexes", "chd_drop_trgm_indexes"):
+        header = sql.split(f"FUNCTION {name}() RETURNS void", 1)[1].split("AS $$", 1)[0]
+        assert "SECURITY DEFINER" in header and "SET search_path = public, extensions" in header
+
+
+def test_rpc_reports_missing_function(monkeypatch):
+    monkeypatch.setattr(seed.requests, "post", lambda url, headers=None, json=None: FakeResponse(404, {"code": "PGRST202"}))
+    with pytest.raises(seed.SeedError, match="chd_drop_trgm_indexes not found; apply the migrations"):
+        SupabaseSeeder("http://x", "k").rpc("chd_drop_trgm_indexes")
+
+
+def test_seed_all_keeps_step_error_when_rebuild_fails(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(seed, "get_config", lambda: ("http://x", "k"))
+    monkeypatch.setattr(SupabaseSeeder, "truncate_all", lambda self: None)
+
+    def rpc(self, function, args=None):
+        if function == "chd_create_trgm_indexes":
+            raise seed.SeedError("rebuild failed")
+
+    def fail(self, data_dir):
+        raise seed.SeedError("boom")
+
+    monkeypatch.setattr(SupabaseSeeder, "rpc", rpc)
+    monkeypatch.setattr(SupabaseSeeder, "seed_entries", fail)
+    with pytest.raises(seed.SeedError, match="boom"):
+        seed.seed_all(tmp_path)
+    assert "ERROR rebuilding trigram indexes: rebuild failed" in capsys.readouterr().out
@@ -0,0 +1,158 @@
+"""Tests for chd.serve module."""
+
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from chd.facets import FACETS_FILE, FacetIndex
+from chd.kwic import PhraseIndexBuilder
+from chd.models import EngHawEntry, EngHawTranslation, Entry, Example, Sense, WordToken
+from chd.reverse import ReverseIndexBuilder
+from chd.serve import DictionaryAPI, HTTPError, Server
+from chd.store import write_store
+from chd.validate import LinkResolver
+from chd.word_index import WordIndexBuilder
+
+ENTRIES = [
+    Entry(id="kai.1", headword="kai", topics=["ocean"], senses=[Sense(text="Sea, sea water.")],
+          examples=[Example(hawaiian_text="Ua hele au i ke kai.", english_text="I went to the sea.",
+                            word_tokens=[WordToken(surface="kai", anchor="kai.1")])]),
+    Entry(id="kaʻi.1", headword="kaʻi", senses=[Sense(text="To lead.")]),
+    Entry(id="kahakai", headword="kahakai", topics=["ocean"], senses=[Sense(text="Beach, seashore. " * 40)]),
+    Entry(id="wai", headword="wai", senses=[Sense(text="Fresh water.")]),
+]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    write_store(ENTRIES, tmp_path / "store")
+    index_dir = tmp_path / "index"
+    phrases = PhraseIndexBuilder(index_dir)
+    phrases.add_examples(ENTRIES)
+    phrases.write()
+    words = WordIndexBuilder()
+    words.add_examples(ENTRIES)
+    words.write(index_dir)
+    reverse = ReverseIndexBuilder()
+    reverse.add_entries(ENTRIES)
+    reverse.add_translations([EngHawEntry(english_word="lead", translations=[EngHawTranslation(hawaiian_word="kaʻi")])],
+                             LinkResolver(ENTRIES))
+    reverse.write(index_dir)
+    FacetIndex.build(ENTRIES).save(index_dir / FACETS_FILE)
+    return tmp_path
+
+
+@pytest.fixture
+def api(data_dir):
+    api = DictionaryAPI(data_dir)
+    yield api
+    api.close()
+
+
+def test_entry_and_prefix(api):
+    assert json.loads(api.handle("/entry/ka%CA%BBi.1", {}))["headword"] == "kaʻi"
+    assert [r["id"] for r in api.handle("/prefix", {"q": "KA"})] == ["kahakai", "kai.1", "kaʻi.1"]
+    assert [r["id"] for r in api.handle("/prefix", {"q": "kai", "limit": "1"})] == ["kai.1"]
+    with pytest.raises(HTTPError) as exc:
+        api.handle("/entry/missing", {})
+    assert exc.value.status == 404
+
+
+def test_search(api):
+    result = api.handle("/search", {"q": "kai"})
+    assert [r["id"] for r in result["headwords"]] == ["kai.1", "kaʻi.1"]
+    assert api.handle("/search", {"q": "lead"})["english"][0]["entry_id"] == "kaʻi.1"
+
+
+def test_concordance_and_topics(api):
+    [line] = api.handle("/concordance", {"word": "ke kai"})
+    assert (line["match"], line["source"]["key"]) == ("ke kai", "kai.1")
+    assert api.handle("/concordance", {"anchor": "kai.1"})[0]["key"] == "kai.1"
+    assert api.handle("/topics", {}) == {"ocean": 2}
+    assert api.handle("/topic/ocean", {})["count"] == 2
+
+
+def test_errors(api):
+    for path, params, status in [("/nope", {}, 404), ("/prefix", {}, 400), ("/prefix", {"q": "a", "limit": "x"}, 400)]:
+        with pytest.raises(HTTPError) as exc:
+            api.handle(path, params)
+        assert exc.value.status == status
+
+
+def test_missing_indexes(tmp_path):
+    api = DictionaryAPI(tmp_path)
+    with pytest.raises(HTTPError) as exc:
+        api.handle("/concordance", {"word": "kai"})
+    assert exc.value.status == 503
+    assert api.handle("/search", {"q": "kai"}) == {"headwords": [], "english": []}
+
+
+def test_corrupt_index_disables_endpoint(data_dir):
+    (data_dir / "index" / FACETS_FILE).write_text("{not json", encoding="utf-8")
+    api = DictionaryAPI(data_dir)
+    try:
+        assert api.facets is None
+        with pytest.raises(HTTPError) as exc:
+            api.handle("/topics", {})
+        assert exc.value.status == 503
+        assert api.handle("/prefix", {"q": "wai"}) == [{"id": "wai", "headword": "wai"}]
+    finally:
+        api.close()
+
+
+def test_unexpected_error_is_uncached_500(api, monkeypatch):
+    server = Server(api)
+
+    def broken(path, params):
+        raise KeyError("boom")
+
+    monkeypatch.setattr(api, "handle", broken)
+    status, body, _ = server.respond("/search?q=kai")
+    assert status == 500 and json.loads(body) == {"error": "Internal server error"}
+    assert server.cache.stats()["entries"] == 0
+
+
+async def _request(port: int, requests: list[bytes]) -> list[tuple[str, dict, bytes]]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    responses = []
+    for request in requests:
+        writer.write(request)
+        await writer.drain()
+        head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        headers = {k.lower(): v for k, _, v in (line.partition(": ") for line in head[1:] if line)}
+        body = b"" if request.startswith(b"HEAD") else await reader.readexactly(int(headers["content-length"]))
+        responses.append((head[0], headers, body))
+    writer.close()
+    return responses
+
+
+def test_http_keep_alive_gzip_and_cache(data_dir):
+    async def run():
+        api = DictionaryAPI(data_dir)
+        server = Server(api)
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            return server, await _request(port, [
+                b"GET /entry/kahakai HTTP/1.1\r\nHost: x\r\nAccept-Encoding: gzip\r\n\r\n",
+                b"GET /entry/kahakai HTTP/1.1\r\nHost: x\r\n\r\n",
+                b"HEAD /prefix?q=ka HTTP/1.1\r\nHost: x\r\n\r\n",
+                b"POST /entry/kai.1 HTTP/1.1\r\nHost: x\r\nContent-Length: 2\r\n\r\n{}",
+                b"GET /stats HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n",
+            ])
+        finally:
+            listener.close()
+            await listener.wait_closed()
+            api.close()
+
+    server, responses = asyncio.run(run())
+    (s1, h1, b1), (s2, h2, b2), (s3, h3, b3), (s4, _, _), (s5, h5, b5) = responses
+    assert s1 == "HTTP/1.1 200 OK" and h1["content-encoding"] == "gzip"
+    assert json.loads(gzip.decompress(b1)) == json.loads(b2)
+    assert "content-encoding" not in h2 and h2["connection"] == "keep-alive"
+    assert b3 == b"" and int(h3["content-length"]) > 0
+    assert s4.startswith("HTTP/1.1 405")
+    assert h5["connection"] == "close"
+    assert json.loads(b5)["response_cache"]["hits"] == 1
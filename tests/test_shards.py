@@ -0,0 +1,99 @@
+"""Tests for chd.shards module."""
+
+import gzip
+import json
+
+from chd.models import CrossRef, Entry, Sense
+from chd.parsers.structural import parse_combo_anchors
+from chd.shards import MANIFEST_FILE, PAGE_SIZE, assign_prefix, etag, load_combos, write_shards
+
+COMBOS = {"k": ["ka", "ke", "ki"]}
+
+
+def _entries():
+    entries = [
+        Entry(id="kai.1", headword="kai", letter_page="k", senses=[Sense(text="Sea.", pos_english="noun")]),
+        Entry(id="kaʻi.1", headword="kaʻi", letter_page="k",
+              cross_refs=[CrossRef(ref_type="cf.", target_anchor="kai.1")]),
+        Entry(id="kē.1", headword="kē", letter_page="k"),
+    ]
+    entries += [Entry(id=f"kiki.{i}", headword=f"kiki{i}", letter_page="k") for i in range(PAGE_SIZE + 1)]
+    return entries
+
+
+def test_assign_prefix():
+    assert assign_prefix("ʻĀina", ["aa", "ai", "ao"]) == "ai"
+    assert assign_prefix("kāhea", COMBOS["k"]) == "ka"
+    assert assign_prefix("kzz", COMBOS["k"]) == "ki"
+    assert assign_prefix("ʻa", []) == "a"
+
+
+def test_entry_shards(tmp_path):
+    write_shards(_entries(), tmp_path, COMBOS)
+    doc = json.loads((tmp_path / "entry" / "kaʻi.1.json").read_bytes())
+    assert doc["related"] == [{"id": "kai.1", "headword": "kai", "type": "cf."}]
+    raw = (tmp_path / "entry" / "kai.1.json").read_bytes()
+    assert gzip.decompress((tmp_path / "entry" / "kai.1.json.gz").read_bytes()) == raw
+    manifest = json.loads((tmp_path / MANIFEST_FILE).read_text())
+    assert manifest["entry/kai.1.json"] == {"etag": etag(raw), "bytes": len(raw)}
+
+
+def test_browse_shards(tmp_path):
+    write_shards(_entries(), tmp_path, COMBOS)
+    index = json.loads((tmp_path / "browse" / "k" / "index.json").read_text())
+    assert index["prefixes"] == [
+        {"prefix": "ka", "entries": 2, "pages": 1},
+        {"prefix": "ke", "entries": 1, "pages": 1},
+        {"prefix": "ki", "entries": PAGE_SIZE + 1, "pages": 2},
+    ]
+    page = json.loads((tmp_path / "browse" / "k" / "ka-1.json").read_text())
+    assert page["entries"][0] == {"id": "kai.1", "headword": "kai", "gloss": "Sea.", "pos": "noun"}
+    last = json.loads((tmp_path / "browse" / "k" / "ki-2.json").read_text())
+    assert (last["page"], last["total"], len(last["entries"])) == (2, PAGE_SIZE + 1, 1)
+
+
+def test_unchanged_shards_not_rewritten(tmp_path):
+    first = write_shards(_entries(), tmp_path, COMBOS)
+    entries = _entries()
+    entries[0].senses[0].text = "Sea, ocean."
+    second = write_shards(entries, tmp_path, COMBOS)
+    # kai.1's entry shard and its browse page changed
+    assert second.written == 2
+    assert second.unchanged == first.written - 2
+
+
+def test_stale_shards_removed(tmp_path):
+    write_shards(_entries(), tmp_path, COMBOS)
+    stale = tmp_path / "entry" / "kē.1.json"
+    assert stale.exists()
+    writer = write_shards([e for e in _entries() if e.id != "kē.1"], tmp_path, COMBOS)
+    assert writer.removed == 2  # the entry shard and the emptied ke-1 browse page
+    for path in (stale, stale.with_name(stale.name + ".gz"), tmp_path / "browse" / "k" / "ke-1.json"):
+        assert not path.exists()
+    assert "entry/kē.1.json" not in json.loads((tmp_path / MANIFEST_FILE).read_text())
+
+
+def test_load_combos_reads_letter_pages_only(tmp_path):
+    page = '<p class="indexline"><a href="#ka">ka</a> <a href="#ke">ke</a></p>'
+    for name in ("haw-k.htm", "haw-conc-k.htm", "haw-a-ap.htm"):
+        (tmp_path / name).write_text(page, encoding="utf-8")
+    (tmp_path / "haw-aa.htm").write_text('<p class="indexline"><a href="#āh">āh</a></p>', encoding="utf-8")
+    assert load_combos(tmp_path) == {"k": ["ka", "ke"], "aa": ["āh"]}
+
+
+def test_parse_combo_anchors(tmp_path):
+    page = tmp_path / "haw-k.htm"
+    page.write_text('<p class="indexline"><a href="#ka">ka</a> <a href="#ke">ke</a> <a href="#top">↑</a>'
+                    '<a href="#ka">ka</a></p>', encoding="utf-8")
+    assert parse_combo_anchors(page) == ["ka", "ke"]
+
+
+def test_browse_order_is_hawaiian(tmp_path):
+    entries = [Entry(id=hw, headword=hw, letter_page="k") for hw in ["kha", "kuʻu", "kaʻi", "kua", "kai"]]
+    write_shards(entries, tmp_path, {"k": ["kh", "ka", "ku"]})
+    index = json.loads((tmp_path / "browse" / "k" / "index.json").read_text())
+    assert [p["prefix"] for p in index["prefixes"]] == ["ka", "ku", "kh"]
+    page = json.loads((tmp_path / "browse" / "k" / "ku-1.json").read_text())
+    assert [row["id"] for row in page["entries"]] == ["kua", "kuʻu"]
+    page = json.loads((tmp_path / "browse" / "k" / "ka-1.json").read_text())
+    assert [row["id"] for row in page["entries"]] == ["kai", "kaʻi"]
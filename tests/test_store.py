@@ -0,0 +1,92 @@
+"""Tests for chd.store module."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from chd.models import Entry, Example, Sense
+from chd.store import DATA_FILE, INDEX_FILE, EntryStore, StoreReader, encode_entry, write_store
+
+ENTRIES = [
+    Entry(id="kai.1", headword="kai", in_pe=True, senses=[Sense(text="Sea.", pos_english="noun")]),
+    Entry(id="ʻai.2", headword="ʻai", examples=[Example(hawaiian_text="ʻAi ka iʻa.")]),
+    Entry(id="aloha", headword="aloha"),
+    Entry(id="kai.1", headword="duplicate"),
+    Entry(id="", headword="no id"),
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    assert write_store(ENTRIES, tmp_path) == 3
+    with StoreReader(tmp_path) as reader:
+        yield reader
+
+
+def test_roundtrip(store):
+    for e in ENTRIES[:3]:
+        assert store.get(e.id) == e
+    assert store.get_dict("aloha") == {"id": "aloha", "headword": "aloha"}
+
+
+def test_missing_and_contains(store):
+    assert store.get("missing") is None
+    assert store.get_bytes("kai") is None
+    assert "ʻai.2" in store
+    assert "zzz" not in store
+
+
+def test_ids_sorted(store):
+    assert list(store.ids()) == ["aloha", "kai.1", "ʻai.2"]
+    assert [r["headword"] for r in store.records()] == ["kai", "ʻai", "aloha"]
+    assert len(store) == 3
+
+
+def test_rejects_other_files(tmp_path):
+    (tmp_path / DATA_FILE).write_bytes(b"not a store")
+    (tmp_path / INDEX_FILE).write_bytes(b"not an index")
+    with pytest.raises(ValueError):
+        StoreReader(tmp_path)
+
+
+def test_entry_store_lru(tmp_path):
+    write_store(ENTRIES, tmp_path)
+    with EntryStore(tmp_path, max_entries=2) as store:
+        assert store.get("kai.1").headword == "kai"
+        assert store.get("kai.1").headword == "kai"
+        store.get("aloha")
+        store.get("ʻai.2")  # evicts kai.1
+        assert store.get("missing") is None
+        store.get("kai.1")
+        stats = store.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 5, 2)
+    assert stats["cached_entries"] == 2
+    assert stats["hit_rate"] == round(1 / 6, 4)
+
+
+def test_entry_store_byte_bound_and_ttl(tmp_path):
+    write_store(ENTRIES, tmp_path)
+    now = [0.0]
+    size = len(encode_entry(ENTRIES[0]))
+    with EntryStore(tmp_path, max_bytes=size, ttl=10, clock=lambda: now[0]) as store:
+        store.get("kai.1")
+        assert store.stats()["cached_bytes"] == size
+        store.get("aloha")  # over the byte bound: kai.1 goes
+        assert store.stats()["evictions"] == 1
+        now[0] = 10.0
+        store.get("aloha")  # expired
+        assert store.stats()["expirations"] == 1
+        assert store.get_many(["aloha", "missing", "kai.1", "aloha"]).keys() == {"aloha", "kai.1"}
+
+
+def test_entry_store_threads(tmp_path):
+    write_store(ENTRIES, tmp_path)
+    with EntryStore(tmp_path, max_entries=1) as store:
+        ids = ["kai.1", "aloha", "ʻai.2"] * 200
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(store.get, ids))
+        stats = store.stats()
+    assert [r.id for r in results] == ids
+    assert stats["hits"] + stats["misses"] == len(ids)
+    assert stats["cached_entries"] == 1
+
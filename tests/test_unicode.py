@@ -1,6 +1,9 @@
 """Tests for chd.unicode module."""
 
-from chd.unicode import extract_subscript, normalize_okina, strip_subscript, subscript_to_display, to_ascii
+from chd.unicode import (
+    extract_subscript, normalize_okina, normalize_okina_many, strip_subscript, subscript_to_display, to_ascii,
+    to_ascii_many,
+)
 
 
 def test_strip_subscript_single():
@@ -39,3 +42,16 @@ def test_to_ascii_all_macrons():
 def test_subscript_to_display():
     assert subscript_to_display(1) == "₁"
     assert subscript_to_display(12) == "₁₂"
+
+
+def test_to_ascii_many():
+    assert to_ascii_many(["ʻā", "Niʻihau", ""]) == ["a", "Niihau", ""]
+    assert to_ascii_many([]) == []
+
+
+def test_to_ascii_many_separator_in_input():
+    assert to_ascii_many(["ā\x00ē", "ō"]) == ["a\x00e", "o"]
+
+
+def test_normalize_okina_many():
+    assert normalize_okina_many(["‘ōlelo", "Ni'ihau"]) == ["ʻōlelo", "Niʻihau"]
@@ -0,0 +1,88 @@
+"""Tests for chd.validate module."""
+
+import pytest
+
+from chd.models import ConcordanceInstance, CrossRef, Entry, Example, LinkedWord, Sense, WordToken
+from chd.validate import LinkResolver, WordTokenResolver, validate_link_resolution
+
+
+def _entries():
+    return [
+        Entry(id="57179", headword="ʻā", headword_display="ʻā₁"),
+        Entry(id="100", headword="kau", headword_display="kau"),
+        Entry(id="200", headword="ʻai kepakepa", headword_display="ʻai kepakepa"),
+        Entry(
+            id="300", headword="kaukau", headword_display="kaukau",
+            cross_refs=[
+                CrossRef(ref_type="redup. of", target_headword="kau", target_anchor="100"),
+                CrossRef(ref_type="see", target_headword="kauwa", source_dict="MK"),
+            ],
+            senses=[Sense(source_dict="Andrews", linked_words=[
+                LinkedWord(surface="ā", link_class="hawinentry"),
+                LinkedWord(surface="x", target_anchor="aikepakepa", link_class="hawinentry"),
+                LinkedWord(surface="zzz", link_class="hawinentry"),
+            ])],
+        ),
+    ]
+
+
+def test_resolver_strategies():
+    r = LinkResolver(_entries())
+    assert r.resolve("57179") == "57179"
+    assert r.resolve("ʻā₁") == "57179"
+    assert r.resolve("ā") == "57179"
+    assert r.resolve("a") == "57179"
+    assert r.resolve("aikepakepa") == "200"
+    assert r.resolve("nope") is None
+    assert r.resolve_many(["kau", "nope"]) == ["100", None]
+
+
+def test_resolver_suggestions():
+    assert LinkResolver(_entries()).suggest("kauwa") == ["kau", "kaukau"]
+
+
+def test_resolver_skips_empty_keys_and_anchorless_entries():
+    r = LinkResolver([Entry(id="", headword="hale"), Entry(id="1", headword="kai")])
+    assert r.resolve("") is None
+    assert r.resolve("hale") is None
+    token = WordToken(surface="", anchor="")
+    WordTokenResolver(r).resolve([token], "examples")
+    assert token.target_entry == ""
+
+
+def test_link_resolution_report():
+    report = validate_link_resolution(_entries())
+    xrefs = report["cross_refs"]
+    assert (xrefs["total"], xrefs["resolved"]) == (2, 1)
+    assert xrefs["by_source"]["MK"] == {"total": 1, "resolved": 0}
+    assert xrefs["by_class"]["redup. of"] == {"total": 1, "resolved": 1}
+    assert xrefs["unresolved"][0]["suggestions"] == ["kau", "kaukau"]
+    links = report["linked_words"]
+    assert (links["total"], links["resolved"]) == (3, 2)
+    assert links["by_source"]["Andrews"]["total"] == 3
+    assert [u["target"] for u in links["unresolved"]] == ["zzz"]
+
+
+def test_word_token_resolver():
+    entries = _entries()
+    entries[1].examples = [Example(word_tokens=[WordToken(surface="Kau", anchor="kau"),
+                                                WordToken(surface="ʻā", anchor="")])]
+    tokens = WordTokenResolver()
+    tokens.resolve_examples(entries)
+    assert [t.target_entry for t in entries[1].examples[0].word_tokens] == ["100", "57179"]
+    inst = ConcordanceInstance(word_tokens=[WordToken(surface="x", anchor="nope")])
+    tokens.resolve_concordance("a", 0, inst)
+    assert inst.word_tokens[0].target_entry == ""
+    assert tokens.report() == {
+        "examples": {"total": 2, "resolved": 2, "resolution_rate": 100.0},
+        "concordance": {"total": 1, "resolved": 0, "resolution_rate": 0},
+    }
+
+
+def test_word_token_resolver_concordance_first():
+    inst = ConcordanceInstance(word_tokens=[WordToken(surface="Kau", anchor="kau")])
+    with pytest.raises(RuntimeError, match="resolve_examples"):
+        WordTokenResolver().resolve_concordance("k", 0, inst)
+    tokens = WordTokenResolver(LinkResolver(_entries()))
+    tokens.resolve_concordance("k", 0, inst)
+    assert inst.word_tokens[0].target_entry == "100"
@@ -0,0 +1,29 @@
+"""Tests for chd.word_index module."""
+
+from chd.models import ConcordanceInstance, Entry, Example, WordToken
+from chd.word_index import WordIndex, WordIndexBuilder
+
+
+def _tokens(*anchors):
+    return [WordToken(surface=a, anchor=a) for a in anchors]
+
+
+def test_lookup_examples_and_concordance(tmp_path):
+    builder = WordIndexBuilder()
+    builder.add_examples([
+        Entry(id="57179", examples=[Example(word_tokens=_tokens("ke", "a", "nui")),
+                                    Example(word_tokens=_tokens("nui", "", "nui"))]),
+    ])
+    builder.add_concordance("n", 0, ConcordanceInstance(word="nui", word_tokens=_tokens("he", "nui")))
+    builder.write(tmp_path)
+
+    with WordIndex(tmp_path) as index:
+        assert len(index) == 3
+        assert index.lookup("nui") == [
+            (("example", "57179", 0), [2]),
+            (("example", "57179", 1), [0, 2]),
+            (("concordance", "n", 0), [1]),
+        ]
+        assert index.lookup("nui", kind="concordance") == [(("concordance", "n", 0), [1])]
+        assert index.lookup("") == []
+        assert index.lookup("missing") == []